@@ -11,6 +11,7 @@ from pydantic import Field
 from sqlalchemy.orm import Session
 
 from database.db_manager import Candidate, CurriculumProgress, SessionLocal
+from utils.eligibility_cache import invalidate_eligibility
 
 
 class QueryCandidates(BaseTool):
@@ -77,6 +78,7 @@ class CreateCandidate(BaseTool):
             db.add(curriculum)
             
             db.commit()
+            invalidate_eligibility(self.candidate_id)
             
             return f"Successfully created candidate: {self.candidate_id} ({self.full_name})"
         except Exception as e:
@@ -107,6 +109,7 @@ class UpdateCandidateStatus(BaseTool):
                 candidate.travel_ready = self.travel_ready
             
             db.commit()
+            invalidate_eligibility(self.candidate_id)
             
             updates = []
             if self.status:
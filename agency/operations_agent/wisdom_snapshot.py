@@ -0,0 +1,264 @@
+"""
+Wisdom Report Snapshots for OperationsAgent.
+
+The daily wisdom report only depends on candidate and payment aggregates, so it
+is computed once per day (scripts/refresh_wisdom_snapshot.py, or on demand by
+GenerateWisdomReport) and stored as a wisdom_snapshots row. The API serves the
+stored report instead of re-running the queries on every request, and the rows
+double as a history for trend views.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database.db_manager import WisdomSnapshot, session_scope
+
+REPORTS_DIR = Path(__file__).parent.parent.parent / "operations" / "reports"
+
+
+def compute_wisdom_aggregates(db: Session, report_date: str) -> dict[str, Any]:
+    """
+    Compute the aggregates behind the wisdom report.
+
+    One grouped query over candidates yields the status, track and
+    travel-ready counts; a second covers the day's payments.
+
+    Args:
+        db: Database session
+        report_date: Report date (YYYY-MM-DD)
+
+    Returns:
+        JSON-serializable aggregates dictionary
+    """
+    candidate_rows = db.execute(text("""
+        SELECT status, track, travel_ready, COUNT(*) AS count
+        FROM candidates
+        GROUP BY status, track, travel_ready
+    """)).fetchall()
+
+    status_counts: dict[str, int] = {}
+    track_counts: dict[str, int] = {}
+    travel_ready_count = 0
+    for status, track, travel_ready, count in candidate_rows:
+        status_counts[status] = status_counts.get(status, 0) + count
+        track_counts[track] = track_counts.get(track, 0) + count
+        if travel_ready:
+            travel_ready_count += count
+
+    payment_row = db.execute(text("""
+        SELECT
+            COUNT(CASE WHEN status = 'success' THEN 1 END) AS successful,
+            COUNT(*) AS total
+        FROM payments
+        WHERE DATE(created_at) = :report_date
+    """), {"report_date": report_date}).fetchone()
+    payment_successful = (payment_row[0] or 0) if payment_row else 0
+    payment_total = (payment_row[1] or 0) if payment_row else 0
+
+    return {
+        "report_date": report_date,
+        "total_candidates": sum(status_counts.values()),
+        "travel_ready_count": travel_ready_count,
+        "status_counts": sorted(status_counts.items(), key=lambda item: item[1], reverse=True),
+        "track_counts": sorted(track_counts.items(), key=lambda item: item[1], reverse=True),
+        "payment_total": payment_total,
+        "payment_successful": payment_successful,
+        "payment_success_rate": round(payment_successful / payment_total * 100, 2) if payment_total else 0.0,
+    }
+
+
+def render_wisdom_report(aggregates: dict[str, Any], generated_at: datetime, include_token_metrics: bool = True) -> str:
+    """
+    Render the Markdown wisdom report from precomputed aggregates.
+
+    Args:
+        aggregates: Output of compute_wisdom_aggregates()
+        generated_at: Generation timestamp shown in the header
+        include_token_metrics: Include the Token Thrift Optimization section
+
+    Returns:
+        Markdown report
+    """
+    total_candidates = aggregates["total_candidates"]
+    travel_ready_count = aggregates["travel_ready_count"]
+    payment_total = aggregates["payment_total"]
+    payment_successful = aggregates["payment_successful"]
+
+    def _percentage(count: int) -> float:
+        return round((count / total_candidates * 100) if total_candidates > 0 else 0, 2)
+
+    report = f"""# XploreKodo Daily Wisdom Report
+
+**Date:** {aggregates["report_date"]}  
+**Generated:** {generated_at.strftime("%Y-%m-%d %H:%M:%S")}
+
+---
+
+## Travel-Ready Status
+
+- **Total Candidates:** {total_candidates}
+- **Travel-Ready:** {travel_ready_count}
+- **Travel-Ready Rate:** {_percentage(travel_ready_count)}%
+
+### Status Breakdown:
+"""
+    for status, count in aggregates["status_counts"]:
+        report += f"- **{status}:** {count} ({_percentage(count)}%)\n"
+
+    report += f"""
+### Track Distribution:
+"""
+    for track, count in aggregates["track_counts"]:
+        report += f"- **{track.title()}:** {count} ({_percentage(count)}%)\n"
+
+    report += f"""
+---
+
+## Payment Success Metrics
+
+- **Total Payments Today:** {payment_total}
+- **Successful Payments:** {payment_successful}
+- **Payment Success Rate:** {aggregates["payment_success_rate"]}%
+- **Failed Payments:** {payment_total - payment_successful}
+
+---
+
+## Advisory Agent Query Analysis
+
+*Note: Query log analysis requires additional logging infrastructure. Placeholder for future implementation.*
+
+Top Troubleshooting Topics:
+1. [Most common query from Advisory Agent logs]
+2. [Second most common query]
+3. [Third most common query]
+
+Query Volume: [Total queries processed today]
+
+---
+
+## System Health
+
+- **Agency Status:** Operational
+- **Database Status:** Connected
+- **Active Agents:** [Count of active agents]
+- **Error Rate:** [Errors / Total requests]
+- **Average Response Time:** [ms]
+
+---
+
+"""
+    if include_token_metrics:
+        report += """## Token Thrift Optimization
+
+- **Total Tokens Used Today:** [Count]
+- **Average Tokens per Request:** [Count]
+- **Token Optimization Score:** [Percentage]
+- **Recommendations:**
+  * [Optimization suggestion 1]
+  * [Optimization suggestion 2]
+
+---
+
+"""
+
+    report += """## Recommendations
+
+1. Monitor Travel-Ready rate trends to identify bottlenecks
+2. Review payment failures to improve success rate
+3. Analyze status distribution to optimize candidate journey
+
+---
+
+*Report generated by OperationsAgent*
+"""
+    return report
+
+
+def write_report_file(report_date: str, report: str) -> Path:
+    """Save a rendered report to operations/reports/wisdom_report_YYYY_MM_DD.md."""
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = REPORTS_DIR / f"wisdom_report_{report_date.replace('-', '_')}.md"
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    return report_path
+
+
+def _snapshot_to_dict(snapshot: WisdomSnapshot) -> dict[str, Any]:
+    generated_at = snapshot.generated_at
+    if generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    return {
+        "report_date": snapshot.report_date,
+        "generated_at": generated_at,
+        "aggregates": snapshot.aggregates,
+        "report": snapshot.report,
+        "etag": snapshot.etag,
+    }
+
+
+def refresh_wisdom_snapshot(report_date: Optional[str] = None, write_file: bool = True) -> dict[str, Any]:
+    """
+    Compute, render and store the wisdom snapshot for a day (replacing any existing one).
+
+    Args:
+        report_date: Report date (YYYY-MM-DD). Defaults to today.
+        write_file: Also save the Markdown report under operations/reports/
+
+    Returns:
+        Snapshot dictionary with report_date, generated_at (UTC), aggregates, report, etag
+    """
+    report_date = report_date or datetime.now().strftime("%Y-%m-%d")
+    generated_at = datetime.now(timezone.utc)
+
+    with session_scope() as db:
+        aggregates = compute_wisdom_aggregates(db, report_date)
+        report = render_wisdom_report(aggregates, generated_at.astimezone())
+        etag = hashlib.sha256(report.encode("utf-8")).hexdigest()[:32]
+
+        snapshot = db.query(WisdomSnapshot).filter(WisdomSnapshot.report_date == report_date).first()
+        if snapshot is None:
+            snapshot = WisdomSnapshot(report_date=report_date)
+            db.add(snapshot)
+        snapshot.generated_at = generated_at.replace(tzinfo=None)
+        snapshot.aggregates = aggregates
+        snapshot.report = report
+        snapshot.etag = etag
+        db.flush()
+        result = _snapshot_to_dict(snapshot)
+
+    if write_file:
+        write_report_file(report_date, report)
+    return result
+
+
+def get_wisdom_snapshot(report_date: str) -> Optional[dict[str, Any]]:
+    """Return the stored snapshot for a day, or None if it has not been computed."""
+    with session_scope() as db:
+        snapshot = db.query(WisdomSnapshot).filter(WisdomSnapshot.report_date == report_date).first()
+        return _snapshot_to_dict(snapshot) if snapshot else None
+
+
+def list_wisdom_snapshots(limit: int = 30) -> list[dict[str, Any]]:
+    """
+    Return the most recent snapshots' aggregates (newest first) for trend views.
+
+    The rendered reports are omitted to keep the payload small.
+    """
+    with session_scope() as db:
+        rows = (
+            db.query(WisdomSnapshot.report_date, WisdomSnapshot.generated_at, WisdomSnapshot.aggregates)
+            .order_by(WisdomSnapshot.report_date.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {"report_date": row.report_date, "generated_at": row.generated_at, "aggregates": row.aggregates}
+            for row in rows
+        ]
@@ -383,15 +383,12 @@ class GenerateDailyBriefing(BaseTool):
             
             # Generate briefing using Gemini
             try:
-                from google import genai
-                import config
+                from utils.clients import get_gemini_client
                 
-                api_key = config.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
-                if not api_key:
+                client = get_gemini_client()
+                if client is None:
                     return "Error: GEMINI_API_KEY not found. Please set it in your .env file."
                 
-                client = genai.Client(api_key=api_key)
-                
                 prompt = f"""You are an executive coach writing a daily progress briefing for a Japanese language learning student.
 
 **Student Name:** {candidate.full_name}
@@ -24,6 +24,8 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import Candidate, CurriculumProgress, KnowledgeBase, SessionLocal
+from utils.audio_preprocessing import build_recognition_config, prepare_audio_for_stt
+from utils.clients import get_gemini_client, get_speech_client
 
 # Try to import google-genai for Gemini
 try:
@@ -100,12 +102,10 @@ class RunBaselineAssessment(BaseTool):
             }
         
         try:
-            api_key = config.GEMINI_API_KEY or ""
-            if not api_key:
+            client = get_gemini_client()
+            if client is None:
                 raise ValueError("GEMINI_API_KEY not found")
             
-            client = genai.Client(api_key=api_key)
-            
             # Build seed word context
             seed_context = ""
             if seed_word:
@@ -191,12 +191,10 @@ Provide ONLY the JSON response, no additional text or explanations."""
             }
         
         try:
-            api_key = config.GEMINI_API_KEY or ""
-            if not api_key:
+            client = get_gemini_client()
+            if client is None:
                 raise ValueError("GEMINI_API_KEY not found")
             
-            client = genai.Client(api_key=api_key)
-            
             prompt = f"""Analyze the following language assessment response for cheating risk indicators.
 
 **Question Type:** {question_type}
@@ -268,12 +266,10 @@ Provide ONLY the JSON response, no additional text."""
             }
         
         try:
-            api_key = config.GEMINI_API_KEY or ""
-            if not api_key:
+            client = get_gemini_client()
+            if client is None:
                 raise ValueError("GEMINI_API_KEY not found")
             
-            client = genai.Client(api_key=api_key)
-            
             # Apply strict grading if XPLOREKODO_STRICT is enabled
             grading_instruction = ""
             if config.GRADING_STANDARD == "XPLOREKODO_STRICT":
@@ -360,33 +356,18 @@ Provide ONLY the JSON response, no additional text."""
             return None
         
         try:
-            from pathlib import Path
-            import os
-            import config
-            
-            # Initialize speech client
-            client = None
-            project_root = Path(__file__).parent.parent.parent
-            
-            if config.GOOGLE_APPLICATION_CREDENTIALS:
-                creds_path = Path(config.GOOGLE_APPLICATION_CREDENTIALS)
-                if not creds_path.is_absolute():
-                    creds_path = project_root / creds_path
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = speech.SpeechClient.from_service_account_json(str(creds_path))
+            # Shared speech client (see utils/clients.py)
+            client = get_speech_client()
             
             if not client:
                 return None
             
-            # Configure recognition
-            config_speech = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=16000,
-                language_code=language_code,
-            )
+            # Configure recognition from the actual clip: browser WAV is converted to
+            # 16 kHz mono LINEAR16 instead of being labelled as such (see utils/audio_preprocessing.py)
+            prepared = prepare_audio_for_stt(audio_content)
+            config_speech = build_recognition_config(prepared, language_code)
             
-            audio = speech.RecognitionAudio(content=audio_content)
+            audio = speech.RecognitionAudio(content=prepared.content)
             
             # Perform recognition
             response = client.recognize(config=config_speech, audio=audio)
@@ -2,6 +2,7 @@ from langchain.tools import BaseTool
 from typing import Type, Optional
 from pydantic import BaseModel, Field
 import config
+from utils.clients import get_gemini_client
 from google import genai
 import json
 import os
@@ -66,7 +67,7 @@ class CompetencyGradingTool(BaseTool):
                 "pronunciation_hint": "Pronunciation not assessed in text-only grading."
             }
 
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
+        client = get_gemini_client()
         
         language_map = {
             "en": "English",
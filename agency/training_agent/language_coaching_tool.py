@@ -12,9 +12,11 @@ from __future__ import annotations
 import base64
 import json
 import os
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from agency_swarm.tools import BaseTool
 from pydantic import Field
@@ -22,6 +24,9 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import Candidate, CurriculumProgress, SessionLocal
+from utils.audio_preprocessing import build_recognition_config, prepare_audio_for_stt
+from utils.clients import get_gemini_client, get_google_project_id, get_speech_client
+from utils.metrics import span, timed
 
 # Try to import google-cloud-speech
 try:
@@ -40,6 +45,64 @@ except ImportError:
     genai = None
 
 
+@dataclass
+class LanguageCoachingResult:
+    """
+    Structured outcome of a language coaching run.
+
+    API endpoints serialize these fields directly; to_markdown() renders the
+    agent-facing text returned by LanguageCoachingTool.run().
+    """
+
+    success: bool
+    error: Optional[str] = None
+    candidate_id: Optional[str] = None
+    candidate_name: Optional[str] = None
+    transcript: Optional[str] = None
+    grade: Optional[int] = None
+    accuracy_feedback: Optional[str] = None
+    grammar_feedback: Optional[str] = None
+    pronunciation_hint: Optional[str] = None
+    cheating_risk_score: Optional[int] = None
+    cheating_risk_level: Optional[str] = None
+    performance_recorded: bool = False
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_markdown(self) -> str:
+        if not self.success:
+            return f"Error: {self.error}"
+
+        result = f"=== Language Coaching Result ===\n"
+        result += f"Candidate: {self.candidate_name} ({self.candidate_id})\n\n"
+
+        result += "**🎤 Transcribed Response:**\n"
+        result += f"{self.transcript}\n\n"
+
+        result += "**📊 AI Grading (Gemini 2.5 Flash):**\n"
+        result += f"**Overall Grade: {self.grade}/10**\n\n"
+
+        result += "**✅ Accuracy Feedback:**\n"
+        result += f"{self.accuracy_feedback}\n\n"
+
+        result += "**📝 Grammar Feedback:**\n"
+        result += f"{self.grammar_feedback}\n\n"
+
+        result += "**🎯 Pronunciation Hint:**\n"
+        result += f"{self.pronunciation_hint}\n\n"
+
+        if (self.cheating_risk_score or 0) >= 70:
+            result += f"⚠️ **Cheating Risk Alert:** Risk Score {self.cheating_risk_score}/100 ({self.cheating_risk_level or 'High'})\n"
+            result += f"This response has been flagged for Admin review.\n\n"
+
+        result += f"✓ Results saved to database (dialogue_history)."
+        if self.performance_recorded:
+            result += f"\n✓ Performance recorded in Memory Layer (student_performance)."
+        return result
+
+
 class LanguageCoachingTool(BaseTool):
     """
     Language coaching tool that grades candidate audio responses.
@@ -51,7 +114,7 @@ class LanguageCoachingTool(BaseTool):
     """
 
     candidate_id: str = Field(..., description="Candidate identifier")
-    audio_base64: str = Field(..., description="Base64-encoded audio data (WAV, MP3, or M4A format)")
+    audio_base64: str = Field(default="", description="Base64-encoded audio data (WAV, MP3, or M4A format)")
     language_code: str = Field(
         default="ja-JP",
         description="Language code for STT: 'ja-JP' for Japanese, 'ne-NP' for Nepali, or 'auto' for automatic detection"
@@ -65,76 +128,26 @@ class LanguageCoachingTool(BaseTool):
         description="Expected answer or context for grading (optional, helps with accuracy assessment)"
     )
     
-    def __init__(self, **kwargs):
+    def __init__(self, audio_bytes: Optional[bytes] = None, **kwargs):
+        """
+        Args:
+            audio_bytes: Raw audio data. Used instead of audio_base64 by API
+                uploads so the clip is never base64-encoded or copied.
+        """
         super().__init__(**kwargs)
         self._last_error = None  # Store last error message for user feedback
         self._project_id = None  # Store project ID from credentials
+        self._audio_bytes = audio_bytes
 
     def _initialize_speech_client(self):
-        """Initialize Google Cloud Speech-to-Text client using credentials."""
+        """Return the shared Google Cloud Speech-to-Text client (see utils/clients.py)."""
         if not GOOGLE_SPEECH_AVAILABLE:
             return None
         
-        try:
-            project_root = Path(__file__).parent.parent.parent
-            client = None
-            creds_path_used = None
-            
-            # Priority 1: Check GOOGLE_APPLICATION_CREDENTIALS from config (.env)
-            if config.GOOGLE_APPLICATION_CREDENTIALS:
-                creds_path = Path(config.GOOGLE_APPLICATION_CREDENTIALS)
-                if not creds_path.is_absolute():
-                    creds_path = project_root / creds_path
-                
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = speech.SpeechClient.from_service_account_json(str(creds_path))
-                    creds_path_used = creds_path
-            
-            # Priority 2: Try GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH from config
-            if client is None:
-                credentials_path = config.GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH
-                if credentials_path:
-                    creds_path = Path(credentials_path)
-                    if not creds_path.is_absolute():
-                        creds_path = project_root / credentials_path
-                    
-                    if creds_path.exists():
-                        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                        client = speech.SpeechClient.from_service_account_json(str(creds_path))
-                        creds_path_used = creds_path
-            
-            # Priority 3: Try default credentials file location (google_creds.json)
-            if client is None:
-                default_creds = project_root / "google_creds.json"
-                if default_creds.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(default_creds)
-                    client = speech.SpeechClient.from_service_account_json(str(default_creds))
-                    creds_path_used = default_creds
-            
-            # Priority 4: Try environment variable (if already set)
-            if client is None and os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
-                client = speech.SpeechClient()
-            
-            # Store credentials path and project ID for error messages
-            if creds_path_used and client:
-                try:
-                    import json
-                    with open(creds_path_used, 'r') as f:
-                        creds_data = json.load(f)
-                        self._project_id = creds_data.get('project_id', 'Unknown')
-                except:
-                    self._project_id = 'Unknown'
-            else:
-                self._project_id = None
-            
-            return client
-            
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to initialize Google Speech client: {e}")
-            return None
+        client = get_speech_client()
+        # Store project ID for error messages
+        self._project_id = (get_google_project_id() or "Unknown") if client else None
+        return client
 
     def _transcribe_audio(self, audio_content: bytes, language_code: str) -> Optional[str]:
         """
@@ -148,19 +161,19 @@ class LanguageCoachingTool(BaseTool):
             return None
         
         try:
-            # Try to detect audio format (default to LINEAR16, but support common formats)
-            # For web audio (from streamlit-mic-recorder), it's typically WAV/MP3
-            # Google Speech-to-Text can auto-detect encoding, so we'll use ENCODING_UNSPECIFIED
-            config_obj = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,  # Auto-detect encoding
-                sample_rate_hertz=16000,  # Default sample rate
-                language_code=language_code if language_code != "auto" else "ja-JP",
+            # Browser WAV (typically 44.1 kHz stereo) is converted to 16 kHz mono LINEAR16;
+            # other containers get their matching encoding (see utils/audio_preprocessing.py)
+            with span("coaching.audio_preprocess"):
+                prepared = prepare_audio_for_stt(audio_content)
+            config_obj = build_recognition_config(
+                prepared,
+                language_code if language_code != "auto" else "ja-JP",
                 alternative_language_codes=["ja-JP", "ne-NP", "en-US"] if language_code == "auto" else None,
                 enable_automatic_punctuation=True,
                 model="latest_long",  # Use latest long model for better accuracy
             )
             
-            audio = speech.RecognitionAudio(content=audio_content)
+            audio = speech.RecognitionAudio(content=prepared.content)
             
             # Perform recognition
             response = client.recognize(config=config_obj, audio=audio)
@@ -225,31 +238,18 @@ class LanguageCoachingTool(BaseTool):
             return None
 
     def _initialize_gemini_client(self):
-        """Initialize Gemini client using Google Cloud API key from .env."""
+        """Return the shared Gemini client (see utils/clients.py)."""
         if not GEMINI_AVAILABLE:
             return None
         
-        try:
-            # Get API key from config (loaded from .env file)
-            api_key = config.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
-            
-            if not api_key:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning("GEMINI_API_KEY not found in .env file. Please set GEMINI_API_KEY in your .env file.")
-                return None
-            
-            # Initialize Gemini client with API key from .env
-            # The new SDK requires api_key parameter during client initialization
-            client = genai.Client(api_key=api_key)
-            return client
-            
-        except Exception as e:
+        client = get_gemini_client()
+        if client is None:
             import logging
             logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to initialize Gemini client: {e}")
-            return None
+            logger.warning("GEMINI_API_KEY not found in .env file. Please set GEMINI_API_KEY in your .env file.")
+        return client
 
+    @timed("coaching.cheating_analysis")
     def _analyze_cheating_risk(
         self,
         transcript: str,
@@ -276,12 +276,10 @@ class LanguageCoachingTool(BaseTool):
             }
         
         try:
-            api_key = config.GEMINI_API_KEY or ""
-            if not api_key:
+            client = get_gemini_client()
+            if client is None:
                 raise ValueError("GEMINI_API_KEY not found")
             
-            client = genai.Client(api_key=api_key)
-            
             prompt = f"""Analyze the following language assessment response for cheating risk indicators.
 
 **Question Type:** {question_type}
@@ -458,44 +456,69 @@ This is a response to a Socratic question about Japanese caregiving. The candida
         """
         Process audio, transcribe, grade, and save to database.
         """
+        return self.run_structured().to_markdown()
+
+    def run_structured(self) -> LanguageCoachingResult:
+        """
+        Process audio, transcribe, grade, and save to database.
+
+        Returns:
+            LanguageCoachingResult (success=False with error set on failure)
+        """
+        started = time.perf_counter()
+        timings_ms: Dict[str, float] = {}
+
+        def _fail(error: str) -> LanguageCoachingResult:
+            return LanguageCoachingResult(success=False, error=error, candidate_id=self.candidate_id)
+
         db: Session = SessionLocal()
         try:
-            # Verify candidate exists
-            candidate = db.query(Candidate).filter(Candidate.candidate_id == self.candidate_id).first()
+            with span("coaching.db_lookup"):
+                # Verify candidate exists
+                candidate = db.query(Candidate).filter(Candidate.candidate_id == self.candidate_id).first()
+
+                # Get or create curriculum progress
+                curriculum = db.query(CurriculumProgress).filter(
+                    CurriculumProgress.candidate_id == self.candidate_id
+                ).first() if candidate else None
             if not candidate:
-                return f"Error: Candidate {self.candidate_id} not found."
-
-            # Get or create curriculum progress
-            curriculum = db.query(CurriculumProgress).filter(
-                CurriculumProgress.candidate_id == self.candidate_id
-            ).first()
+                return _fail(f"Candidate {self.candidate_id} not found.")
 
             if not curriculum:
                 curriculum = CurriculumProgress(candidate_id=self.candidate_id)
                 db.add(curriculum)
                 db.flush()
 
-            # Decode audio
-            try:
-                audio_content = base64.b64decode(self.audio_base64)
-            except Exception as e:
-                return f"Error: Failed to decode audio data: {str(e)}"
+            # Use raw audio bytes when provided, otherwise decode base64
+            if self._audio_bytes is not None:
+                audio_content = self._audio_bytes
+            elif self.audio_base64:
+                try:
+                    audio_content = base64.b64decode(self.audio_base64)
+                except Exception as e:
+                    return _fail(f"Failed to decode audio data: {str(e)}")
+            else:
+                return _fail("No audio data provided.")
 
             # Transcribe audio
-            transcript = self._transcribe_audio(audio_content, self.language_code)
+            with span("coaching.stt") as stage:
+                transcript = self._transcribe_audio(audio_content, self.language_code)
+            timings_ms["transcription"] = stage.elapsed_ms
             
             if not transcript:
                 # Return specific error message if available
                 if self._last_error:
-                    return f"Error: {self._last_error}"
-                return "Error: Failed to transcribe audio. Please check your audio format and ensure Google Cloud Speech-to-Text is configured and enabled."
+                    return _fail(self._last_error)
+                return _fail("Failed to transcribe audio. Please check your audio format and ensure Google Cloud Speech-to-Text is configured and enabled.")
 
             # Grade response using Gemini
-            grading_result = self._grade_response_with_gemini(
-                transcript=transcript,
-                language=self.language_code,
-                expected_answer=self.expected_answer
-            )
+            with span("coaching.grading") as stage:
+                grading_result = self._grade_response_with_gemini(
+                    transcript=transcript,
+                    language=self.language_code,
+                    expected_answer=self.expected_answer
+                )
+            timings_ms["grading"] = stage.elapsed_ms
 
             # Update dialogue_history
             dialogue_history = curriculum.dialogue_history or []
@@ -545,7 +568,8 @@ This is a response to a Socratic question about Japanese caregiving. The candida
 
             # Save to database
             curriculum.dialogue_history = dialogue_history
-            db.commit()
+            with span("coaching.db_write"):
+                db.commit()
 
             # Extract word title from question_id or dialogue_history for performance recording
             word_title = None
@@ -580,6 +604,7 @@ This is a response to a Socratic question about Japanese caregiving. The candida
                     category = "knowledge_base"
 
             # Record performance in student_performance table (Memory Layer)
+            cheating_analysis = None
             if word_title:
                 try:
                     from agency.student_progress_agent.tools import RecordProgress
@@ -596,7 +621,8 @@ This is a response to a Socratic question about Japanese caregiving. The candida
                         language_code=self.language_code,
                         category=category,
                     )
-                    record_result = record_tool.run()
+                    with span("coaching.record_progress"):
+                        record_result = record_tool.run()
                     
                     # Analyze cheating risk
                     cheating_risk_score = 0
@@ -655,48 +681,36 @@ This is a response to a Socratic question about Japanese caregiving. The candida
                     logger = logging.getLogger(__name__)
                     logger.warning(f"Failed to record performance: {e}")
 
-            # Format response
-            result = f"=== Language Coaching Result ===\n"
-            result += f"Candidate: {candidate.full_name} ({self.candidate_id})\n\n"
-            
-            result += "**🎤 Transcribed Response:**\n"
-            result += f"{transcript}\n\n"
-            
-            result += "**📊 AI Grading (Gemini 2.5 Flash):**\n"
-            result += f"**Overall Grade: {grading_result['grade']}/10**\n\n"
-            
-            result += "**✅ Accuracy Feedback:**\n"
-            result += f"{grading_result['accuracy_feedback']}\n\n"
-            
-            result += "**📝 Grammar Feedback:**\n"
-            result += f"{grading_result['grammar_feedback']}\n\n"
-            
-            result += "**🎯 Pronunciation Hint:**\n"
-            result += f"{grading_result['pronunciation_hint']}\n\n"
-            
-            # Add cheating risk warning if detected
-            try:
-                cheating_analysis = self._analyze_cheating_risk(
-                    transcript=transcript,
-                    expected_answer=self.expected_answer or word_title or "",
-                    question_type="Language_Coaching"
-                )
-                cheating_risk_score = cheating_analysis.get("cheating_risk_score", 0)
-                if cheating_risk_score >= 70:
-                    result += f"⚠️ **Cheating Risk Alert:** Risk Score {cheating_risk_score}/100 ({cheating_analysis.get('risk_level', 'High')})\n"
-                    result += f"This response has been flagged for Admin review.\n\n"
-            except Exception:
-                pass
-            
-            result += f"✓ Results saved to database (dialogue_history)."
-            if word_title:
-                result += f"\n✓ Performance recorded in Memory Layer (student_performance)."
-
-            return result
+            # Cheating risk for the result (reuses the analysis above when it ran)
+            if cheating_analysis is None:
+                try:
+                    cheating_analysis = self._analyze_cheating_risk(
+                        transcript=transcript,
+                        expected_answer=self.expected_answer or word_title or "",
+                        question_type="Language_Coaching"
+                    )
+                except Exception:
+                    cheating_analysis = {}
+
+            timings_ms["total"] = round((time.perf_counter() - started) * 1000, 1)
+            return LanguageCoachingResult(
+                success=True,
+                candidate_id=self.candidate_id,
+                candidate_name=candidate.full_name,
+                transcript=transcript,
+                grade=grading_result["grade"],
+                accuracy_feedback=grading_result["accuracy_feedback"],
+                grammar_feedback=grading_result["grammar_feedback"],
+                pronunciation_hint=grading_result["pronunciation_hint"],
+                cheating_risk_score=cheating_analysis.get("cheating_risk_score"),
+                cheating_risk_level=cheating_analysis.get("risk_level"),
+                performance_recorded=bool(word_title),
+                timings_ms=timings_ms,
+            )
 
         except Exception as e:
             db.rollback()
-            return f"Error in language coaching: {str(e)}"
+            return _fail(f"Language coaching failed: {str(e)}")
         finally:
             db.close()
 
@@ -28,6 +28,7 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import Candidate, CurriculumProgress, SessionLocal
+from utils.clients import get_gemini_client
 
 # Try to import reportlab for PDF generation
 try:
@@ -386,7 +387,9 @@ Write a professional 3-4 sentence detailed assessment EXCLUSIVELY in English for
 
 Be encouraging but honest. Focus on strengths and specific areas for improvement. Provide actionable feedback."""
                 
-                client = genai.Client(api_key=config.GEMINI_API_KEY)
+                client = get_gemini_client()
+                if client is None:
+                    raise ValueError("GEMINI_API_KEY not configured")
                 response = client.models.generate_content(
                     model='gemini-2.0-flash',
                     contents=prompt
@@ -24,6 +24,8 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import Candidate, CurriculumProgress, KnowledgeBase, SessionLocal, StudentPerformance
+from utils.translation_cache import translate_text
+from utils.tts_cache import tts_audio_ref
 
 # Try to import GetCurrentPhase for phase-based selection
 try:
@@ -79,98 +81,32 @@ class SocraticQuestioningTool(BaseTool):
         Translate text using Google Cloud Translate API.
         
         Uses credentials from .env file (GOOGLE_CLOUD_TRANSLATE_PROJECT_ID and 
-        GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH).
+        GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH). Translations are served from the
+        translation cache when possible (see utils/translation_cache.py).
         
         Falls back to placeholder if translation service is not available.
         """
-        # Check if Google Translate is available
-        if not GOOGLE_TRANSLATE_AVAILABLE:
-            # Fallback: Return placeholder translation
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
-        
-        # Check if project ID is configured
-        project_id = config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID
-        credentials_path = config.GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH
-        
-        if not project_id:
-            # Fallback: Return placeholder translation
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
-        
-        try:
-            # Initialize translation client
-            # Priority: 1) Credentials file path from config, 2) Default google_creds.json, 3) Environment variable, 4) Project ID only
-            client = None
-            project_root = Path(__file__).parent.parent.parent
-            
-            # Try credentials path from config
-            if credentials_path:
-                creds_path = Path(credentials_path)
-                if not creds_path.is_absolute():
-                    creds_path = project_root / credentials_path
-                
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = translate.Client.from_service_account_json(str(creds_path))
-            
-            # If no client yet, try default credentials file location
-            if client is None:
-                default_creds = project_root / "google_creds.json"
-                if default_creds.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(default_creds)
-                    client = translate.Client.from_service_account_json(str(default_creds))
-            
-            # If still no client, try environment variable
-            if client is None and os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
-                env_creds = Path(os.environ['GOOGLE_APPLICATION_CREDENTIALS'])
-                if env_creds.exists():
-                    client = translate.Client()
-            
-            # Last resort: use project ID only (requires default credentials)
-            if client is None:
-                client = translate.Client(project=project_id)
-            
-            # Perform translation
-            # Language codes: 'ja' for Japanese, 'ne' for Nepali
-            result = client.translate(text, target_language=target_language)
-            translated_text = result.get("translatedText", text)
-            
-            # Ensure we return the translated text, not the original
-            if translated_text and translated_text != text:
+        # Check if Google Translate is available and a project ID is configured
+        if GOOGLE_TRANSLATE_AVAILABLE and config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID:
+            translated_text = translate_text(text, target_language)
+            if translated_text:
                 return translated_text
-            else:
-                # If translation failed but no error was raised, return original with warning
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Translation returned same text. Result: {result}")
-                return translated_text if translated_text else text
-            
-        except Exception as e:
-            # Log error but don't fail - return placeholder
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Google Translate API error: {e}. Using placeholder translation.")
-            
-            # Fallback on error
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
+        
+        # Fallback: Return placeholder translation
+        if target_language == "ja":
+            return f"[Japanese Translation: {text}]"
+        elif target_language == "ne":
+            return f"[Nepali Translation: {text}]"
+        return text
 
     def _generate_audio_files(self, japanese_text: str, nepali_text: str, question_id: str) -> dict:
         """
         Generate MP3 audio files for Japanese and Nepali text using Google Text-to-Speech.
         
         Returns:
-            dict with 'japanese' and 'nepali' keys containing relative paths to audio files
+            dict with 'japanese' and 'nepali' keys containing TTS cache references
+            (see utils.tts_cache.tts_audio_ref; cached files can be evicted, so no
+            file paths are stored)
         """
         audio_paths = {"japanese": None, "nepali": None}
         
@@ -178,88 +114,25 @@ class SocraticQuestioningTool(BaseTool):
             return audio_paths
         
         try:
-            # Get project root and create static/audio directory
-            project_root = Path(__file__).parent.parent.parent
-            audio_dir = project_root / "static" / "audio"
-            audio_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Initialize TTS client
             project_id = config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID
-            credentials_path = config.GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH
             
             if not project_id:
                 return audio_paths
             
-            # Initialize TTS client (same credentials as translation)
-            client = None
-            if credentials_path:
-                creds_path = Path(credentials_path)
-                if not creds_path.is_absolute():
-                    creds_path = project_root / credentials_path
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = texttospeech.TextToSpeechClient.from_service_account_json(str(creds_path))
-            
-            if client is None:
-                default_creds = project_root / "google_creds.json"
-                if default_creds.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(default_creds)
-                    client = texttospeech.TextToSpeechClient.from_service_account_json(str(default_creds))
-            
-            if client is None and os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
-                client = texttospeech.TextToSpeechClient()
-            
-            if client is None:
-                return audio_paths
-            
+            # Audio comes from the shared TTS cache, so a question is synthesized
+            # once per text and voice rather than once per render
             # Generate Japanese audio
             if japanese_text and not japanese_text.startswith("[Japanese Translation:"):
-                japanese_audio_path = audio_dir / f"{question_id}_ja.mp3"
-                synthesis_input = texttospeech.SynthesisInput(text=japanese_text)
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code="ja-JP",
-                    name="ja-JP-Standard-A",  # Female voice
-                    ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
+                audio_paths["japanese"] = tts_audio_ref(
+                    japanese_text,
+                    "ja-JP",
+                    voice_name="ja-JP-Standard-A",  # Female voice
+                    ssml_gender="FEMALE",
                 )
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3
-                )
-                response = client.synthesize_speech(
-                    input=synthesis_input, voice=voice, audio_config=audio_config
-                )
-                with open(japanese_audio_path, "wb") as out:
-                    out.write(response.audio_content)
-                audio_paths["japanese"] = f"static/audio/{question_id}_ja.mp3"
             
             # Generate Nepali audio
-            # Note: Google TTS may not support Nepali directly, try hi-IN (Hindi) as fallback
             if nepali_text and not nepali_text.startswith("[Nepali Translation:"):
-                nepali_audio_path = audio_dir / f"{question_id}_ne.mp3"
-                synthesis_input = texttospeech.SynthesisInput(text=nepali_text)
-                
-                # Try Nepali first, fallback to Hindi if not available
-                try:
-                    voice = texttospeech.VoiceSelectionParams(
-                        language_code="ne-NP",
-                        ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
-                    )
-                except:
-                    # Fallback to Hindi (closest available language)
-                    voice = texttospeech.VoiceSelectionParams(
-                        language_code="hi-IN",
-                        name="hi-IN-Standard-A",
-                        ssml_gender=texttospeech.SsmlVoiceGender.FEMALE,
-                    )
-                
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=texttospeech.AudioEncoding.MP3
-                )
-                response = client.synthesize_speech(
-                    input=synthesis_input, voice=voice, audio_config=audio_config
-                )
-                with open(nepali_audio_path, "wb") as out:
-                    out.write(response.audio_content)
-                audio_paths["nepali"] = f"static/audio/{question_id}_ne.mp3"
+                audio_paths["nepali"] = tts_audio_ref(nepali_text, "ne-NP", ssml_gender="FEMALE")
             
         except Exception as e:
             # Log error but don't fail - audio is optional
@@ -645,7 +518,7 @@ class SocraticQuestioningTool(BaseTool):
                     "japanese": question_ja,
                     "nepali": question_ne,
                 },
-                "audio_files": audio_paths,  # Store audio file paths
+                "audio_files": audio_paths,  # TTS cache references, not file paths
                 "learning_objective": question_data["learning_objective"],
                 "hint_if_stuck": question_data.get("hint_if_stuck", ""),
                 "question_timestamp": datetime.now(timezone.utc).isoformat(),
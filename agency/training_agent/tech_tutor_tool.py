@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import KnowledgeBase, SessionLocal
+from utils.clients import get_gemini_client
 
 # Try to import google-genai for enhanced explanations
 try:
@@ -170,7 +171,7 @@ class TechTutorTool(BaseTool):
             return None
         
         try:
-            client = genai.Client(api_key=config.GEMINI_API_KEY)
+            client = get_gemini_client()
             
             prompt = f"""You are a technical tutor explaining AI/ML concepts using Japanese technical loanwords.
 
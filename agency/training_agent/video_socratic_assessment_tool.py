@@ -21,6 +21,8 @@ import os
 
 import config
 from database.db_manager import Candidate, CurriculumProgress, SessionLocal
+from utils.clients import get_gemini_client
+from utils.translation_cache import translate_text
 from models.curriculum import Syllabus
 
 # Try to import google-cloud-translate for multilingual support
@@ -116,86 +118,26 @@ class VideoSocraticAssessmentTool(BaseTool):
         Translate text using Google Cloud Translate API.
         
         For multilingual support: Questions are translated based on user's language selection,
-        but PDF assessments remain in English.
+        but PDF assessments remain in English. Translations are served from the
+        translation cache when possible (see utils/translation_cache.py).
         
         Language codes: 'en' (English), 'ja' (Japanese), 'ne' (Nepali)
         """
         if target_language == "en" or not text:
             return text
         
-        if not GOOGLE_TRANSLATE_AVAILABLE:
-            # Fallback: Return placeholder translation
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
-        
-        # Check if project ID is configured
-        project_id = config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID
-        credentials_path = config.GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH
-        
-        if not project_id:
-            # Fallback: Return placeholder translation
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
-        
-        try:
-            # Initialize translation client
-            client = None
-            project_root = Path(__file__).parent.parent.parent
-            
-            # Try credentials path from config
-            if credentials_path:
-                creds_path = Path(credentials_path)
-                if not creds_path.is_absolute():
-                    creds_path = project_root / credentials_path
-                
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = translate.Client.from_service_account_json(str(creds_path))
-            
-            # If no client yet, try default credentials file location
-            if client is None:
-                default_creds = project_root / "google_creds.json"
-                if default_creds.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(default_creds)
-                    client = translate.Client.from_service_account_json(str(default_creds))
-            
-            # If still no client, try environment variable
-            if client is None and os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
-                env_creds = Path(os.environ['GOOGLE_APPLICATION_CREDENTIALS'])
-                if env_creds.exists():
-                    client = translate.Client()
-            
-            # Last resort: use project ID only (requires default credentials)
-            if client is None:
-                client = translate.Client(project=project_id)
-            
-            # Perform translation
-            # Language codes: 'ja' for Japanese, 'ne' for Nepali
-            result = client.translate(text, target_language=target_language)
-            translated_text = result.get("translatedText", text)
-            
-            # Ensure we return the translated text
-            if translated_text and translated_text != text:
+        # Check if Google Translate is available and a project ID is configured
+        if GOOGLE_TRANSLATE_AVAILABLE and config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID:
+            translated_text = translate_text(text, target_language)
+            if translated_text:
                 return translated_text
-            else:
-                return translated_text if translated_text else text
-            
-        except Exception as e:
-            # Log error but don't fail - return placeholder
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Translation error: {e}")
-            if target_language == "ja":
-                return f"[Japanese Translation: {text}]"
-            elif target_language == "ne":
-                return f"[Nepali Translation: {text}]"
-            return text
+        
+        # Fallback: Return placeholder translation
+        if target_language == "ja":
+            return f"[Japanese Translation: {text}]"
+        elif target_language == "ne":
+            return f"[Nepali Translation: {text}]"
+        return text
 
     def _get_probing_question(self, topic: str, db: Session) -> Optional[str]:
         """
@@ -268,7 +210,7 @@ class VideoSocraticAssessmentTool(BaseTool):
             }
         
         try:
-            client = genai.Client(api_key=config.GEMINI_API_KEY)
+            client = get_gemini_client()
             
             # Build evaluation prompt based on track
             track_context = {
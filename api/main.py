@@ -4,20 +4,42 @@ XploreKodo Agency API Layer (FastAPI)
 Exposes REST endpoints for:
 - POST /start-lesson: Triggers TrainingAgent to generate VirtualInstructorTool script
 - POST /process-voice: Processes base64 audio (Nepali) -> Japanese text/audio
+  (also /process-voice/upload for multipart and /process-voice/raw for a raw audio body)
+- POST /language-coaching: Transcribes and grades audio
+  (also /language-coaching/upload and /language-coaching/raw)
 - GET /candidate-wisdom: Fetches OperationsAgent wisdom report for a candidate
+- POST /jobs, GET /jobs/{job_id}: Enqueue long-running work and poll for its result
+  (also /jobs/language-coaching/raw for grading jobs with a raw audio body)
+- POST /sensei/stream: Streams a Sensei chat reply token by token (server-sent events)
+- GET /wisdom-snapshots: Daily wisdom snapshot aggregates for trend views
+- GET /cache-stats: Eligibility and wisdom cache hit-rate metrics, TTS cache size
+- GET /media/{root}/{path}: Lesson and intro videos with Range, ETag and Cache-Control
 
 All endpoints verify Phase 2 eligibility from PostgreSQL database.
+
+Database lookups use the async engine (asyncpg) so they never block the event
+loop; blocking tool .run() calls are offloaded to a bounded thread pool.
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import functools
+import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import select
 
 # Add project root to path
 project_root = str(Path(__file__).parent.parent.resolve())
@@ -25,7 +47,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 import config
-from database.db_manager import Candidate, SessionLocal
+from database.async_db_manager import ASYNC_DB_AVAILABLE, async_session_scope, dispose_async_engine
+from database.db_manager import Candidate, session_scope
 
 # Import Phase 2 tools (may raise error if PHASE_2_ENABLED is False)
 try:
@@ -35,7 +58,26 @@ except RuntimeError:
 
 from agency.training_agent.tools import VirtualInstructorTool
 from agency.training_agent.language_coaching_tool import LanguageCoachingTool
-from agency.operations_agent.tools import GenerateWisdomReport
+from agency.operations_agent.wisdom_snapshot import get_wisdom_snapshot, list_wisdom_snapshots, refresh_wisdom_snapshot
+from utils.lru_cache import LRUCache
+from utils.job_queue import JOB_HANDLERS, enqueue_job, get_job, get_job_upload_dir
+from utils.sensei_chat import build_sensei_prompt, stream_sensei_response
+from utils.eligibility_cache import cache_eligibility, get_cached_eligibility, get_eligibility_cache_stats
+from utils.media import (
+    MEDIA_CORS_REQUEST_HEADERS,
+    RangeNotSatisfiable,
+    iter_file_range,
+    media_cors_headers,
+    media_etag,
+    media_type,
+    parse_range,
+    resolve_media_path,
+)
+from utils.metrics import observe_request, render_prometheus, span
+from utils.rate_limiter import AdmissionDenied, AdmissionTicket, admit, rate_limit_backend
+from utils.translation_cache import get_translation_cache_stats
+from utils.tts_cache import get_tts_cache_stats
+from api.utils import AudioTooLargeError, read_audio_stream, spool_audio_stream, upload_chunks
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,6 +86,88 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Bounded pool for blocking work (tool .run() calls, sync DB fallback), so slow
+# PostgreSQL/Gemini calls never stall the event loop
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=config.API_BLOCKING_WORKERS,
+    thread_name_prefix="api-blocking",
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable on the bounded worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+# Upstream services each expensive endpoint fans out to (see utils/rate_limiter.py)
+COACHING_SERVICES = ("speech", "gemini")
+VOICE_SERVICES = ("openai",)
+SENSEI_SERVICES = ("gemini",)
+JOB_SERVICES = {
+    "performance_report": ("gemini",),
+    "language_coaching": COACHING_SERVICES,
+    "translation": ("gemini",),
+    "wisdom_report": (),
+}
+
+
+async def _admit(candidate_id: str, services: tuple[str, ...]) -> AdmissionTicket:
+    """Admit a request or fail fast with 429/503 and Retry-After."""
+    try:
+        if rate_limit_backend.shared:
+            return await run_blocking(admit, candidate_id, services)
+        return admit(candidate_id, services)
+    except AdmissionDenied as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after_header},
+        )
+
+
+@contextlib.asynccontextmanager
+async def _admitted(candidate_id: str, services: tuple[str, ...]) -> AsyncIterator[None]:
+    """Hold a candidate's and the upstream services' admission slots for the duration of a request."""
+    ticket = await _admit(candidate_id, services)
+    try:
+        yield
+    finally:
+        ticket.release()
+
+
+async def _phase_2_denial(candidate_id: str, response_model: type[BaseModel]) -> BaseModel | None:
+    """
+    Failure response for a candidate who is not Phase 2 eligible, or None.
+
+    Checked before _admitted() so ineligible requests spend no rate-limit
+    tokens or concurrency slots.
+    """
+    is_eligible, message = await check_phase_2_eligibility_async(candidate_id)
+    return None if is_eligible else response_model(success=False, message=message)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record each request's latency per method, route template and status (see GET /metrics)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        observe_request(request.method, path, status, time.perf_counter() - started)
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Release pooled async connections and worker threads."""
+    await dispose_async_engine()
+    _blocking_executor.shutdown(wait=False)
+
 
 # Request/Response Models
 class StartLessonRequest(BaseModel):
@@ -64,9 +188,36 @@ class ProcessVoiceResponse(BaseModel):
     audio_output_path: str | None = None
     transcribed_text: str | None = None
     translated_text: str | None = None
+    timings_ms: dict[str, float] | None = None
     message: str
 
 
+class SenseiChatRequest(BaseModel):
+    candidate_id: str
+    message: str
+    conversation_history: list[dict[str, str]] = []  # [{'role': 'user'|'sensei', 'content': ...}]
+    transcript: str = ""
+    timer_elapsed: int = 0
+    track: str = "Food/Tech"
+    current_page: str | None = None
+
+class EnqueueJobRequest(BaseModel):
+    job_type: str  # performance_report, language_coaching, translation, wisdom_report
+    payload: dict[str, Any] = {}  # Always includes candidate_id; language_coaching sends audio_base64
+    max_attempts: int | None = None
+
+class JobStatusResponse(BaseModel):  # The payload is not returned (it may reference spooled audio)
+    job_id: int
+    job_type: str
+    status: str  # queued, running, succeeded, failed
+    attempts: int
+    max_attempts: int
+    result: Any = None
+    error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
 class CandidateWisdomResponse(BaseModel):
     success: bool
     report: str | None = None
@@ -88,35 +239,84 @@ class LanguageCoachingResponse(BaseModel):
     accuracy_feedback: str | None = None
     grammar_feedback: str | None = None
     pronunciation_hint: str | None = None
+    cheating_risk_score: int | None = None
+    timings_ms: dict[str, float] | None = None
     message: str
 
 
+def _eligibility_result(candidate_id: str, candidate_exists: bool, travel_ready: bool) -> tuple[bool, str]:
+    """Turn a candidate's (exists, travel_ready) state into an eligibility result."""
+    if not candidate_exists:
+        return False, f"Candidate {candidate_id} not found in database."
+
+    # Check if candidate is travel-ready (basic eligibility)
+    if not travel_ready:
+        return False, f"Candidate {candidate_id} is not travel-ready. Complete all requirements first."
+
+    return True, "Candidate is eligible for Phase 2 features."
+
+
 # Helper function to check Phase 2 eligibility
 def check_phase_2_eligibility(candidate_id: str) -> tuple[bool, str]:
     """
     Check if candidate is eligible for Phase 2 features.
 
+    Served from the eligibility cache when possible (see utils/eligibility_cache.py).
+
     Returns:
         (is_eligible: bool, message: str)
     """
     if not config.PHASE_2_ENABLED:
         return False, "Phase 2 features are not enabled. Set PHASE_2_ENABLED=True in .env"
 
-    db = SessionLocal()
+    cached = get_cached_eligibility(candidate_id)
+    if cached is not None:
+        return _eligibility_result(candidate_id, *cached)
+
     try:
-        candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
-        if not candidate:
-            return False, f"Candidate {candidate_id} not found in database."
+        with span("eligibility.db_lookup"), session_scope() as db:
+            row = db.query(Candidate.travel_ready).filter(Candidate.candidate_id == candidate_id).first()
+    except Exception as e:
+        return False, f"Database error: {str(e)}"
+
+    state = (row is not None, bool(row.travel_ready) if row is not None else False)
+    cache_eligibility(candidate_id, *state)
+    return _eligibility_result(candidate_id, *state)
+
+
+async def check_phase_2_eligibility_async(candidate_id: str) -> tuple[bool, str]:
+    """
+    Async version of check_phase_2_eligibility() for API endpoints.
+
+    Queries PostgreSQL through the asyncpg engine; falls back to the
+    synchronous check on the worker pool when async access is unavailable.
+
+    Returns:
+        (is_eligible: bool, message: str)
+    """
+    if not config.PHASE_2_ENABLED:
+        return False, "Phase 2 features are not enabled. Set PHASE_2_ENABLED=True in .env"
+
+    cached = get_cached_eligibility(candidate_id)
+    if cached is not None:
+        return _eligibility_result(candidate_id, *cached)
 
-        # Check if candidate is travel-ready (basic eligibility)
-        if not candidate.travel_ready:
-            return False, f"Candidate {candidate_id} is not travel-ready. Complete all requirements first."
+    if not ASYNC_DB_AVAILABLE:
+        return await run_blocking(check_phase_2_eligibility, candidate_id)
 
-        return True, "Candidate is eligible for Phase 2 features."
+    try:
+        with span("eligibility.db_lookup"):
+            async with async_session_scope() as db:
+                result = await db.execute(
+                    select(Candidate.travel_ready).where(Candidate.candidate_id == candidate_id)
+                )
+                row = result.first()
     except Exception as e:
         return False, f"Database error: {str(e)}"
-    finally:
-        db.close()
+
+    state = (row is not None, bool(row.travel_ready) if row is not None else False)
+    cache_eligibility(candidate_id, *state)
+    return _eligibility_result(candidate_id, *state)
 
 
 @app.get("/")
@@ -130,10 +330,101 @@ async def root():
             "POST /start-lesson": "Generate VirtualInstructorTool lesson script",
             "POST /process-voice": "Process Nepali audio -> Japanese text/audio",
             "GET /candidate-wisdom": "Get wisdom report for a candidate",
+            "POST /jobs": "Enqueue a background job (PDF report, grading, translation, wisdom report)",
+            "POST /jobs/language-coaching/raw": "Enqueue a grading job with the audio as the request body",
+            "GET /jobs/{job_id}": "Background job status and result",
+            "POST /sensei/stream": "Stream a Sensei chat reply (server-sent events)",
+            "GET /wisdom-snapshots": "Daily wisdom snapshot history",
+            "GET /cache-stats": "Eligibility, wisdom and translation cache hit-rate metrics, TTS cache size",
+            "GET /metrics": "Request and per-stage latency histograms (Prometheus text format)",
+            "GET /media/{root}/{path}": "Lesson and intro videos (Range requests, ETag, Cache-Control)",
         },
     }
 
 
+@app.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss counters of the in-process caches (for tuning TTLs) and TTS cache disk usage."""
+    return {
+        "eligibility": get_eligibility_cache_stats(),
+        "wisdom": _wisdom_cache.stats(),
+        "translation": get_translation_cache_stats(),
+        "tts": await run_blocking(get_tts_cache_stats),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Latency histograms per endpoint and per instrumented stage, for Prometheus to scrape."""
+    return Response(content=render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.options("/media/{root}/{file_path:path}")
+async def media_preflight(root: str, file_path: str):
+    """CORS preflight for players that send Range or conditional headers cross-origin."""
+    return Response(status_code=204, headers={
+        **media_cors_headers(),
+        "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+        "Access-Control-Allow-Headers": MEDIA_CORS_REQUEST_HEADERS,
+        "Access-Control-Max-Age": str(config.MEDIA_CACHE_MAX_AGE),
+    })
+
+
+@app.api_route("/media/{root}/{file_path:path}", methods=["GET", "HEAD"])
+async def serve_media(root: str, file_path: str, request: Request):
+    """
+    Serve a video from static/videos, app/static/videos or assets/videos.
+
+    Supports single byte-range requests (seeking without a full download),
+    If-Range, and ETag / If-None-Match revalidation; responses are cacheable
+    for MEDIA_CACHE_MAX_AGE seconds and readable cross-origin (see
+    media_cors_headers()).
+    """
+    path = resolve_media_path(root, file_path)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Media file not found")
+
+    stat = path.stat()
+    etag = media_etag(stat)
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+    headers = {
+        **media_cors_headers(),
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={config.MEDIA_CACHE_MAX_AGE}",
+    }
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None  # File changed since the client's partial copy: send all of it
+
+    try:
+        byte_range = parse_range(range_header, stat.st_size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{stat.st_size}"})
+
+    status_code = 200
+    start, end = 0, stat.st_size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    if request.method == "HEAD" or stat.st_size == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type(path))
+    return StreamingResponse(
+        iter_file_range(path, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type(path),
+    )
+
+
 @app.post("/start-lesson", response_model=dict)
 async def start_lesson(request: StartLessonRequest):
     """
@@ -142,7 +433,7 @@ async def start_lesson(request: StartLessonRequest):
     Verifies Phase 2 eligibility before generating the lesson script.
     """
     # Check Phase 2 eligibility
-    is_eligible, message = check_phase_2_eligibility(request.candidate_id)
+    is_eligible, message = await check_phase_2_eligibility_async(request.candidate_id)
     if not is_eligible:
         raise HTTPException(status_code=403, detail=message)
 
@@ -156,7 +447,7 @@ async def start_lesson(request: StartLessonRequest):
         )
 
         # Generate lesson script
-        script_result = tool.run()
+        script_result = await run_blocking(tool.run)
 
         return {
             "success": True,
@@ -169,22 +460,13 @@ async def start_lesson(request: StartLessonRequest):
         raise HTTPException(status_code=500, detail=f"Error generating lesson script: {str(e)}")
 
 
-@app.post("/process-voice", response_model=ProcessVoiceResponse)
-async def process_voice(request: ProcessVoiceRequest):
-    """
-    Process base64 audio string (Nepali) -> Japanese text/audio.
-
-    Uses VoiceToVoiceTranslator with OpenAI Whisper, GPT-4o, and TTS.
-    Verifies Phase 2 eligibility before processing.
-    """
-    # Check Phase 2 eligibility
-    is_eligible, message = check_phase_2_eligibility(request.candidate_id)
-    if not is_eligible:
-        return ProcessVoiceResponse(
-            success=False,
-            message=message,
-        )
-
+async def _process_voice(
+    candidate_id: str,
+    tts_voice: str,
+    audio_base64: str | None = None,
+    audio_input_path: Path | None = None,
+) -> ProcessVoiceResponse:
+    """Shared implementation of the /process-voice variants (eligibility is checked by the caller)."""
     try:
         if VoiceToVoiceTranslator is None:
             return ProcessVoiceResponse(
@@ -194,52 +476,24 @@ async def process_voice(request: ProcessVoiceRequest):
 
         # Create VoiceToVoiceTranslator instance
         translator = VoiceToVoiceTranslator(
-            audio_base64=request.audio_base64,
+            audio_base64=audio_base64,
+            audio_input_path=str(audio_input_path) if audio_input_path else None,
             source_language="Nepali",
             target_language="Japanese",
-            tts_voice=request.tts_voice,
+            tts_voice=tts_voice,
         )
 
         # Process voice-to-voice translation
-        result = translator.run()
-
-        # Parse result to extract paths and text
-        # The result is a formatted string, so we'll extract key information
-        audio_output_path = None
-        transcribed_text = None
-        translated_text = None
-
-        # Extract audio path from result
-        for line in result.split("\n"):
-            if "Audio Output Path:" in line:
-                audio_output_path = line.split("Audio Output Path:")[-1].strip()
-                break
-
-        # Extract transcribed text (look for line with "Transcribed Nepali audio:")
-        for line in result.split("\n"):
-            if "Transcribed Nepali audio:" in line:
-                # Extract text between quotes
-                if '"' in line:
-                    parts = line.split('"')
-                    if len(parts) >= 2:
-                        transcribed_text = parts[1]
-                break
-
-        # Extract translated text (look for line with "Translated to Polite Japanese:")
-        for line in result.split("\n"):
-            if "Translated to Polite Japanese:" in line:
-                # Extract text between quotes
-                if '"' in line:
-                    parts = line.split('"')
-                    if len(parts) >= 2:
-                        translated_text = parts[1]
-                break
+        result = await run_blocking(translator.run_structured)
+        if not result.success:
+            return ProcessVoiceResponse(success=False, message=result.error)
 
         return ProcessVoiceResponse(
             success=True,
-            audio_output_path=audio_output_path,
-            transcribed_text=transcribed_text,
-            translated_text=translated_text,
+            audio_output_path=result.audio_output_path,
+            transcribed_text=result.transcribed_text,
+            translated_text=result.translated_text,
+            timings_ms=result.timings_ms,
             message="Voice-to-voice translation completed successfully.",
         )
     except Exception as e:
@@ -249,15 +503,113 @@ async def process_voice(request: ProcessVoiceRequest):
         )
 
 
+
+
+@app.post("/process-voice", response_model=ProcessVoiceResponse)
+async def process_voice(request: ProcessVoiceRequest):
+    """
+    Process base64 audio string (Nepali) -> Japanese text/audio.
+
+    Uses VoiceToVoiceTranslator with OpenAI Whisper, GPT-4o, and TTS.
+    Verifies Phase 2 eligibility before processing.
+    """
+    denied = await _phase_2_denial(request.candidate_id, ProcessVoiceResponse)
+    if denied is not None:
+        return denied
+    async with _admitted(request.candidate_id, VOICE_SERVICES):
+        return await _process_voice(request.candidate_id, request.tts_voice, audio_base64=request.audio_base64)
+
+
+async def _process_voice_stream(candidate_id: str, tts_voice: str, chunks, suffix: str) -> ProcessVoiceResponse:
+    """Spool a streamed upload to a temp file, process it, and remove the file."""
+    denied = await _phase_2_denial(candidate_id, ProcessVoiceResponse)
+    if denied is not None:
+        return denied
+    async with _admitted(candidate_id, VOICE_SERVICES):
+        try:
+            audio_path = await spool_audio_stream(chunks, suffix=suffix)
+        except AudioTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        try:
+            return await _process_voice(candidate_id, tts_voice, audio_input_path=audio_path)
+        finally:
+            audio_path.unlink(missing_ok=True)
+
+
+@app.post("/process-voice/upload", response_model=ProcessVoiceResponse)
+async def process_voice_upload(
+    candidate_id: str = Form(...),
+    tts_voice: str = Form("alloy"),
+    audio: UploadFile = File(...),
+):
+    """
+    Multipart variant of /process-voice: the audio file is streamed to disk
+    instead of being base64-encoded inside JSON.
+    """
+    suffix = Path(audio.filename or "").suffix or ".wav"
+    return await _process_voice_stream(candidate_id, tts_voice, upload_chunks(audio), suffix)
+
+
+@app.post("/process-voice/raw", response_model=ProcessVoiceResponse)
+async def process_voice_raw(request: Request, candidate_id: str, tts_voice: str = "alloy", suffix: str = ".wav"):
+    """
+    Raw-body variant of /process-voice: send the audio bytes as the request
+    body (chunked transfer encoding supported), with parameters in the query string.
+    """
+    return await _process_voice_stream(candidate_id, tts_voice, request.stream(), suffix)
+
+
+# Today's wisdom snapshot, keyed by report date
+_wisdom_cache = LRUCache(maxsize=2, ttl_seconds=config.WISDOM_CACHE_TTL_SECONDS)
+_wisdom_refresh_lock = asyncio.Lock()
+
+
+async def _get_todays_wisdom_snapshot() -> dict[str, Any]:
+    """
+    Return today's wisdom snapshot from memory, the database, or (if the
+    scheduled job has not run yet) by computing it once.
+    """
+    report_date = datetime.now().strftime("%Y-%m-%d")
+    snapshot = _wisdom_cache.get(report_date)
+    if snapshot is not None:
+        return snapshot
+
+    async with _wisdom_refresh_lock:
+        snapshot = _wisdom_cache.get(report_date)
+        if snapshot is None:
+            snapshot = await run_blocking(get_wisdom_snapshot, report_date)
+            if snapshot is None:
+                snapshot = await run_blocking(refresh_wisdom_snapshot, report_date)
+            _wisdom_cache.set(report_date, snapshot)
+    return snapshot
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against a snapshot."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
 @app.get("/candidate-wisdom/{candidate_id}", response_model=CandidateWisdomResponse)
-async def get_candidate_wisdom(candidate_id: str):
+async def get_candidate_wisdom(candidate_id: str, request: Request, response: Response):
     """
     Fetch OperationsAgent wisdom report for a specific candidate.
 
-    Verifies Phase 2 eligibility before generating the report.
+    Verifies Phase 2 eligibility, then serves the day's precomputed wisdom
+    snapshot (see scripts/refresh_wisdom_snapshot.py). Supports conditional
+    requests via ETag / Last-Modified.
     """
     # Check Phase 2 eligibility
-    is_eligible, message = check_phase_2_eligibility(candidate_id)
+    is_eligible, message = await check_phase_2_eligibility_async(candidate_id)
     if not is_eligible:
         return CandidateWisdomResponse(
             success=False,
@@ -265,105 +617,263 @@ async def get_candidate_wisdom(candidate_id: str):
         )
 
     try:
-        # Create GenerateWisdomReport tool instance
-        tool = GenerateWisdomReport(
-            date=None,  # Use today's date
-            include_token_metrics=True,
-        )
-
-        # Generate wisdom report
-        report_result = tool.run()
-
-        # Extract report content (the tool returns a formatted string)
-        # The report is saved to file, but we also return it in the response
-        return CandidateWisdomResponse(
-            success=True,
-            report=report_result,
-            message="Wisdom report generated successfully.",
-        )
+        snapshot = await _get_todays_wisdom_snapshot()
     except Exception as e:
         return CandidateWisdomResponse(
             success=False,
             message=f"Error generating wisdom report: {str(e)}",
         )
 
+    etag = f'"{snapshot["etag"]}"'
+    cache_headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(snapshot["generated_at"], usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _is_not_modified(request, etag, snapshot["generated_at"]):
+        return Response(status_code=304, headers=cache_headers)
 
-@app.post("/language-coaching", response_model=LanguageCoachingResponse)
-async def language_coaching(request: LanguageCoachingRequest):
+    response.headers.update(cache_headers)
+    return CandidateWisdomResponse(
+        success=True,
+        report=snapshot["report"],
+        message="Wisdom report generated successfully.",
+    )
+
+
+@app.get("/wisdom-snapshots")
+async def get_wisdom_snapshots(limit: int = 30):
+    """Daily wisdom snapshot aggregates, newest first (for trend views)."""
+    limit = max(1, min(limit, 365))
+    return {"snapshots": await run_blocking(list_wisdom_snapshots, limit)}
+
+
+def _sse_event(data: dict[str, Any], event: str | None = None) -> str:
+    """Format one server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_chunks(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """Pull chunks from a blocking iterator on the worker pool and emit them as SSE events."""
+    sentinel = object()
+    try:
+        while True:
+            chunk = await run_blocking(next, chunks, sentinel)
+            if chunk is sentinel:
+                break
+            yield _sse_event({"text": chunk})
+        yield _sse_event({}, event="done")
+    except Exception as e:
+        yield _sse_event({"message": str(e)}, event="error")
+    finally:
+        try:
+            chunks.close()  # stop the upstream stream if the client went away
+        except (AttributeError, ValueError):
+            pass
+
+
+class AdmittedStreamingResponse(StreamingResponse):
     """
-    Process audio recording, transcribe, grade with Gemini, and save to database.
-    
-    Uses Google Cloud Speech-to-Text for transcription and Gemini 1.5 Flash for grading.
+    StreamingResponse that holds an admission ticket until the response ends.
+
+    The ticket is released when the response has been sent, fails, or is
+    cancelled, even if the body iterator was never started (e.g. the client
+    disconnected first), which a finally block inside the generator cannot
+    guarantee.
+    """
+
+    def __init__(self, content: Any, ticket: AdmissionTicket, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.ticket.release()
+
+
+@app.post("/sensei/stream")
+async def stream_sensei(request: SenseiChatRequest):
+    """
+    Stream a Socratic Sensei reply as server-sent events.
+
+    Each `data:` event carries {"text": <chunk>} as Gemini produces it; the
+    stream ends with an `event: done` (or `event: error`) event. Verifies
+    Phase 2 eligibility before calling the model.
     """
     # Check Phase 2 eligibility
-    is_eligible, message = check_phase_2_eligibility(request.candidate_id)
+    is_eligible, message = await check_phase_2_eligibility_async(request.candidate_id)
     if not is_eligible:
-        return LanguageCoachingResponse(
-            success=False,
-            message=message,
+        raise HTTPException(status_code=403, detail=message)
+
+    ticket = await _admit(request.candidate_id, SENSEI_SERVICES)
+    try:
+        prompt = await run_blocking(
+            build_sensei_prompt,
+            request.message,
+            request.conversation_history,
+            request.transcript,
+            request.timer_elapsed,
+            request.track,
+            request.current_page,
         )
+    except Exception:
+        ticket.release()
+        raise
+    return AdmittedStreamingResponse(
+        _stream_chunks(stream_sensei_response(prompt)),
+        ticket,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+async def _enqueue_candidate_job(
+    job_type: str,
+    payload: dict[str, Any],
+    max_attempts: int | None = None,
+    audio_chunks: AsyncIterator[bytes] | None = None,
+    suffix: str = ".wav",
+) -> JobStatusResponse:
+    """
+    Enqueue a job on behalf of a Phase 2 eligible candidate.
+
+    The job is admitted against the candidate's and its upstream services'
+    rate limits like the synchronous endpoints, so clients cannot queue work
+    faster than it could be served. Audio for language_coaching jobs is
+    spooled to JOB_UPLOAD_DIR and only its path goes into the payload; the
+    worker deletes the file when the job ends.
+    """
+    if job_type not in JOB_HANDLERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job type: {job_type}. Available: {', '.join(sorted(JOB_HANDLERS))}",
+        )
+    candidate_id = payload.get("candidate_id")
+    if not candidate_id:
+        raise HTTPException(status_code=400, detail="Job payloads must include a candidate_id.")
+    if "audio_path" in payload:
+        raise HTTPException(status_code=400, detail="audio_path is set by the server; send the audio instead.")
+    if job_type == "language_coaching" and audio_chunks is None:
+        raise HTTPException(status_code=400, detail="language_coaching jobs need audio.")
+    if job_type != "language_coaching" and audio_chunks is not None:
+        raise HTTPException(status_code=400, detail=f"{job_type} jobs do not take audio.")
+
+    is_eligible, message = await check_phase_2_eligibility_async(candidate_id)
+    if not is_eligible:
+        raise HTTPException(status_code=403, detail=message)
+
+    async with _admitted(candidate_id, JOB_SERVICES.get(job_type, ())):
+        audio_path = None
+        if audio_chunks is not None:
+            try:
+                audio_path = await spool_audio_stream(audio_chunks, suffix=suffix, directory=get_job_upload_dir())
+            except AudioTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            payload = {**payload, "audio_path": str(audio_path)}
+        try:
+            job_id = await run_blocking(enqueue_job, job_type, payload, max_attempts)
+        except BaseException as e:
+            if audio_path is not None:
+                audio_path.unlink(missing_ok=True)
+            if isinstance(e, ValueError):
+                raise HTTPException(status_code=400, detail=str(e))
+            raise
+    return JobStatusResponse(**await run_blocking(get_job, job_id))
+
+
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def create_job(request: EnqueueJobRequest):
+    """
+    Enqueue long-running work for the background workers (scripts/run_job_worker.py).
 
+    Returns immediately with the job ID; poll GET /jobs/{job_id} for the result.
+    Every job is submitted for a candidate (payload.candidate_id), who must be
+    Phase 2 eligible and within its rate limits. language_coaching jobs carry payload.audio_base64, which
+    is decoded and spooled to a file rather than stored in the queue.
+    """
+    payload = dict(request.payload)
+    audio_chunks = None
+    if "audio_base64" in payload:
+        try:
+            audio_bytes = base64.b64decode(payload.pop("audio_base64") or "", validate=True)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="audio_base64 is not valid base64.")
+        audio_chunks = _single_chunk(audio_bytes)
+    return await _enqueue_candidate_job(request.job_type, payload, request.max_attempts, audio_chunks)
+
+
+@app.post("/jobs/language-coaching/raw", response_model=JobStatusResponse, status_code=202)
+async def create_language_coaching_job_raw(
+    request: Request,
+    candidate_id: str,
+    language_code: str = "ja-JP",
+    question_id: str | None = None,
+    expected_answer: str | None = None,
+    suffix: str = ".wav",
+    max_attempts: int | None = None,
+):
+    """
+    Raw-body variant of POST /jobs for language_coaching: the audio body is
+    streamed straight to JOB_UPLOAD_DIR, with parameters in the query string.
+    """
+    payload = {"candidate_id": candidate_id, "language_code": language_code}
+    if question_id is not None:
+        payload["question_id"] = question_id
+    if expected_answer is not None:
+        payload["expected_answer"] = expected_answer
+    return await _enqueue_candidate_job("language_coaching", payload, max_attempts, request.stream(), suffix)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: int):
+    """Status, result and last error of a background job."""
+    job = await run_blocking(get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+    return JobStatusResponse(**job)
+
+
+async def _language_coaching(
+    candidate_id: str,
+    language_code: str = "ja-JP",
+    question_id: str | None = None,
+    expected_answer: str | None = None,
+    audio_base64: str | None = None,
+    audio_bytes: bytes | None = None,
+) -> LanguageCoachingResponse:
+    """Shared implementation of the /language-coaching variants (eligibility is checked by the caller)."""
     try:
         # Create LanguageCoachingTool instance
         tool = LanguageCoachingTool(
-            candidate_id=request.candidate_id,
-            audio_base64=request.audio_base64,
-            language_code=request.language_code,
-            question_id=request.question_id,
-            expected_answer=request.expected_answer,
+            candidate_id=candidate_id,
+            audio_base64=audio_base64 or "",
+            audio_bytes=audio_bytes,
+            language_code=language_code,
+            question_id=question_id,
+            expected_answer=expected_answer,
         )
 
         # Process audio, transcribe, and grade
-        result = tool.run()
-
-        # Parse result to extract information
-        # The result is a formatted string, so we'll extract key information
-        transcript = None
-        grade = None
-        accuracy_feedback = None
-        grammar_feedback = None
-        pronunciation_hint = None
-
-        # Extract transcript
-        for line in result.split("\n"):
-            if "**🎤 Transcribed Response:**" in line or "Transcribed Response:" in line:
-                # Get next line
-                lines = result.split("\n")
-                idx = result.split("\n").index(line)
-                if idx + 1 < len(lines):
-                    transcript = lines[idx + 1].strip()
-                break
-
-        # Extract grade
-        for line in result.split("\n"):
-            if "**Overall Grade:" in line or "Overall Grade:" in line:
-                # Extract number from line like "**Overall Grade: 8/10**"
-                import re
-                match = re.search(r'(\d+)/10', line)
-                if match:
-                    grade = int(match.group(1))
-                break
-
-        # Extract feedback sections
-        lines = result.split("\n")
-        for i, line in enumerate(lines):
-            if "**✅ Accuracy Feedback:**" in line or "Accuracy Feedback:" in line:
-                if i + 1 < len(lines):
-                    accuracy_feedback = lines[i + 1].strip()
-            elif "**📝 Grammar Feedback:**" in line or "Grammar Feedback:" in line:
-                if i + 1 < len(lines):
-                    grammar_feedback = lines[i + 1].strip()
-            elif "**🎯 Pronunciation Hint:**" in line or "Pronunciation Hint:" in line:
-                if i + 1 < len(lines):
-                    pronunciation_hint = lines[i + 1].strip()
+        result = await run_blocking(tool.run_structured)
+        if not result.success:
+            return LanguageCoachingResponse(success=False, message=result.error)
 
         return LanguageCoachingResponse(
             success=True,
-            transcript=transcript,
-            grade=grade,
-            accuracy_feedback=accuracy_feedback,
-            grammar_feedback=grammar_feedback,
-            pronunciation_hint=pronunciation_hint,
+            transcript=result.transcript,
+            grade=result.grade,
+            accuracy_feedback=result.accuracy_feedback,
+            grammar_feedback=result.grammar_feedback,
+            pronunciation_hint=result.pronunciation_hint,
+            cheating_risk_score=result.cheating_risk_score,
+            timings_ms=result.timings_ms,
             message="Language coaching completed successfully.",
         )
     except Exception as e:
@@ -373,6 +883,85 @@ async def language_coaching(request: LanguageCoachingRequest):
         )
 
 
+@app.post("/language-coaching", response_model=LanguageCoachingResponse)
+async def language_coaching(request: LanguageCoachingRequest):
+    """
+    Process audio recording, transcribe, grade with Gemini, and save to database.
+    
+    Uses Google Cloud Speech-to-Text for transcription and Gemini 1.5 Flash for grading.
+    """
+    denied = await _phase_2_denial(request.candidate_id, LanguageCoachingResponse)
+    if denied is not None:
+        return denied
+    async with _admitted(request.candidate_id, COACHING_SERVICES):
+        return await _language_coaching(
+            request.candidate_id,
+            language_code=request.language_code,
+            question_id=request.question_id,
+            expected_answer=request.expected_answer,
+            audio_base64=request.audio_base64,
+        )
+
+
+@app.post("/language-coaching/upload", response_model=LanguageCoachingResponse)
+async def language_coaching_upload(
+    candidate_id: str = Form(...),
+    language_code: str = Form("ja-JP"),
+    question_id: str | None = Form(None),
+    expected_answer: str | None = Form(None),
+    audio: UploadFile = File(...),
+):
+    """
+    Multipart variant of /language-coaching: the audio file is read into one
+    bounded buffer and passed to transcription as raw bytes.
+    """
+    denied = await _phase_2_denial(candidate_id, LanguageCoachingResponse)
+    if denied is not None:
+        return denied
+    async with _admitted(candidate_id, COACHING_SERVICES):
+        try:
+            audio_bytes = await read_audio_stream(upload_chunks(audio))
+        except AudioTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return await _language_coaching(
+            candidate_id,
+            language_code=language_code,
+            question_id=question_id,
+            expected_answer=expected_answer,
+            audio_bytes=audio_bytes,
+        )
+
+
+@app.post("/language-coaching/raw", response_model=LanguageCoachingResponse)
+async def language_coaching_raw(
+    request: Request,
+    candidate_id: str,
+    language_code: str = "ja-JP",
+    question_id: str | None = None,
+    expected_answer: str | None = None,
+):
+    """
+    Raw-body variant of /language-coaching: send the audio bytes as the
+    request body (chunked transfer encoding supported), with parameters in
+    the query string.
+    """
+    denied = await _phase_2_denial(candidate_id, LanguageCoachingResponse)
+    if denied is not None:
+        return denied
+    async with _admitted(candidate_id, COACHING_SERVICES):
+        try:
+            audio_bytes = await read_audio_stream(request.stream())
+        except AudioTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return await _language_coaching(
+            candidate_id,
+            language_code=language_code,
+            question_id=question_id,
+            expected_answer=expected_answer,
+            audio_bytes=audio_bytes,
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
 
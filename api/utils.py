@@ -7,9 +7,10 @@ Provides helper functions for audio transcription, translation, and other common
 from __future__ import annotations
 
 import io
-import os
 import sys
+import tempfile
 from pathlib import Path
+from typing import AsyncIterator
 
 # Add project root to path
 project_root = str(Path(__file__).parent.parent.resolve())
@@ -36,17 +37,14 @@ def transcribe_audio(audio_bytes: bytes) -> str:
         Exception: If OpenAI API key is not configured or transcription fails
     """
     try:
-        from openai import OpenAI
+        from utils.clients import get_openai_client
         
-        # Get API key from config (loaded from .env file)
-        api_key = config.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
+        # Shared OpenAI client (see utils/clients.py)
+        client = get_openai_client()
         
-        if not api_key:
+        if client is None:
             raise ValueError("OPENAI_API_KEY not found. Set it in .env file or config.py")
         
-        # Initialize OpenAI client (automatically uses OPENAI_API_KEY from environment or config)
-        client = OpenAI(api_key=api_key)
-        
         # Create a file-like object from bytes
         audio_file = io.BytesIO(audio_bytes)
         audio_file.name = "recording.wav"
@@ -67,3 +65,95 @@ def transcribe_audio(audio_bytes: bytes) -> str:
     except Exception as e:
         raise Exception(f"Error transcribing audio with Whisper: {str(e)}")
 
+
+class AudioTooLargeError(ValueError):
+    """Raised when an uploaded audio body exceeds config.MAX_AUDIO_UPLOAD_BYTES."""
+
+
+async def read_audio_stream(chunks: AsyncIterator[bytes], max_bytes: int | None = None) -> bytes:
+    """
+    Collect a streamed audio upload into a single bounded buffer.
+    
+    Chunks are appended to one bytearray as they arrive, so the upload is held
+    in memory once (no JSON string or base64 copies).
+    
+    Args:
+        chunks: Async iterator of body chunks (request.stream() or upload_chunks())
+        max_bytes: Maximum accepted size (default: config.MAX_AUDIO_UPLOAD_BYTES)
+    
+    Returns:
+        Audio bytes
+    
+    Raises:
+        AudioTooLargeError: If the body exceeds max_bytes
+    """
+    max_bytes = max_bytes or config.MAX_AUDIO_UPLOAD_BYTES
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise AudioTooLargeError(f"Audio upload exceeds {max_bytes} bytes.")
+    return bytes(buffer)
+
+
+async def spool_audio_stream(
+    chunks: AsyncIterator[bytes],
+    suffix: str = ".wav",
+    max_bytes: int | None = None,
+    directory: Path | None = None,
+) -> Path:
+    """
+    Stream an audio upload straight into a temporary file.
+    
+    Used by tools that read audio from a path, so the clip never has to be
+    held in memory at all. The caller is responsible for deleting the file.
+    
+    Args:
+        chunks: Async iterator of body chunks
+        suffix: File suffix (lets transcription services detect the format)
+        max_bytes: Maximum accepted size (default: config.MAX_AUDIO_UPLOAD_BYTES)
+        directory: Where to create the file (default: the system temp directory)
+    
+    Returns:
+        Path to the temporary audio file
+    
+    Raises:
+        AudioTooLargeError: If the body exceeds max_bytes (the file is removed)
+    """
+    max_bytes = max_bytes or config.MAX_AUDIO_UPLOAD_BYTES
+    # Only keep a plain extension; the suffix may come from a client-supplied filename
+    suffix = "." + "".join(c for c in suffix.lstrip(".") if c.isalnum())[:8] if suffix.strip(".") else ".wav"
+    written = 0
+    if directory is not None:
+        directory.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(prefix="upload_audio_", suffix=suffix, dir=directory, delete=False)
+    temp_path = Path(temp_file.name)
+    try:
+        with temp_file:
+            async for chunk in chunks:
+                written += len(chunk)
+                if written > max_bytes:
+                    raise AudioTooLargeError(f"Audio upload exceeds {max_bytes} bytes.")
+                temp_file.write(chunk)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return temp_path
+
+
+async def upload_chunks(upload, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """
+    Iterate over a FastAPI UploadFile in fixed-size chunks.
+    
+    Args:
+        upload: fastapi.UploadFile from a multipart form
+        chunk_size: Bytes per read
+    
+    Yields:
+        Body chunks
+    """
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
@@ -50,6 +50,11 @@ import config
 # Configure logger
 logger = logging.getLogger(__name__)
 from database.db_manager import Candidate, CurriculumProgress, Payment, DocumentVault, SessionLocal, StudentPerformance
+from utils.audio_preprocessing import build_recognition_config, prepare_audio_for_stt
+from utils.clients import get_gemini_client, get_speech_client
+from utils.hls import hls_manifest_for
+from utils.media import media_url
+from utils.tts_cache import load_tts_audio, synthesize_speech
 try:
     from models.curriculum import Syllabus
     SYLLABUS_AVAILABLE = True
@@ -304,7 +309,60 @@ def load_financial_summary() -> dict:
         db.close()
 
 
+# hls.js for browsers without native HLS (Safari plays the manifest directly); the MP4 is the last resort
+HLS_PLAYER_HTML = """
+<video id="lesson-video" controls preload="metadata" style="width: 100%; max-height: 400px; border-radius: 10px;"></video>
+<script src="https://cdn.jsdelivr.net/npm/hls.js@1"></script>
+<script>
+    const video = document.getElementById("lesson-video");
+    const manifestUrl = __MANIFEST_URL__;
+    const fallbackUrl = __FALLBACK_URL__;
+    if (video.canPlayType("application/vnd.apple.mpegurl")) {
+        video.src = manifestUrl;
+    } else if (window.Hls && Hls.isSupported()) {
+        const hls = new Hls();
+        hls.on(Hls.Events.ERROR, function (event, data) {
+            // Unrecoverable (blocked manifest, missing segments, codec): play the MP4 instead
+            if (data.fatal) {
+                hls.destroy();
+                if (fallbackUrl) {
+                    video.src = fallbackUrl;
+                }
+            }
+        });
+        hls.loadSource(manifestUrl);
+        hls.attachMedia(video);
+    } else if (fallbackUrl) {
+        video.src = fallbackUrl;
+    }
+</script>
+"""
+
+
+def show_video(video_path: Path, hls_path: str | None = None) -> None:
+    """
+    Play a lesson video from the API media endpoint (seekable, browser-cached), or through Streamlit if unavailable.
+    
+    Args:
+        video_path: Source video file
+        hls_path: Project-relative HLS master playlist (see scripts/package_hls.py), preferred when present
+    """
+    video_url = media_url(video_path)
+    hls_url = media_url(Path(__file__).parent.parent / hls_path) if hls_path else None
+    if hls_url:
+        player_html = HLS_PLAYER_HTML.replace("__MANIFEST_URL__", json.dumps(hls_url)).replace(
+            "__FALLBACK_URL__", json.dumps(video_url)
+        )
+        st.components.v1.html(player_html, height=410)
+    else:
+        st.video(video_url or str(video_path))
+
+
 # Concierge Widget Functions
+# How long the avatar shows its talking state after a new audio response
+CONCIERGE_SPEAKING_SECONDS = 10.0
+
+
 def render_concierge_avatar(talking: bool = False, show_intro_video: bool = False, intro_video_bytes: bytes | None = None):
     """
     Render the 2D Sensei Avatar in the sidebar using native Streamlit toggle.
@@ -331,23 +389,12 @@ def render_concierge_avatar(talking: bool = False, show_intro_video: bool = Fals
     pass
     
     # THE 'IS SPEAKING' LOGIC: Determine which image to show
-    # Check if temp_voice.mp3 was modified in the last 10 seconds
-    temp_audio_path = Path(__file__).parent.parent.resolve() / "static" / "audio" / "temp_voice.mp3"
-    file_recently_modified = False
-    if temp_audio_path.exists():
-        try:
-            file_mtime = temp_audio_path.stat().st_mtime
-            time_since_modification = time.time() - file_mtime
-            # File was modified in the last 10 seconds
-            if time_since_modification < 10.0:
-                file_recently_modified = True
-        except Exception as e:
-            logger.warning(f"Could not check file modification time: {e}")
-    
     # is_talking_state is True if:
     # 1. st.session_state.concierge_avatar_talking is True OR
-    # 2. The temp_voice.mp3 file was modified in the last 10 seconds
-    is_talking_state = st.session_state.concierge_avatar_talking or file_recently_modified
+    # 2. This session's last audio response started less than CONCIERGE_SPEAKING_SECONDS ago
+    # Both live in this session's state, so other users' audio never animates this avatar
+    speaking_until = st.session_state.get("concierge_speaking_until", 0.0)
+    is_talking_state = st.session_state.concierge_avatar_talking or time.time() < speaking_until
     
     # ASSET GENERATION: Base64-encoded SVG images
     # IDLE_SVG: Closed mouth, calm expression
@@ -421,7 +468,7 @@ def render_concierge_avatar(talking: bool = False, show_intro_video: bool = Fals
         st.sidebar.markdown("---")
     
     # NATIVE TOGGLE: Simple st.image() call based on state
-    # Use is_talking_state which includes file modification check
+    # Use is_talking_state which includes the session's speaking window
     if is_talking_state:
         # Show talking image
         st.sidebar.image(
@@ -515,10 +562,15 @@ def show_concierge_widget():
             if video_path.exists():
                 # Welcome Video header only visible if avatar is checked
                 st.markdown("### 🎬 Welcome Video")
-                video_html = f'''<video width="100%" height="250" controls style="object-fit: cover; border-radius: 10px;">
-                                 <source src="data:video/mp4;base64,{base64.b64encode(video_path.read_bytes()).decode()}" type="video/mp4">
-                                 </video>'''
-                st.components.v1.html(video_html, height=260)
+                # Browser fetches the file from the media endpoint once and caches it
+                video_url = media_url(video_path)
+                if video_url:
+                    video_html = f'''<video width="100%" height="250" controls preload="metadata" style="object-fit: cover; border-radius: 10px;">
+                                     <source src="{video_url}" type="video/mp4">
+                                     </video>'''
+                    st.components.v1.html(video_html, height=260)
+                else:
+                    st.video(str(video_path))
             else:
                 st.info(f"Video file not found: {v_file}")
         
@@ -734,11 +786,6 @@ def show_concierge_widget():
                     logger.warning(f"TTS generation failed: {tts_error}")
                     # Try with a default supported voice as fallback
                     try:
-                        from google.cloud import texttospeech
-                        import config
-                        tts_client = texttospeech.TextToSpeechClient()
-                        synthesis_input = texttospeech.SynthesisInput(text=response)
-                        
                         # Use default supported voices (avoid NEUTRAL gender which causes 400 error)
                         fallback_voices = {
                             'en': ('en-US', 'en-US-Standard-A'),
@@ -750,66 +797,18 @@ def show_concierge_widget():
                             ('en-US', 'en-US-Standard-A')
                         )
                         
-                        voice = texttospeech.VoiceSelectionParams(
-                            language_code=lang_code,
-                            name=voice_name,
-                            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE  # Use FEMALE instead of NEUTRAL
-                        )
-                        audio_config = texttospeech.AudioConfig(
-                            audio_encoding=texttospeech.AudioEncoding.MP3
-                        )
-                        tts_response = tts_client.synthesize_speech(
-                            input=synthesis_input,
-                            voice=voice,
-                            audio_config=audio_config
-                        )
-                        audio_output = tts_response.audio_content
+                        audio_output = synthesize_speech(response, lang_code, voice_name=voice_name, ssml_gender='FEMALE')
                     except Exception as fallback_error:
                         logger.warning(f"TTS fallback also failed: {fallback_error}")
                         audio_output = None
                 if audio_output:
-                    # ROBUST FILE WRITING: Save audio as temp_voice.mp3 using absolute path
-                    import os
                     import time
                     
-                    # Use absolute path to ensure file is written correctly
-                    project_root = Path(__file__).parent.parent.resolve()
-                    temp_audio_path = project_root / "static" / "audio" / "temp_voice.mp3"
-                    temp_audio_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Write file
-                    try:
-                        with open(temp_audio_path, "wb") as f:
-                            f.write(audio_output)
-                            f.flush()  # Force write to disk
-                            os.fsync(f.fileno())  # Ensure OS has written to disk
-                    except Exception as e:
-                        logger.error(f"Failed to write audio file: {e}")
-                    
-                    # AUDIO PATH VERIFICATION: Wait for file to be fully written and closed
-                    time.sleep(0.5)  # Ensure file is closed before Streamlit tries to play it
-                    
-                    # Generate unique audio ID for this response
-                    import uuid
-                    audio_id = f"concierge_audio_{uuid.uuid4().hex[:8]}"
-                    
                     # Set avatar talking state
                     st.session_state.concierge_avatar_talking = True
+                    st.session_state.concierge_speaking_until = time.time() + CONCIERGE_SPEAKING_SECONDS
                     
-                    # PATH SYNC: Get relative path for Streamlit static file serving
-                    # Streamlit serves files from static/ directory at /static/ URL
-                    # Add timestamp to prevent caching issues
-                    timestamp = int(time.time())
-                    audio_url = f"/static/audio/temp_voice.mp3?t={timestamp}"
-                    
-                    # Store audio URL and absolute path in session state
-                    st.session_state.concierge_audio_url = audio_url
-                    st.session_state.concierge_audio_path = str(temp_audio_path)
-                    
-                    # Fallback: base64 data URI in case static file serving has issues
-                    audio_base64 = base64.b64encode(audio_output).decode('utf-8')
-                    audio_data_uri = f"data:audio/mp3;base64,{audio_base64}"
-                    
+                    # Audio stays in this session's memory (no shared file on disk to race on)
                     # Store audio in session state for display below avatar
                     st.session_state.concierge_audio_output = audio_output
                 
@@ -881,31 +880,8 @@ def process_concierge_voice(audio_bytes: bytes, language: str) -> str:
         # Initialize speech client
         client = None
         try:
-            import os
-            import config
-            
-            # Get credentials path from config
-            creds_path = None
-            if config.GOOGLE_APPLICATION_CREDENTIALS:
-                creds_path = Path(config.GOOGLE_APPLICATION_CREDENTIALS)
-                if not creds_path.is_absolute():
-                    project_root = Path(__file__).parent.parent
-                    creds_path = project_root / creds_path
-                
-                if creds_path.exists():
-                    os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(creds_path)
-                    client = speech.SpeechClient.from_service_account_json(str(creds_path))
-            
-            # Fallback: try environment variable
-            if not client and os.getenv('GOOGLE_APPLICATION_CREDENTIALS'):
-                creds_path = Path(os.getenv('GOOGLE_APPLICATION_CREDENTIALS'))
-                if creds_path.exists():
-                    client = speech.SpeechClient.from_service_account_json(str(creds_path))
-            
-            # Final fallback: use default credentials
-            if not client:
-                client = speech.SpeechClient()
-                
+            # Shared client; credentials are resolved once (see utils/clients.py)
+            client = get_speech_client()
         except Exception as e:
             return f"Error: Failed to initialize Speech-to-Text client: {str(e)}. Please check your Google Cloud credentials."
         
@@ -914,65 +890,18 @@ def process_concierge_voice(audio_bytes: bytes, language: str) -> str:
         
         # Configure recognition
         try:
-            # Try to detect sample rate from WAV header if possible
-            sample_rate = 44100  # Default for mic_recorder (browser typically records at 44.1kHz)
-            
-            # Check if it's a WAV file and try to read the sample rate
-            if len(audio_bytes) > 44 and audio_bytes[:4] == b'RIFF' and audio_bytes[8:12] == b'WAVE':
-                try:
-                    # WAV header: bytes 24-28 contain sample rate (little-endian)
-                    sample_rate = int.from_bytes(audio_bytes[24:28], byteorder='little')
-                except:
-                    pass  # Use default if parsing fails
-            
-            # Try multiple configurations as fallback
-            configs_to_try = [
-                # Config 1: Auto-detect with detected sample rate
-                speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-                    sample_rate_hertz=sample_rate,
-                    language_code=lang_code,
-                    alternative_language_codes=["ja-JP", "ne-NP", "en-US"] if lang_code != "auto" else None,
-                    enable_automatic_punctuation=True,
-                    model="latest_long",
-                ),
-                # Config 2: Try LINEAR16 encoding (common for WAV)
-                speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=sample_rate,
-                    language_code=lang_code,
-                    alternative_language_codes=["ja-JP", "ne-NP", "en-US"] if lang_code != "auto" else None,
-                    enable_automatic_punctuation=True,
-                    model="latest_long",
-                ),
-                # Config 3: Try with 16000 Hz (standard rate)
-                speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-                    sample_rate_hertz=16000,
-                    language_code=lang_code,
-                    alternative_language_codes=["ja-JP", "ne-NP", "en-US"] if lang_code != "auto" else None,
-                    enable_automatic_punctuation=True,
-                    model="latest_long",
-                ),
-            ]
-            
-            audio = speech.RecognitionAudio(content=audio_bytes)
-            
-            # Try each configuration until one works
-            response = None
-            last_error = None
-            for config_obj in configs_to_try:
-                try:
-                    response = client.recognize(config=config_obj, audio=audio)
-                    if response.results:
-                        break  # Success!
-                except Exception as e:
-                    last_error = e
-                    continue  # Try next config
-            
-            if not response:
-                # If all configs failed, raise the last error
-                raise last_error if last_error else Exception("All recognition configurations failed")
+            # Sniff the clip once and send 16 kHz mono LINEAR16 in a single call
+            # (see utils/audio_preprocessing.py)
+            prepared = prepare_audio_for_stt(audio_bytes)
+            config_obj = build_recognition_config(
+                prepared,
+                lang_code,
+                alternative_language_codes=["ja-JP", "ne-NP", "en-US"] if lang_code != "auto" else None,
+                enable_automatic_punctuation=True,
+                model="latest_long",
+            )
+            audio = speech.RecognitionAudio(content=prepared.content)
+            response = client.recognize(config=config_obj, audio=audio)
             
             # Extract transcript
             if response.results:
@@ -1022,6 +951,10 @@ def get_sensei_response(
     """
     Get response from Sensei using Socratic logic from sandbox_socratic_logic.py.
     
+    Blocks until the whole reply is generated and renders nothing, for
+    callers that need the text itself. Interactive chat turns use
+    render_streamed_sensei_response() so learners see the reply as it arrives.
+    
     Args:
         user_input: User's message
         conversation_history: List of previous messages with 'role' and 'content'
@@ -1034,295 +967,14 @@ def get_sensei_response(
         Sensei's response as a string
     """
     try:
-        from google import genai
+        from utils.sensei_chat import build_sensei_prompt, generate_sensei_response
         import config
         
         if not config.GEMINI_API_KEY:
             return "Error: GEMINI_API_KEY not configured. Please set it in your .env file."
         
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
-        
-        # RAG Integration: Retrieve relevant context from knowledge base
-        rag_context = ""
-        try:
-            from utils.rag_query import get_rag_context
-            rag_context = get_rag_context(user_input, max_chunks=3)
-        except Exception as e:
-            # RAG is optional - if it fails, continue without it
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"RAG query failed (non-critical): {e}")
-            rag_context = ""
-        
-        # Determine conversation phase based on timer
-        if timer_elapsed < 180:
-            phase = "helpful_assistant"
-            phase_instruction = "You are in 'Helpful Assistant' mode. Guide the student with questions, but be supportive and encouraging."
-        else:
-            phase = "evaluator"
-            phase_instruction = "You are now in 'Evaluator' mode. Assess the student's understanding more critically. Ask deeper questions to test their knowledge."
-        
-        # Build conversation history context
-        history_text = ""
-        if conversation_history:
-            history_text = "\n\n**Previous Conversation:**\n"
-            for msg in conversation_history[-5:]:  # Last 5 messages
-                role_label = "Sensei" if msg['role'] == 'sensei' else "Student"
-                history_text += f"- {role_label}: {msg['content']}\n"
-        
-        # Handle special initial greeting prompt (from show_academic_hub) [cite: 2025-12-20]
-        # Simplified Trilingual Prompt: Direct and simple [cite: 2025-12-20]
-        if user_input and (user_input.strip().startswith("The student has just started the lesson") or user_input.strip().startswith("Greeting:")):
-            # This is a special prompt for initial greeting - use simplified format
-            prompt = user_input  # Use the simplified prompt as-is
-        # Handle initial greeting when user_input is empty [cite: 2025-12-20]
-        elif not user_input or user_input.strip() == "":
-            # RAG Integration: Get context for initial greeting (shared for all tracks)
-            greeting_rag_context = ""
-            try:
-                from utils.rag_query import get_rag_context
-                greeting_rag_context = get_rag_context("Xplora Kodo platform introduction", max_chunks=2)
-            except Exception:
-                greeting_rag_context = ""
-            
-            # Initial greeting for Academic Hub
-            if current_page == "📖 Academic Hub" or current_page == "Academic Hub":
-                prompt = f"""You are a Socratic Japanese Language Teacher. Your goal is to guide the student to understand grammar, particles, and kanji.
-
-{greeting_rag_context}
-
-**System Context - Lesson Transcript:**
-{transcript}
-
-**Language Instructions:**
-Based on the transcript context above, you should be prepared to speak in English, Japanese (Kanji/Kana), and Nepali (Devanagari) as needed. The transcript provides the lesson context that informs your responses.
-
-**Initial Greeting:**
-The student has just started this lesson. Provide a warm, encouraging greeting in English that:
-1. Welcomes them to the JLPT lesson
-2. Mentions the key topic from the transcript (if available)
-3. Invites them to ask questions or share what they'd like to learn
-4. Sets a supportive, Socratic tone
-
-Keep it brief (2-3 sentences) and friendly.
-
-**Your Response (as JLPT Sensei, in English, welcoming greeting):**
-"""
-            else:
-                # Initial greeting for Food/Tech track
-                prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP and kitchen sanitization.
-
-{greeting_rag_context}
-
-**System Context - Lesson Transcript:**
-{transcript}
-
-**Language Instructions:**
-Based on the transcript context above, you should be prepared to speak in English, Japanese (Kanji/Kana), and Nepali (Devanagari) as needed. The transcript provides the lesson context that informs your responses.
-
-**Initial Greeting:**
-The student has just started this lesson. Provide a warm, encouraging greeting in English that:
-1. Welcomes them to the Food Safety training
-2. Mentions the key topic from the transcript (if available)
-3. Invites them to ask questions or share what they'd like to learn
-4. Sets a supportive, Socratic tone
-
-Keep it brief (2-3 sentences) and friendly.
-
-**Your Response (as Food Safety Sensei, in English, welcoming greeting):**
-"""
-        # Persona Pivot: Check if current page is Academic Hub [cite: 2025-12-20]
-        elif current_page == "📖 Academic Hub" or current_page == "Academic Hub":
-            # JLPT Sensei persona for Academic Hub [cite: 2025-12-20]
-            # Transcript-to-Sensei: Ensure transcript is used as system prompt context [cite: 2025-12-20]
-            # Trilingual Protocol: System prompt enforces exact Markdown format [cite: 2025-12-21]
-            prompt = f"""You are a Socratic Japanese Language Teacher. Your goal is to guide the student to understand grammar, particles, and kanji. Use the transcript provided. If they make a mistake with a particle (like wa vs ga), ask them to explain the function of the particle instead of correcting them immediately.
-
-{rag_context}
-
-**System Context - Lesson Transcript:**
-{transcript}
-
-**CRITICAL: Knowledge Limitation**
-Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
-
-**CRITICAL: Trilingual Response Format**
-Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
-
-🇬🇧 English: [Your Socratic question/feedback in English]
-
-🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
-
-🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
-
-**Your Role:**
-- You are a Socratic teacher. You DO NOT give direct answers.
-- You ask guiding questions that help the student discover the answers themselves.
-- You focus on Japanese grammar, particles (wa, ga, ni, wo, de, etc.), kanji, and JLPT concepts.
-- EVERY response must include all three languages in the format above.
-- Sensei Interaction: If the student asks about topics not in the transcript, politely redirect them to the lesson material. [cite: 2025-12-20, 2025-12-21]
-
-**Current Phase: {phase.upper()}**
-{phase_instruction}
-
-**Key Topics to Explore:**
-1. Particle usage: wa (は), ga (が), ni (に), wo (を), de (で), etc.
-2. Kanji recognition and meaning
-3. Grammar patterns (N5, N4, N3 level)
-4. Sentence structure and word order
-5. Verb conjugations and forms
-
-**Socratic Method Rules:**
-- NEVER give the answer directly. Instead, ask: "What do you think the particle 'wa' does in this sentence?"
-- If the student is stuck, ask a simpler related question to guide them.
-- If the student gives a partial answer, ask a follow-up to deepen understanding.
-- Praise correct thinking, but challenge assumptions gently.
-- Focus on helping them understand the WHY behind grammar rules, not just memorization.
-
-**Example Questions You Might Ask:**
-- "In the sentence '私は学生です', what role does the particle 'wa' play? Why is it used here instead of 'ga'?"
-- "Can you explain the difference between 'ni' and 'de' when talking about location?"
-- "What does this kanji mean? Can you break it down into its components?"
-
-{history_text}
-
-**Student's Latest Input:**
-User input: {user_input!r}
-
-**Your Response (as JLPT Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
-"""
-        elif current_page == "🍜 Food/Tech Hub" or current_page == "Food/Tech Hub" or track == "Food/Tech":
-            # Food/Tech Sensei persona (default)
-            prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP (Hazard Analysis and Critical Control Points) and kitchen sanitization.
-
-{rag_context}
-
-**System Context - Lesson Transcript:**
-{transcript}
-
-**CRITICAL: Knowledge Limitation**
-Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
-
-**Your Role:**
-- You are a Socratic teacher. You DO NOT give direct answers.
-- You ask guiding questions that help the student discover the answers themselves.
-- You focus on HACCP principles and the 3-step sanitization process:
-  * Seiso (清掃) - Cleaning: Removing visible dirt and debris
-  * Sakkin (殺菌) - Disinfection: Killing harmful microorganisms
-  * Kansou (乾燥) - Air-drying: Allowing surfaces to air-dry naturally (no towels)
-- EVERY response must include all three languages in the format above.
-
-**Current Phase: {phase.upper()}**
-{phase_instruction}
-
-**Key Topics to Explore:**
-1. Temperature control: Cold storage (<10°C), Frozen storage (<-15°C)
-2. 3-step sanitization: Why each step matters, what happens if you skip a step
-3. Cross-contamination (Kousa-osen / 交差汚染)
-4. Expiry management (Kigen-kanri / 期限管理)
-5. Proper disinfection techniques (Shudoku / 消毒)
-
-**Socratic Method Rules:**
-- NEVER give the answer directly. Instead, ask: "What do you think would happen if...?"
-- If the student is stuck, ask a simpler related question to guide them.
-- If the student gives a partial answer, ask a follow-up to deepen understanding.
-- Praise correct thinking, but challenge assumptions gently.
-- If the student uses HACCP terminology (like Kousa-osen, Kigen-kanri, Shudoku), acknowledge it positively.
-
-**Example Questions You Might Ask:**
-- "The temperature log shows the walk-in freezer at -10°C. What does HACCP require for frozen storage?"
-- "You're cleaning a prep table. Can you explain the difference between Seiso and Sakkin? Why is air-drying (Kansou) better than using a towel?"
-- "What could happen if you skip the Kansou step and wipe the surface with a towel instead?"
-
-{history_text}
-
-**Student's Latest Input:**
-User input: {user_input!r}
-
-**Your Response (as HACCP Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
-"""
-        elif current_page == "🏥 Care-giving Hub" or current_page == "Care-giving Hub" or track == "Care-giving":
-            # Care-giving Sensei persona
-            prompt = f"""You are a Japanese Care-giving Sensei (Teacher) conducting a Socratic dialogue about Kaigo (介護) and nursing care practices.
-
-**CRITICAL: Trilingual Response Format**
-Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
-
-🇬🇧 English: [Your Socratic question/feedback in English]
-
-🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
-
-🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
-
-{rag_context}
-
-**System Context - Lesson Transcript:**
-{transcript}
-
-**CRITICAL: Knowledge Limitation**
-Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
-
-**Your Role:**
-- You are a Socratic teacher. You DO NOT give direct answers.
-- You ask guiding questions that help the student discover the answers themselves.
-- You focus on care-giving practices, resident communication, and safety protocols:
-  * 体調 (Taichō) - Physical condition monitoring
-  * 介助 (Kaijo) - Assistance/Care-giving support
-  * 水分補給 (Suibun hokyū) - Hydration management
-  * 報告 (Hōkoku) - Reporting to head nurse
-  * 薬 (Kusuri) - Medicine administration
-
-**Current Phase: {phase.upper()}**
-{phase_instruction}
-
-**Key Topics to Explore:**
-1. Morning routine: Checking resident's 顔色 (Kaoiro - complexion) and 食欲 (Shokuyoku - appetite)
-2. Medicine administration: Ensuring 薬 (Kusuri) is taken at the correct time
-3. Communication: Proper 報告 (Hōkoku - reporting) to supervisors
-4. Safety: Proper use of 車椅子 (Kuruma-isu - wheelchair) and 介助 (Kaijo - assistance)
-5. Empathy: Using respectful phrases like お大事に (O-daiji ni - get well soon)
-
-**Socratic Method Rules:**
-- NEVER give the answer directly. Instead, ask: "What do you think would happen if...?"
-- If the student is stuck, ask a simpler related question to guide them.
-- If the student gives a partial answer, ask a follow-up to deepen understanding.
-- Praise correct thinking, but challenge assumptions gently.
-- If the student uses care-giving terminology (like Taichō, Kaijo, Hōkoku), acknowledge it positively.
-
-**Example Questions You Might Ask:**
-- "You notice a resident's 顔色 (Kaoiro) looks pale this morning. What should you check next, and why?"
-- "The resident hasn't eaten breakfast. What does this tell you about their 食欲 (Shokuyoku), and what action should you take?"
-- "Can you explain the difference between 介助 (Kaijo) and simply helping someone? Why is proper technique important?"
-
-{history_text}
-
-**Student's Latest Input:**
-User input: {user_input!r}
-
-**Your Response (as Kaigo Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
-"""
-        else:
-            # Food/Tech Sensei persona (default fallback)
-            prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP (Hazard Analysis and Critical Control Points) and kitchen sanitization.
-
-{rag_context}
-
-**CRITICAL: Trilingual Response Format**
-Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
-
-🇬🇧 English: [Your Socratic question/feedback in English]
-
-🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
-
-🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
-"""
-        
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt
-        )
-        
-        return response.text.strip()
+        prompt = build_sensei_prompt(user_input, conversation_history, transcript, timer_elapsed, track, current_page)
+        return generate_sensei_response(prompt)
         
     except Exception as e:
         import logging
@@ -1331,6 +983,50 @@ Every single response you give MUST follow this exact Markdown format. There are
         return f"I encountered an error: {str(e)}. Please try again."
 
 
+def render_streamed_sensei_response(
+    user_input: str,
+    conversation_history: list,
+    transcript: str,
+    timer_elapsed: int,
+    track: str = "Food/Tech",
+    current_page: str = None
+) -> str:
+    """
+    Stream a Sensei response into an assistant chat bubble as Gemini produces it.
+    
+    Same arguments as get_sensei_response(). The bubble shows partial text
+    with a cursor while tokens arrive, so learners see the first words
+    instead of waiting for the whole response.
+    
+    Returns:
+        The complete response (for saving to chat history)
+    """
+    import config
+    
+    if not config.GEMINI_API_KEY:
+        return "Error: GEMINI_API_KEY not configured. Please set it in your .env file."
+    
+    response_text = ""
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        try:
+            from utils.sensei_chat import build_sensei_prompt, stream_sensei_response
+            
+            prompt = build_sensei_prompt(user_input, conversation_history, transcript, timer_elapsed, track, current_page)
+            for chunk in stream_sensei_response(prompt):
+                response_text += chunk
+                placeholder.markdown(response_text + "▌")
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error streaming Sensei response: {e}")
+            if not response_text:
+                response_text = f"I encountered an error: {str(e)}. Please try again."
+        response_text = response_text.strip()
+        placeholder.markdown(response_text)
+    return response_text
+
+
 def render_unified_chat_interface(
     chat_history_key: str,
     transcript: str,
@@ -1406,26 +1102,25 @@ def render_unified_chat_interface(
 
 **Your Response (trilingual greeting + one Socratic question):**
 """
-            with st.spinner(f"🎓 {sensei_name} is preparing your first question..."):
-                initial_greeting = get_sensei_response(
-                    user_input=initial_greeting_prompt,
-                    conversation_history=[],
-                    transcript=transcript,
-                    timer_elapsed=0,
-                    track=track,
-                    current_page=current_page
-                )
-                # Persistent Chat History: Add initial greeting to both track-specific and global messages [cite: 2025-12-21]
-                sensei_msg = {
-                    'role': 'assistant',
-                    'content': initial_greeting
-                }
-                chat_history.append({
-                    'role': 'sensei',
-                    'content': initial_greeting
-                })
-                st.session_state.messages.append(sensei_msg)
-                st.rerun()
+            initial_greeting = render_streamed_sensei_response(
+                user_input=initial_greeting_prompt,
+                conversation_history=[],
+                transcript=transcript,
+                timer_elapsed=0,
+                track=track,
+                current_page=current_page
+            )
+            # Persistent Chat History: Add initial greeting to both track-specific and global messages [cite: 2025-12-21]
+            sensei_msg = {
+                'role': 'assistant',
+                'content': initial_greeting
+            }
+            chat_history.append({
+                'role': 'sensei',
+                'content': initial_greeting
+            })
+            st.session_state.messages.append(sensei_msg)
+            st.rerun()
     
     # Input Method Toggle (Text or Audio) - Ported from Academic Hub [cite: 2025-12-21]
     # Unique Namespacing: Use prefix for radio button key to prevent duplicate key errors [cite: 2025-12-21]
@@ -1450,8 +1145,11 @@ def render_unified_chat_interface(
             chat_history.append(user_msg)
             st.session_state.messages.append(user_msg)
             
-            # Get Sensei response using AAI Conversation logic
-            sensei_response = get_sensei_response(
+            with st.chat_message("user"):
+                st.write(user_message)
+            
+            # Get Sensei response using AAI Conversation logic (streamed into the chat as it is generated)
+            sensei_response = render_streamed_sensei_response(
                 user_input=user_message,
                 conversation_history=chat_history,
                 transcript=transcript,
@@ -1536,7 +1234,9 @@ def render_unified_chat_interface(
                             
                             # Get Sensei response immediately with track-specific persona
                             # Transcript-to-Sensei: Ensure transcript is passed as system prompt context [cite: 2025-12-20]
-                            sensei_response = get_sensei_response(
+                            with st.chat_message("user"):
+                                st.write(transcribed_text)
+                            sensei_response = render_streamed_sensei_response(
                                 user_input=transcribed_text,
                                 conversation_history=chat_history,
                                 transcript=transcript,  # Transcript passed as system context [cite: 2025-12-20]
@@ -1575,7 +1275,9 @@ def render_unified_chat_interface(
                     'role': 'user',
                     'content': user_message
                 })
-                sensei_response = get_sensei_response(
+                with st.chat_message("user"):
+                    st.write(user_message)
+                sensei_response = render_streamed_sensei_response(
                     user_input=user_message,
                     conversation_history=chat_history,
                     transcript=transcript,
@@ -1598,7 +1300,9 @@ def render_unified_chat_interface(
                     'role': 'user',
                     'content': user_message
                 })
-                sensei_response = get_sensei_response(
+                with st.chat_message("user"):
+                    st.write(user_message)
+                sensei_response = render_streamed_sensei_response(
                     user_input=user_message,
                     conversation_history=chat_history,
                     transcript=transcript,
@@ -1634,22 +1338,21 @@ def render_unified_chat_interface(
 
 **Your Response (trilingual follow-up Socratic question):**
 """
-                with st.spinner(f"🎓 {sensei_name} is preparing the next question..."):
-                    next_question = get_sensei_response(
-                        user_input=next_question_prompt,
-                        conversation_history=chat_history,
-                        transcript=transcript,
-                        timer_elapsed=0,
-                        track=track,
-                        current_page=current_page
-                    )
-                    # Append new question to chat history [cite: 2025-12-21]
-                    chat_history.append({
-                        'role': 'sensei',
-                        'content': next_question
-                    })
-                    st.session_state[chat_history_key] = chat_history
-                    st.rerun()
+                next_question = render_streamed_sensei_response(
+                    user_input=next_question_prompt,
+                    conversation_history=chat_history,
+                    transcript=transcript,
+                    timer_elapsed=0,
+                    track=track,
+                    current_page=current_page
+                )
+                # Append new question to chat history [cite: 2025-12-21]
+                chat_history.append({
+                    'role': 'sensei',
+                    'content': next_question
+                })
+                st.session_state[chat_history_key] = chat_history
+                st.rerun()
         
         with col2:
             if st.button("⏹️ Stop Session", key=f"stop_session_{track.lower().replace('/', '_')}"):
@@ -2285,7 +1988,7 @@ Would you like help navigating to the Wisdom Hub, or do you have questions about
                 import config
                 
                 if config.GEMINI_API_KEY:
-                    client = genai.Client(api_key=config.GEMINI_API_KEY)
+                    client = get_gemini_client()
                     
                     # Create a comprehensive prompt for platform questions
                     prompt = f'You are the Xplora Kodo Concierge, an AI assistant for the Xplora Kodo platform.\n\n**Platform Overview:**\nXplora Kodo is a 360-degree AI-powered lifecycle platform for Nepali human capital preparing for work in Japan. It provides:\n- Trilingual training (N5-N3 Japanese proficiency, Kaigo caregiving, AI/ML tech)\n- Voice coaching with AI Sensei and 2D animated avatar\n- Virtual classroom with live voice interaction\n- Life-in-Japan support (visa, banking, housing, legal)\n- Document vault and compliance tracking\n- Multi-phase progression system\n\n**User Question:** {user_input}\n\n**Instructions:**\n- Answer the question helpfully and accurately about Xplora Kodo platform features\n- If the question is about life in Japan (visa, banking, housing, etc.), acknowledge that specific information wasn\'t found in the knowledge base\n- Be conversational, friendly, and helpful\n- If you don\'t know something, suggest where the user can find more information\n- Keep responses concise (2-3 paragraphs max)\n\n**Response (in {language}):**'
@@ -2327,7 +2030,7 @@ Or rephrase your question and I'll do my best to help!"""
             import config
             
             if config.GEMINI_API_KEY:
-                client = genai.Client(api_key=config.GEMINI_API_KEY)
+                client = get_gemini_client()
                 
                 prompt_parts = [
                     "You are the Xplora Kodo Concierge. A user asked: ",
@@ -2385,13 +2088,8 @@ def generate_trilingual_tts(text: str, language: str, track: str | None = None)
         track: Optional track type ('Care-giving', 'Academic', 'Food/Tech') for personality adjustment
     """
     try:
-        from google.cloud import texttospeech
         import config
         
-        tts_client = texttospeech.TextToSpeechClient()
-        
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        
         # Get voice based on language
         voice_name = config.LANGUAGE_TTS_VOICES.get(language, 'en-US-Neural2-C')
         
@@ -2410,21 +2108,9 @@ def generate_trilingual_tts(text: str, language: str, track: str | None = None)
         
         # Determine SSML gender based on track personality or default to FEMALE (NEUTRAL causes 400 error)
         # Disable TTS temporarily: Use FEMALE instead of NEUTRAL to avoid 400 Gender neutral voices error
-        ssml_gender = texttospeech.SsmlVoiceGender.FEMALE  # Default to FEMALE instead of NEUTRAL
-        if personality:
-            gender_str = personality.get('ssml_gender', 'FEMALE')  # Default to FEMALE
-            if gender_str == 'FEMALE':
-                ssml_gender = texttospeech.SsmlVoiceGender.FEMALE
-            elif gender_str == 'MALE':
-                ssml_gender = texttospeech.SsmlVoiceGender.MALE
-            else:
-                ssml_gender = texttospeech.SsmlVoiceGender.FEMALE  # Fallback to FEMALE instead of NEUTRAL
-        
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=lang_code,
-            name=voice_name,
-            ssml_gender=ssml_gender
-        )
+        ssml_gender = 'FEMALE'  # Default to FEMALE instead of NEUTRAL
+        if personality and personality.get('ssml_gender') == 'MALE':
+            ssml_gender = 'MALE'
         
         # Apply track-based personality settings
         speaking_rate = 1.0
@@ -2433,20 +2119,16 @@ def generate_trilingual_tts(text: str, language: str, track: str | None = None)
             speaking_rate = personality.get('speaking_rate', 1.0)
             pitch = personality.get('pitch', 0.0)
         
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
+        # Served from the shared TTS cache; only new text/voice combinations reach Google
+        return synthesize_speech(
+            text,
+            lang_code,
+            voice_name=voice_name,
+            ssml_gender=ssml_gender,
             speaking_rate=speaking_rate,
-            pitch=pitch
+            pitch=pitch,
         )
         
-        tts_response = tts_client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
-        
-        return tts_response.audio_content
-        
     except Exception as e:
         # Disable TTS temporarily: Log error but don't show sidebar warning to prevent interruption
         # The calling code will handle fallback
@@ -3009,7 +2691,7 @@ def generate_weak_point_summary(mastery_scores: dict, candidate_id: str) -> str:
         if not config.GEMINI_API_KEY:
             return _generate_fallback_summary(mastery_scores)
         
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
+        client = get_gemini_client()
         
         # Build summary of scores
         score_summary = []
@@ -3075,6 +2757,60 @@ def _generate_fallback_summary(mastery_scores: dict) -> str:
     return summary
 
 
+def _store_report_pdf(result: str, candidate_id: str) -> None:
+    """Keep the PDF named in a GeneratePerformanceReport result for the download button."""
+    # PDF Recovery: Display full traceback if error occurs [cite: 2025-12-21]
+    if "Error" in result or "traceback" in result.lower():
+        st.error("❌ PDF Generation Failed")
+        st.code(result, language="text")
+        return
+
+    # Extract file path from result
+    if "Report saved to:" in result:
+        import re
+        path_match = re.search(r"Report saved to: (.+)", result)
+        if path_match:
+            pdf_path = Path(path_match.group(1))
+
+            if pdf_path.exists():
+                # Force Byte-Stream: Use BytesIO for Windows compatibility [cite: 2025-12-21]
+                try:
+                    from io import BytesIO
+                    import datetime as dt_module
+
+                    with open(pdf_path, "rb") as pdf_file:
+                        pdf_bytes = pdf_file.read()
+
+                    # Convert to BytesIO stream for better Windows compatibility
+                    pdf_stream = BytesIO(pdf_bytes)
+                    pdf_stream.seek(0)  # Reset stream position
+
+                    # PDF Generation Fix: Store in session state to keep download button accessible [cite: 2025-12-21]
+                    if 'pdf_report_bytes' not in st.session_state:
+                        st.session_state.pdf_report_bytes = None
+                    if 'pdf_report_filename' not in st.session_state:
+                        st.session_state.pdf_report_filename = None
+
+                    # Store bytes (BytesIO.getvalue() or use bytes directly)
+                    st.session_state.pdf_report_bytes = pdf_bytes  # Streamlit accepts bytes directly
+                    st.session_state.pdf_report_filename = f"sensei_report_{candidate_id}_{dt_module.datetime.now().strftime('%Y%m%d')}.pdf"
+
+                    st.success("✅ Report generated successfully!")
+                    st.info(result)
+                except Exception as e:
+                    st.error(f"❌ Failed to read PDF file: {str(e)}")
+                    import traceback
+                    if config.DEBUG:
+                        with st.expander("Debug Info"):
+                            st.code(traceback.format_exc())
+            else:
+                st.error("Report file was not created. Please check the error message above.")
+        else:
+            st.info(result)
+    else:
+        st.error(result)
+
+
 def show_progress_dashboard():
     """Display Student Performance Heatmap with mastery scores."""
     st.header("📊 Progress Dashboard - Student Performance Heatmap")
@@ -3735,65 +3471,49 @@ def show_progress_dashboard():
                     )
                     # Store lesson_history in session state for report_generator to access
                     st.session_state.lesson_history = lesson_history_for_report
-                    result = report_tool.run()
-                    
-                    # PDF Recovery: Display full traceback if error occurs [cite: 2025-12-21]
-                    if "Error" in result or "traceback" in result.lower():
-                        st.error("❌ PDF Generation Failed")
-                        st.code(result, language="text")
-                        st.stop()
-                    
-                    # Extract file path from result
-                    if "Report saved to:" in result:
-                        import re
-                        path_match = re.search(r"Report saved to: (.+)", result)
-                        if path_match:
-                            pdf_path = Path(path_match.group(1))
-                            
-                            if pdf_path.exists():
-                                # Force Byte-Stream: Use BytesIO for Windows compatibility [cite: 2025-12-21]
-                                try:
-                                    from io import BytesIO
-                                    import datetime as dt_module
-                                    
-                                    with open(pdf_path, "rb") as pdf_file:
-                                        pdf_bytes = pdf_file.read()
-                                    
-                                    # Convert to BytesIO stream for better Windows compatibility
-                                    pdf_stream = BytesIO(pdf_bytes)
-                                    pdf_stream.seek(0)  # Reset stream position
-                                    
-                                    # PDF Generation Fix: Store in session state to keep download button accessible [cite: 2025-12-21]
-                                    if 'pdf_report_bytes' not in st.session_state:
-                                        st.session_state.pdf_report_bytes = None
-                                    if 'pdf_report_filename' not in st.session_state:
-                                        st.session_state.pdf_report_filename = None
-                                    
-                                    # Store bytes (BytesIO.getvalue() or use bytes directly)
-                                    st.session_state.pdf_report_bytes = pdf_bytes  # Streamlit accepts bytes directly
-                                    st.session_state.pdf_report_filename = f"sensei_report_{candidate_id}_{dt_module.datetime.now().strftime('%Y%m%d')}.pdf"
-                                    
-                                    st.success("✅ Report generated successfully!")
-                                    st.info(result)
-                                except Exception as e:
-                                    st.error(f"❌ Failed to read PDF file: {str(e)}")
-                                    import traceback
-                                    if config.DEBUG:
-                                        with st.expander("Debug Info"):
-                                            st.code(traceback.format_exc())
-                            else:
-                                st.error("Report file was not created. Please check the error message above.")
-                        else:
-                            st.info(result)
+                    if config.JOB_QUEUE_ENABLED:
+                        # Hand the PDF off to the background workers; the status check below picks it up
+                        from utils.job_queue import enqueue_job
+                        job_id = enqueue_job("performance_report", {
+                            "candidate_id": candidate_id,
+                            "mastery_scores_override": current_mastery,
+                        })
+                        st.session_state.performance_report_job_id = job_id
+                        st.info(f"📄 Report queued (job {job_id}). Use \"Check report status\" to fetch it once a worker finishes.")
+                        result = None
                     else:
-                        st.error(result)
+                        result = report_tool.run()
+                    
+                    if result is not None:
+                        _store_report_pdf(result, candidate_id)
                 except Exception as e:
                     st.error(f"❌ Error generating PDF report: {str(e)}")
                     import traceback
                     if config.DEBUG:
                         with st.expander("Debug Info"):
                             st.code(traceback.format_exc())
-        
+
+        # Queued report: check the job on a later rerun instead of blocking this one
+        pending_job_id = st.session_state.get("performance_report_job_id")
+        if pending_job_id is not None:
+            if st.button("🔄 Check report status", key="pdf_job_status_button"):
+                from utils.job_queue import get_job
+                job = get_job(pending_job_id)
+                if job is None:
+                    st.error(f"Report job {pending_job_id} no longer exists.")
+                    st.session_state.performance_report_job_id = None
+                elif job["status"] == "succeeded":
+                    st.session_state.performance_report_job_id = None
+                    _store_report_pdf(job["result"]["message"], candidate_id)
+                elif job["status"] == "failed":
+                    st.session_state.performance_report_job_id = None
+                    st.error("❌ PDF Generation Failed")
+                    st.code(job["error"] or "", language="text")
+                else:
+                    st.info(f"📄 Report job {pending_job_id} is {job['status']}. Is scripts/run_job_worker.py running?")
+            else:
+                st.caption(f"📄 Report job {pending_job_id} is queued.")
+
         # PDF Generation Fix: Download button placed outside conditional to remain accessible [cite: 2025-12-21]
         if 'pdf_report_bytes' not in st.session_state:
             st.session_state.pdf_report_bytes = None
@@ -4009,7 +3729,9 @@ def show_video_hub():
                                         # Get Sensei response immediately
                                         # Pass current page to determine persona
                                         current_page = st.session_state.get('page', 'Video Hub')
-                                        sensei_response = get_sensei_response(
+                                        with st.chat_message("user"):
+                                            st.write(transcribed_text)
+                                        sensei_response = render_streamed_sensei_response(
                                             user_input=transcribed_text,
                                             conversation_history=st.session_state.chat_history,
                                             transcript=transcript,
@@ -4052,7 +3774,9 @@ def show_video_hub():
                 # Get Sensei response using Socratic logic
                 # Pass current page to determine persona
                 current_page = st.session_state.get('page', 'Video Hub')
-                sensei_response = get_sensei_response(
+                with st.chat_message("user"):
+                    st.write(user_message)
+                sensei_response = render_streamed_sensei_response(
                     user_input=user_message,
                     conversation_history=st.session_state.chat_history,
                     transcript=transcript,
@@ -4181,7 +3905,7 @@ def show_video_hub():
             # Center the video with padding using columns layout
             col_left, col_video, col_right = st.columns([1, 6, 1])
             with col_video:
-                st.video(str(video_path))
+                show_video(video_path, selected_lesson.get("hls_path"))
 
             # Immersion-Bridge Logic: Fetch and display bilingual transcript
             # This part is from GEMINI.md
@@ -4434,7 +4158,7 @@ def load_transcript_and_translate(video_filename: str, video_path: str) -> tuple
         try:
             from google import genai
             if config.GEMINI_API_KEY:
-                client = genai.Client(api_key=config.GEMINI_API_KEY)
+                client = get_gemini_client()
                 prompt = f"""
 Translate the following English text to Nepali (नेपाली). 
 Keep technical terms and proper nouns in their original form if commonly used.
@@ -4704,6 +4428,12 @@ def load_video_lessons(track: str, language: str) -> list[dict]:
                             'source': 'filesystem'
                         })
     
+    # Prefer the adaptive-bitrate HLS package where scripts/package_hls.py has built one
+    project_dir = Path(__file__).parent.parent.resolve()
+    for lesson in lessons:
+        manifest = hls_manifest_for(project_dir / lesson['video_path']) if lesson.get('video_path') else None
+        lesson['hls_path'] = manifest.relative_to(project_dir).as_posix() if manifest else None
+    
     return lessons
 
 
@@ -4769,7 +4499,7 @@ def extract_syllabus_from_transcript(transcript: str, lesson_name: str) -> tuple
             return extract_syllabus_simple(transcript), ""
         
         from google import genai
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
+        client = get_gemini_client()
         
         prompt = f"""Analyze the following lesson transcript and extract:
 
@@ -5132,7 +4862,7 @@ def show_academic_hub():
                 # Center the video
                 col_left, col_video, col_right = st.columns([1, 6, 1])
                 with col_video:
-                    st.video(str(video_path))
+                    show_video(video_path, selected_lesson.get("hls_path"))
                 
                 # Load transcript
                 transcript_path = video_path.with_name(f"{video_path.stem}_En.txt")
@@ -5499,20 +5229,19 @@ def show_food_tech_hub():
 
 **Your Response (trilingual greeting + one Socratic question):**
 """
-                with st.spinner("🎓 HACCP Sensei is preparing your first question..."):
-                    initial_greeting = get_sensei_response(
-                        user_input=initial_greeting_prompt,
-                        conversation_history=[],
-                        transcript=current_lesson_transcript,
-                        timer_elapsed=0,
-                        track="Food/Tech",
-                        current_page="🍜 Food/Tech Hub"
-                    )
-                    st.session_state.food_tech_chat_history.append({
-                        'role': 'sensei',
-                        'content': initial_greeting
-                    })
-                    st.rerun()
+                initial_greeting = render_streamed_sensei_response(
+                    user_input=initial_greeting_prompt,
+                    conversation_history=[],
+                    transcript=current_lesson_transcript,
+                    timer_elapsed=0,
+                    track="Food/Tech",
+                    current_page="🍜 Food/Tech Hub"
+                )
+                st.session_state.food_tech_chat_history.append({
+                    'role': 'sensei',
+                    'content': initial_greeting
+                })
+                st.rerun()
         
         # Persistent Chat Rendering: Display chat interface in main content area when chat history exists [cite: 2025-12-21]
         food_tech_chat_history = st.session_state.get('food_tech_chat_history', [])
@@ -5539,7 +5268,9 @@ def show_food_tech_hub():
                 })
                 
                 # Get Sensei response
-                sensei_response = get_sensei_response(
+                with st.chat_message("user"):
+                    st.write(user_message)
+                sensei_response = render_streamed_sensei_response(
                     user_input=user_message,
                     conversation_history=food_tech_chat_history,
                     transcript=current_lesson_transcript,
@@ -5578,22 +5309,21 @@ def show_food_tech_hub():
 
 **Your Response (trilingual follow-up Socratic question):**
 """
-                        with st.spinner("🎓 HACCP Sensei is preparing the next question..."):
-                            next_question = get_sensei_response(
-                                user_input=next_question_prompt,
-                                conversation_history=food_tech_chat_history,
-                                transcript=current_lesson_transcript,
-                                timer_elapsed=0,
-                                track="Food/Tech",
-                                current_page="🍜 Food/Tech Hub"
-                            )
-                            # Append new question to chat history [cite: 2025-12-21]
-                            food_tech_chat_history.append({
-                                'role': 'sensei',
-                                'content': next_question
-                            })
-                            st.session_state.food_tech_chat_history = food_tech_chat_history
-                            st.rerun()
+                        next_question = render_streamed_sensei_response(
+                            user_input=next_question_prompt,
+                            conversation_history=food_tech_chat_history,
+                            transcript=current_lesson_transcript,
+                            timer_elapsed=0,
+                            track="Food/Tech",
+                            current_page="🍜 Food/Tech Hub"
+                        )
+                        # Append new question to chat history [cite: 2025-12-21]
+                        food_tech_chat_history.append({
+                            'role': 'sensei',
+                            'content': next_question
+                        })
+                        st.session_state.food_tech_chat_history = food_tech_chat_history
+                        st.rerun()
                 
                 with col2:
                     if st.button("⏹️ Stop Session", key="stop_session_food_tech_main"):
@@ -5890,20 +5620,19 @@ def show_caregiving_hub():
 
 **Your Response (trilingual greeting + one Socratic question):**
 """
-                with st.spinner("🎓 Kaigo Sensei is preparing your first question..."):
-                    initial_greeting = get_sensei_response(
-                        user_input=initial_greeting_prompt,
-                        conversation_history=[],
-                        transcript=current_lesson_transcript,
-                        timer_elapsed=0,
-                        track="Care-giving",
-                        current_page="🏥 Care-giving Hub"
-                    )
-                    st.session_state.caregiving_chat_history.append({
-                        'role': 'sensei',
-                        'content': initial_greeting
-                    })
-                    st.rerun()
+                initial_greeting = render_streamed_sensei_response(
+                    user_input=initial_greeting_prompt,
+                    conversation_history=[],
+                    transcript=current_lesson_transcript,
+                    timer_elapsed=0,
+                    track="Care-giving",
+                    current_page="🏥 Care-giving Hub"
+                )
+                st.session_state.caregiving_chat_history.append({
+                    'role': 'sensei',
+                    'content': initial_greeting
+                })
+                st.rerun()
         
         # Persistent Chat Rendering: Display chat interface in main content area when chat history exists [cite: 2025-12-21]
         caregiving_chat_history = st.session_state.get('caregiving_chat_history', [])
@@ -5930,7 +5659,9 @@ def show_caregiving_hub():
                 })
                 
                 # Get Sensei response
-                sensei_response = get_sensei_response(
+                with st.chat_message("user"):
+                    st.write(user_message)
+                sensei_response = render_streamed_sensei_response(
                     user_input=user_message,
                     conversation_history=caregiving_chat_history,
                     transcript=current_lesson_transcript,
@@ -5969,22 +5700,21 @@ def show_caregiving_hub():
 
 **Your Response (trilingual follow-up Socratic question):**
 """
-                        with st.spinner("🎓 Kaigo Sensei is preparing the next question..."):
-                            next_question = get_sensei_response(
-                                user_input=next_question_prompt,
-                                conversation_history=caregiving_chat_history,
-                                transcript=current_lesson_transcript,
-                                timer_elapsed=0,
-                                track="Care-giving",
-                                current_page="🏥 Care-giving Hub"
-                            )
-                            # Append new question to chat history [cite: 2025-12-21]
-                            caregiving_chat_history.append({
-                                'role': 'sensei',
-                                'content': next_question
-                            })
-                            st.session_state.caregiving_chat_history = caregiving_chat_history
-                            st.rerun()
+                        next_question = render_streamed_sensei_response(
+                            user_input=next_question_prompt,
+                            conversation_history=caregiving_chat_history,
+                            transcript=current_lesson_transcript,
+                            timer_elapsed=0,
+                            track="Care-giving",
+                            current_page="🏥 Care-giving Hub"
+                        )
+                        # Append new question to chat history [cite: 2025-12-21]
+                        caregiving_chat_history.append({
+                            'role': 'sensei',
+                            'content': next_question
+                        })
+                        st.session_state.caregiving_chat_history = caregiving_chat_history
+                        st.rerun()
                 
                 with col2:
                     if st.button("⏹️ Stop Session", key="stop_session_caregiving_main"):
@@ -6323,6 +6053,23 @@ def show_financial_ledger():
         st.dataframe(recent_df, width='stretch', hide_index=True)
 
 
+def _load_question_audio(audio_ref: dict | str) -> bytes | None:
+    """
+    MP3 bytes for a Socratic question's stored audio.
+    
+    New entries hold a TTS cache reference, re-synthesized if the cached file
+    was evicted; older entries hold a path relative to the project root.
+    """
+    if isinstance(audio_ref, dict):
+        try:
+            return load_tts_audio(audio_ref)
+        except Exception as e:
+            logger.warning(f"Could not load question audio: {e}")
+            return None
+    audio_path = Path(__file__).parent.parent / audio_ref
+    return audio_path.read_bytes() if audio_path.exists() else None
+
+
 def show_socratic_history(dialogue_history: list | None, candidate_id: str):
     """
     Display Socratic training history as a chat interface with Japanese/Nepali support.
@@ -6380,11 +6127,9 @@ def show_socratic_history(dialogue_history: list | None, candidate_id: str):
                 st.write(question_ja)
             with col2:
                 if audio_files.get("japanese"):
-                    audio_path = Path(__file__).parent.parent / audio_files["japanese"]
-                    if audio_path.exists():
-                        with open(audio_path, "rb") as audio_file:
-                            audio_bytes = audio_file.read()
-                            st.audio(audio_bytes, format="audio/mp3")
+                    audio_bytes = _load_question_audio(audio_files["japanese"])
+                    if audio_bytes:
+                        st.audio(audio_bytes, format="audio/mp3")
                     else:
                         st.info("Audio not found")
             
@@ -6395,11 +6140,9 @@ def show_socratic_history(dialogue_history: list | None, candidate_id: str):
                 st.write(question_ne)
             with col2:
                 if audio_files.get("nepali"):
-                    audio_path = Path(__file__).parent.parent / audio_files["nepali"]
-                    if audio_path.exists():
-                        with open(audio_path, "rb") as audio_file:
-                            audio_bytes = audio_file.read()
-                            st.audio(audio_bytes, format="audio/mp3")
+                    audio_bytes = _load_question_audio(audio_files["nepali"])
+                    if audio_bytes:
+                        st.audio(audio_bytes, format="audio/mp3")
                     else:
                         st.info("Audio not found")
             
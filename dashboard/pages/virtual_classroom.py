@@ -25,6 +25,8 @@ from sqlalchemy.orm import Session
 
 import config
 from database.db_manager import Candidate, SessionLocal
+from utils.clients import get_gemini_client
+from utils.tts_cache import synthesize_speech
 
 # Try to import audio streaming libraries
 try:
@@ -361,7 +363,7 @@ def process_voice_with_gemini_native_audio(audio_bytes: bytes, candidate_id: str
                 "error": "Gemini API not available"
             }
         
-        client = genai.Client(api_key=config.GEMINI_API_KEY)
+        client = get_gemini_client()
         
         # Step 1: Transcribe audio using Gemini's native audio capabilities
         # Convert audio bytes to base64
@@ -376,19 +378,17 @@ def process_voice_with_gemini_native_audio(audio_bytes: bytes, candidate_id: str
             question_type="conversation"
         )
         
-        transcript_result = transcript_tool.run()
+        transcript_result = transcript_tool.run_structured()
         
         # Check for errors in transcription
-        if transcript_result.startswith("Error:"):
+        if not transcript_result.success:
             return {
                 "success": False,
-                "error": transcript_result.replace("Error: ", "")
+                "error": transcript_result.error
             }
         
-        transcript = ""
-        if "Transcript:" in transcript_result:
-            transcript = transcript_result.split("Transcript:")[1].split("\n")[0].strip()
-        elif not transcript_result or transcript_result.strip() == "":
+        transcript = transcript_result.transcript or ""
+        if not transcript:
             return {
                 "success": False,
                 "error": "Failed to transcribe audio. Please check your microphone and try again."
@@ -420,29 +420,15 @@ def process_voice_with_gemini_native_audio(audio_bytes: bytes, candidate_id: str
         lip_sync_data = None
         
         try:
-            from google.cloud import texttospeech
-            tts_client = texttospeech.TextToSpeechClient()
-            
-            synthesis_input = texttospeech.SynthesisInput(text=ai_response)
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="ja-JP",
-                name="ja-JP-Neural2-C",
-                ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
-            )
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+            audio_output = synthesize_speech(
+                ai_response,
+                "ja-JP",
+                voice_name="ja-JP-Neural2-C",
+                ssml_gender="NEUTRAL",
                 speaking_rate=1.0,  # Normal speed for lip-sync
-                pitch=0.0
-            )
-            
-            tts_response = tts_client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
+                pitch=0.0,
             )
             
-            audio_output = tts_response.audio_content
-            
             # Generate lip-sync data (phoneme timing)
             # This is a simplified version - in production, use a proper lip-sync engine
             lip_sync_data = {
@@ -513,12 +499,8 @@ def process_voice_input(audio_bytes: bytes, candidate_id: str) -> dict:
         )
         
         # Get transcript
-        result = transcript_tool.run()
-        
-        # Extract transcript from result
-        transcript = ""
-        if "Transcript:" in result:
-            transcript = result.split("Transcript:")[1].split("\n")[0].strip()
+        result = transcript_tool.run_structured()
+        transcript = result.transcript or ""
         
         # Generate AI response using Gemini
         ai_response = ""
@@ -526,7 +508,7 @@ def process_voice_input(audio_bytes: bytes, candidate_id: str) -> dict:
         
         if GEMINI_AVAILABLE and config.GEMINI_API_KEY:
             try:
-                client = genai.Client(api_key=config.GEMINI_API_KEY)
+                client = get_gemini_client()
                 
                 # Build conversation context
                 context = "You are a Japanese language teacher (Sensei) in a virtual classroom. "
@@ -551,27 +533,13 @@ def process_voice_input(audio_bytes: bytes, candidate_id: str) -> dict:
                 
                 # Generate audio response using Google TTS (if available)
                 try:
-                    from google.cloud import texttospeech
-                    tts_client = texttospeech.TextToSpeechClient()
-                    
-                    synthesis_input = texttospeech.SynthesisInput(text=ai_response)
-                    voice = texttospeech.VoiceSelectionParams(
-                        language_code="ja-JP",
-                        name="ja-JP-Neural2-C",  # Japanese neural voice
-                        ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
-                    )
-                    audio_config = texttospeech.AudioConfig(
-                        audio_encoding=texttospeech.AudioEncoding.MP3
+                    audio_output = synthesize_speech(
+                        ai_response,
+                        "ja-JP",
+                        voice_name="ja-JP-Neural2-C",  # Japanese neural voice
+                        ssml_gender="NEUTRAL",
                     )
                     
-                    tts_response = tts_client.synthesize_speech(
-                        input=synthesis_input,
-                        voice=voice,
-                        audio_config=audio_config
-                    )
-                    
-                    audio_output = tts_response.audio_content
-                    
                 except Exception as e:
                     st.warning(f"TTS unavailable: {str(e)}")
                     
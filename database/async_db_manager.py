@@ -0,0 +1,95 @@
+"""
+Async Database Manager for the FastAPI layer.
+
+Provides an asyncpg-backed SQLAlchemy AsyncEngine so API endpoints can query
+PostgreSQL without blocking the event loop. ORM models are shared with
+database/db_manager.py.
+
+If asyncpg is not installed (or the database is not PostgreSQL),
+ASYNC_DB_AVAILABLE is False and callers should fall back to running the
+synchronous session in a worker thread.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import config
+from database.db_manager import DATABASE_URL
+
+try:
+    import asyncpg  # noqa: F401  (driver used by the postgresql+asyncpg dialect)
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+    ASYNC_DB_AVAILABLE = DATABASE_URL.startswith("postgresql")
+except ImportError:
+    ASYNC_DB_AVAILABLE = False
+
+
+_async_engine: Optional["AsyncEngine"] = None
+_async_session_factory: Optional["async_sessionmaker[AsyncSession]"] = None
+
+
+def get_async_database_url(database_url: str = DATABASE_URL) -> str:
+    """Convert a postgresql:// URL into its postgresql+asyncpg:// form."""
+    scheme, _, rest = database_url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme in ("postgresql", "postgresql+psycopg2") else database_url
+
+
+def get_async_engine() -> "AsyncEngine":
+    """
+    Get the process-wide async engine, creating it on first use.
+
+    Pool settings mirror the synchronous engine (see config DB_POOL_*).
+    """
+    global _async_engine, _async_session_factory
+
+    if not ASYNC_DB_AVAILABLE:
+        raise RuntimeError("Async database access requires asyncpg and a PostgreSQL DATABASE_URL.")
+
+    if _async_engine is None:
+        connect_args = {}
+        if config.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            echo=False,
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+            connect_args=connect_args,
+        )
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator["AsyncSession"]:
+    """
+    Provide a transactional AsyncSession for a block of work.
+
+    Commits on success, rolls back on any exception (which is re-raised).
+
+    Usage:
+        async with async_session_scope() as db:
+            result = await db.execute(select(Candidate))
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def dispose_async_engine() -> None:
+    """Close all pooled async connections (call on application shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
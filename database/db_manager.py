@@ -10,21 +10,26 @@ Manages connections and provides ORM models for:
 from __future__ import annotations
 
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Integer,
     JSON,
     String,
     Text,
     create_engine,
+    event,
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
 
 # Database connection string - loaded from environment variables via config
 import config
@@ -238,11 +243,215 @@ class LifeInJapanKB(Base):
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class WisdomSnapshot(Base):
+    """Daily wisdom report snapshots - precomputed aggregates and rendered report for OperationsAgent."""
+
+    __tablename__ = "wisdom_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_date = Column(String(10), nullable=False, unique=True, index=True)  # YYYY-MM-DD
+    generated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)  # UTC
+    aggregates = Column(JSON, nullable=False)  # Candidate/payment counts used to render the report
+    report = Column(Text, nullable=False)  # Rendered Markdown report
+    etag = Column(String(64), nullable=False)  # Content hash of report (HTTP ETag)
+
+    def __repr__(self):
+        return f"<WisdomSnapshot(report_date={self.report_date}, generated_at={self.generated_at})>"
+
+
+class BackgroundJob(Base):
+    """Background jobs table - durable queue for long-running work (see utils/job_queue.py)."""
+
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_type = Column(String(50), nullable=False, index=True)  # e.g. 'performance_report', 'translation'
+    payload = Column(JSON, nullable=False)  # Handler arguments
+    status = Column(String(20), default="queued", nullable=False, index=True)  # queued, running, succeeded, failed
+    result = Column(JSON, nullable=True)  # Handler return value
+    error = Column(Text, nullable=True)  # Last error message
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)  # UTC; retry backoff
+    locked_by = Column(String(100), nullable=True)  # Worker that claimed the job
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<BackgroundJob(id={self.id}, job_type={self.job_type}, status={self.status}, attempts={self.attempts})>"
+
+
+class RateLimitBucket(Base):
+    """Token buckets shared by all API workers (see utils/rate_limiter.py, RATE_LIMIT_BACKEND=postgres)."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    bucket_key = Column(String(200), primary_key=True)  # e.g. 'candidate:CANDIDATE_001', 'service:gemini'
+    tokens = Column(Float, nullable=False)  # Tokens left at updated_at
+    updated_at = Column(DateTime, nullable=False)  # UTC; refill is computed from the elapsed time
+
+    def __repr__(self):
+        return f"<RateLimitBucket(bucket_key={self.bucket_key}, tokens={self.tokens})>"
+
+
+class TranslationCacheEntry(Base):
+    """Translation cache - content-addressed machine translations (see utils/translation_cache.py)."""
+
+    __tablename__ = "translation_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256(source|target|text)
+    source_language = Column(String(10), nullable=False)  # e.g. 'en' ('auto' when detected)
+    target_language = Column(String(10), nullable=False, index=True)  # e.g. 'ja', 'ne'
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<TranslationCacheEntry(target_language={self.target_language}, cache_key={self.cache_key[:12]})>"
+
+
+class TTSCacheEntry(Base):
+    """TTS audio cache index - one row per cached MP3 file (see utils/tts_cache.py)."""
+
+    __tablename__ = "tts_cache_entries"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of text and voice settings; file is <cache_key>.mp3
+    language_code = Column(String(10), nullable=False)  # e.g. 'ja-JP'
+    voice_name = Column(String(50), nullable=True)  # e.g. 'ja-JP-Neural2-C'
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_accessed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)  # LRU order
+
+    def __repr__(self):
+        return f"<TTSCacheEntry(cache_key={self.cache_key[:12]}, language_code={self.language_code}, size_bytes={self.size_bytes})>"
+
+
 # Database session management
-engine = create_engine(DATABASE_URL, echo=False)
+def _engine_kwargs(database_url: str) -> dict[str, Any]:
+    """Build create_engine() pool settings from config (server databases only)."""
+    if database_url.startswith("sqlite"):
+        return {}
+
+    kwargs: dict[str, Any] = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if database_url.startswith("postgresql") and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+engine = create_engine(DATABASE_URL, echo=False, **_engine_kwargs(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class PoolMetrics:
+    """Connection pool counters and timings collected from SQLAlchemy pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.new_connections = 0
+            self.connect_ms_total = 0.0
+            self.connect_ms_max = 0.0
+            self.hold_ms_total = 0.0
+            self.hold_ms_max = 0.0
+
+    def on_do_connect(self, dialect, conn_rec, cargs, cparams) -> None:
+        self._local.connect_started = time.perf_counter()
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        started = getattr(self._local, "connect_started", None)
+        connect_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        with self._lock:
+            self.new_connections += 1
+            self.connect_ms_total += connect_ms
+            self.connect_ms_max = max(self.connect_ms_max, connect_ms)
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        hold_ms = (time.perf_counter() - checked_out_at) * 1000 if checked_out_at else 0.0
+        with self._lock:
+            self.checkins += 1
+            self.hold_ms_total += hold_ms
+            self.hold_ms_max = max(self.hold_ms_max, hold_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "new_connections": self.new_connections,
+                # Share of checkouts served by an already-open (warm) connection
+                "reuse_rate": round(1 - self.new_connections / self.checkouts, 4) if self.checkouts else 0.0,
+                "avg_connect_ms": round(self.connect_ms_total / self.new_connections, 2) if self.new_connections else 0.0,
+                "max_connect_ms": round(self.connect_ms_max, 2),
+                "avg_hold_ms": round(self.hold_ms_total / self.checkins, 2) if self.checkins else 0.0,
+                "max_hold_ms": round(self.hold_ms_max, 2),
+            }
+
+
+pool_metrics = PoolMetrics()
+event.listen(engine, "do_connect", pool_metrics.on_do_connect)
+event.listen(engine.pool, "connect", pool_metrics.on_connect)
+event.listen(engine.pool, "checkout", pool_metrics.on_checkout)
+event.listen(engine.pool, "checkin", pool_metrics.on_checkin)
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    """
+    Get connection pool metrics.
+
+    Returns:
+        Checkout/connect/hold-time counters plus the pool's current status
+    """
+    metrics = pool_metrics.snapshot()
+    pool = engine.pool
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            metrics[f"pool_{name}"] = getattr(pool, name)()
+    return metrics
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a transactional session for a block of work.
+
+    Commits on success, rolls back on any exception (which is re-raised),
+    and always returns the connection to the pool.
+
+    Usage:
+        with session_scope() as db:
+            db.add(obj)
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -260,4 +469,3 @@ def init_db():
 def drop_db():
     """Drop all tables (use with caution)."""
     Base.metadata.drop_all(bind=engine)
-
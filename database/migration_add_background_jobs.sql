@@ -0,0 +1,27 @@
+-- Migration: Add background_jobs table for the PostgreSQL-backed job queue
+-- Run this to create the background_jobs table
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id SERIAL PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC'),
+    locked_by VARCHAR(100),
+    created_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC'),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Workers claim the oldest runnable job with FOR UPDATE SKIP LOCKED; keep that scan small
+CREATE INDEX IF NOT EXISTS idx_background_jobs_queued ON background_jobs(run_after, id) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_background_jobs_status ON background_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_background_jobs_job_type ON background_jobs(job_type);
+
+COMMENT ON TABLE background_jobs IS 'Durable job queue for long-running work (PDF reports, grading, translation, wisdom reports)';
+COMMENT ON COLUMN background_jobs.status IS 'Job state: queued, running, succeeded, failed';
+COMMENT ON COLUMN background_jobs.run_after IS 'Earliest time (UTC) a worker may claim the job; pushed back exponentially on retry';
@@ -0,0 +1,11 @@
+-- Migration: Add rate_limit_buckets table for the shared API rate limiter
+-- Only needed when RATE_LIMIT_BACKEND=postgres (see utils/rate_limiter.py)
+
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket_key VARCHAR(200) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+
+COMMENT ON TABLE rate_limit_buckets IS 'Token buckets shared by all API workers (per candidate and per upstream service)';
+COMMENT ON COLUMN rate_limit_buckets.tokens IS 'Tokens left at updated_at; refilled from the elapsed time on each request';
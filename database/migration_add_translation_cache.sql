@@ -0,0 +1,16 @@
+-- Migration: Add translation_cache table for cached Google Translate results
+-- Run this to create the translation_cache table (see utils/translation_cache.py)
+
+CREATE TABLE IF NOT EXISTS translation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    source_language VARCHAR(10) NOT NULL,
+    target_language VARCHAR(10) NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC')
+);
+
+CREATE INDEX IF NOT EXISTS idx_translation_cache_target_language ON translation_cache(target_language);
+
+COMMENT ON TABLE translation_cache IS 'Content-addressed machine translations (question bank, probing questions)';
+COMMENT ON COLUMN translation_cache.cache_key IS 'sha256 of source language, target language and source text';
@@ -0,0 +1,18 @@
+-- Migration: Add tts_cache_entries table (index of cached TTS MP3 files)
+-- Run this to create the tts_cache_entries table (see utils/tts_cache.py)
+
+CREATE TABLE IF NOT EXISTS tts_cache_entries (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    language_code VARCHAR(10) NOT NULL,
+    voice_name VARCHAR(50),
+    size_bytes INTEGER NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC'),
+    last_accessed_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC')
+);
+
+-- Eviction removes the least recently used files first
+CREATE INDEX IF NOT EXISTS idx_tts_cache_entries_last_accessed ON tts_cache_entries(last_accessed_at);
+
+COMMENT ON TABLE tts_cache_entries IS 'Index of content-addressed TTS MP3 files under TTS_CACHE_DIR';
+COMMENT ON COLUMN tts_cache_entries.cache_key IS 'sha256 of text, language, voice, gender, speaking rate and pitch';
@@ -0,0 +1,17 @@
+-- Migration: Add wisdom_snapshots table for precomputed daily wisdom reports
+-- Run this to create the wisdom_snapshots table
+
+CREATE TABLE IF NOT EXISTS wisdom_snapshots (
+    id SERIAL PRIMARY KEY,
+    report_date VARCHAR(10) NOT NULL UNIQUE,
+    generated_at TIMESTAMP NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'UTC'),
+    aggregates JSONB NOT NULL,
+    report TEXT NOT NULL,
+    etag VARCHAR(64) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_wisdom_snapshots_report_date ON wisdom_snapshots(report_date DESC);
+
+COMMENT ON TABLE wisdom_snapshots IS 'One precomputed wisdom report per day (refresh with scripts/refresh_wisdom_snapshot.py)';
+COMMENT ON COLUMN wisdom_snapshots.aggregates IS 'Candidate status/track counts and payment metrics used to render the report';
+COMMENT ON COLUMN wisdom_snapshots.etag IS 'Content hash of the rendered report, served as the HTTP ETag';
@@ -3,91 +3,331 @@ Rebuild Vector Store for RAG
 
 This script:
 1. Scans knowledge_base/ directory for PDF/TXT/MD files
-2. Chunks documents using LangChain's RecursiveCharacterTextSplitter
-3. Initializes FAISS with HuggingFace embeddings
-4. Stores chunks in faiss_index/ directory
+2. Initializes HuggingFace embeddings
+3. Streams page-level chunks (RecursiveCharacterTextSplitter) out of a
+   process pool of document parsers
+4. Embeds chunks in fixed-size batches and stores them in faiss_index/
+
+Peak memory is bounded by the batch size and the number of files in flight,
+not by the size of the corpus.
+
+Modes:
+- Full (default): re-chunks and re-embeds every document
+- Incremental (--incremental): uses the manifest of per-file content hashes to
+  embed only added/changed files and delete vectors for removed files
+
+Each build is written next to the live one as index-<version>.faiss/.pkl and
+published by atomically swapping faiss_index/index_version.txt, so readers
+never see a missing or half-written index.
+
+Index types (--index-type, default from RAG_INDEX_TYPE):
+- flat:     exact float32 search (baseline)
+- hnsw_sq8: HNSW graph over int8 scalar-quantized vectors
+- ivfpq:    inverted lists with product-quantized codes
+Readers memory-map the index and fetch chunk texts on demand from
+chunks-<version>.sqlite; the pickled docstore is only used here, for
+incremental updates. A character n-gram BM25 index (bm25-<version>.npz) is
+built alongside for hybrid lexical + vector search.
+
+A flat master index is always kept for incremental updates; compressed types
+are saved as an extra serving copy (index-<version>-<type>), which
+utils/rag_query.py loads automatically, along with a recall-vs-latency
+report against the flat baseline.
+
+Usage:
+    python database/rebuild_vector_store.py [--incremental] [--workers N] [--batch-size N]
+                                            [--index-type flat|hnsw_sq8|ivfpq]
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
+import re
 import sys
+import time
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.resolve()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import faiss
+import numpy as np
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
-from langchain_core.documents import Document
-from utils.knowledge_base_loader import get_all_documents, get_knowledge_base_path
+from utils.bm25_index import BM25Index
+from utils.chunk_store import write_chunk_store
+from utils.knowledge_base_loader import batched, iter_knowledge_base_chunks, scan_knowledge_base
+import config
+from utils.rag_query import (
+    INDEX_VERSION_FILENAME,
+    new_index_version,
+    read_index_version,
+    resolve_index_name,
+    write_index_version,
+)
 
-import os
+MANIFEST_PREFIX = "manifest"
+
+# Number of chunks embedded per sentence-transformers forward pass
+DEFAULT_BATCH_SIZE = 256
+
+INDEX_TYPES = ["flat", "hnsw_sq8", "ivfpq"]
+
+# Below this many vectors the compressed index types cannot be trained well
+# and are no faster than exact search, so flat is used instead
+MIN_VECTORS_FOR_COMPRESSION = 10000
+
+# Matches versioned files: index-<version>[-<type>].faiss/.pkl, manifest-<version>.json,
+# chunks-<version>.sqlite, bm25-<version>.npz
+VERSIONED_FILE_PATTERN = re.compile(r"^(?:index|manifest|chunks|bm25)-(\d+-[0-9a-f]{8})")
+
+# Recall/latency report settings
+REPORT_SAMPLE_QUERIES = 200
+REPORT_K = 10
+
+
+def _file_hash(file_path: Path) -> str:
+    """Compute the SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _manifest_path(vector_store_path: Path, version: str) -> Path:
+    return vector_store_path / f"{MANIFEST_PREFIX}-{version}.json"
+
+
+def load_manifest(vector_store_path: Path, version: Optional[str]) -> Optional[Dict]:
+    """
+    Load the manifest for an index version.
+
+    Manifest format: {"files": {name: {"hash": str, "chunk_ids": [str, ...]}}}
+
+    Returns:
+        Manifest dictionary, or None if the version has no manifest
+    """
+    if not version:
+        return None
+    try:
+        return json.loads(_manifest_path(vector_store_path, version).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
 
 
-def rebuild_vector_store():
+def build_compressed_index(vectors: np.ndarray, index_type: str) -> faiss.Index:
+    """
+    Build and fill a compressed FAISS index from the flat master vectors.
+
+    Args:
+        vectors: float32 array of shape (n, dim) in the master's ID order
+        index_type: "hnsw_sq8" or "ivfpq"
+
+    Returns:
+        Trained FAISS index containing all vectors (same positions as the master)
+    """
+    n, dim = vectors.shape
+    if index_type == "hnsw_sq8":
+        index = faiss.index_factory(dim, "HNSW32,SQ8", faiss.METRIC_L2)
+        index.hnsw.efConstruction = 80
+        index.hnsw.efSearch = 64
+    elif index_type == "ivfpq":
+        nlist = max(16, int(4 * np.sqrt(n)))
+        index = faiss.index_factory(dim, f"IVF{nlist},PQ{dim // 8}x8", faiss.METRIC_L2)
+        index.nprobe = max(8, nlist // 16)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    index.train(vectors)
+    index.add(vectors)
+    return index
+
+
+def measure_recall_latency(master_index: faiss.Index, index: faiss.Index, vectors: np.ndarray) -> Dict:
+    """
+    Compare a compressed index against the flat baseline on sampled stored vectors.
+
+    Returns:
+        Report dictionary with recall@k and per-query latency for both indexes
+    """
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(len(vectors), size=min(REPORT_SAMPLE_QUERIES, len(vectors)), replace=False)]
+    k = min(REPORT_K, len(vectors))
+
+    def _timed_search(target):
+        start = time.perf_counter()
+        for row in sample:
+            target.search(row.reshape(1, -1), k)
+        elapsed = time.perf_counter() - start
+        _, all_ids = target.search(sample, k)
+        return all_ids, elapsed * 1000 / len(sample)
+
+    truth, flat_ms = _timed_search(master_index)
+    found, compressed_ms = _timed_search(index)
+    recall = np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)])
+
+    return {
+        "queries": len(sample),
+        "k": k,
+        f"recall@{k}": round(float(recall), 4),
+        "flat_ms_per_query": round(flat_ms, 4),
+        "compressed_ms_per_query": round(compressed_ms, 4),
+        "flat_bytes": master_index.ntotal * master_index.d * 4,
+        "compressed_bytes": int(faiss.serialize_index(index).nbytes),
+    }
+
+
+def _publish(vector_store: FAISS, manifest: Dict, vector_store_path: Path, index_type: str = "flat") -> str:
+    """
+    Save a vector store next to the live one and atomically make it current.
+
+    For compressed index types a serving copy is saved beside the flat master
+    and a recall-vs-latency report is stored in the manifest.
+
+    Files from versions older than the previous one are removed afterwards;
+    the previous version is kept for readers that are mid-load.
+
+    Returns:
+        The published version string
+    """
+    vector_store_path.mkdir(parents=True, exist_ok=True)
+    previous_version = read_index_version(vector_store_path)
+    version = new_index_version()
+
+    vector_store.save_local(str(vector_store_path), index_name=f"index-{version}")
+    # Chunk texts/metadata for readers, so they never unpickle the docstore
+    write_chunk_store(vector_store_path / f"chunks-{version}.sqlite", vector_store)
+    # Character n-gram BM25 index over the same positions, for hybrid search
+    chunk_texts = (
+        vector_store.docstore.search(doc_id).page_content
+        for _, doc_id in sorted(vector_store.index_to_docstore_id.items())
+    )
+    BM25Index.build(chunk_texts).save(vector_store_path / f"bm25-{version}.npz")
+
+    # index_type is what is served; requested_index_type is what was asked for, so
+    # incremental runs on a corpus too small to compress do not see a mismatch
+    manifest["requested_index_type"] = index_type
+    manifest["index_type"] = "flat"
+    manifest.pop("index_report", None)
+    if index_type != "flat":
+        master_index = vector_store.index
+        if master_index.ntotal < MIN_VECTORS_FOR_COMPRESSION:
+            print(f"   [INFO] Only {master_index.ntotal} vectors; serving the flat index instead of {index_type}.")
+        else:
+            print(f"   Building {index_type} serving index...")
+            vectors = master_index.reconstruct_n(0, master_index.ntotal)
+            compressed_index = build_compressed_index(vectors, index_type)
+            report = measure_recall_latency(master_index, compressed_index, vectors)
+            print(f"   Recall vs flat: {report}")
+
+            vector_store.index = compressed_index
+            try:
+                vector_store.save_local(str(vector_store_path), index_name=f"index-{version}-{index_type}")
+            finally:
+                vector_store.index = master_index
+            manifest["index_type"] = index_type
+            manifest["index_report"] = report
+    manifest_tmp = vector_store_path / f"{MANIFEST_PREFIX}-{version}.json.tmp"
+    manifest_tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(manifest_tmp, _manifest_path(vector_store_path, version))
+
+    write_index_version(vector_store_path, version)
+
+    keep = {version, previous_version}
+    for stale in vector_store_path.iterdir():
+        match = VERSIONED_FILE_PATTERN.match(stale.name)
+        if match and match.group(1) not in keep:
+            stale.unlink(missing_ok=True)
+    return version
+
+
+def rebuild_vector_store(
+    incremental: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    index_type: Optional[str] = None,
+):
     """
     Rebuild the FAISS vector store from knowledge_base/ documents.
-    
+
     Creates/updates the faiss_index/ directory with embeddings.
+
+    Args:
+        incremental: Only embed added/changed files and drop removed ones,
+            using the manifest of the current index. Falls back to a full
+            rebuild when no manifest exists.
+        workers: Number of document parser processes (default: CPU count)
+        batch_size: Number of chunks embedded per batch
+        index_type: Serving index type (see INDEX_TYPES; default config.RAG_INDEX_TYPE)
     """
+    index_type = index_type or config.RAG_INDEX_TYPE
+    if index_type not in INDEX_TYPES:
+        print(f"[ERROR] Unknown index type '{index_type}'. Choose from: {', '.join(INDEX_TYPES)}")
+        return
+
     print("=" * 80)
-    print("Rebuilding Vector Store for RAG (FAISS)")
+    print("Rebuilding Vector Store for RAG (FAISS)" + (" - incremental" if incremental else ""))
     print("=" * 80)
     print()
-    
-    # Step 1: Load documents from knowledge_base/
-    print("[1/4] Loading documents from knowledge_base/...")
-    documents = get_all_documents()
-    
-    if not documents:
-        print("[WARN] No documents found in knowledge_base/ directory.")
-        print("[INFO] Please add PDF/TXT/MD files to knowledge_base/ and try again.")
-        return
-    
-    print(f"   Found {len(documents)} document(s):")
-    for doc in documents:
-        print(f"   - {doc['name']} ({doc['type']})")
-    print()
-    
-    # Step 2: Chunk documents using RecursiveCharacterTextSplitter
-    print("[2/4] Chunking documents...")
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=100,
-        length_function=len,
-        separators=["\n\n", "\n", " ", ""]
-    )
-    
-    all_documents = []  # List of Document objects for FAISS
-    
-    for doc in documents:
-        content = doc['content']
-        chunks = text_splitter.split_text(content)
-        
-        print(f"   {doc['name']}: {len(chunks)} chunks")
-        
-        for i, chunk in enumerate(chunks):
-            # Create Document objects with metadata for FAISS
-            doc_obj = Document(
-                page_content=chunk,
-                metadata={
-                    'source': doc['name'],
-                    'source_path': doc['path'],
-                    'source_type': doc['type'],
-                    'chunk_index': i,
-                    'total_chunks': len(chunks)
-                }
-            )
-            all_documents.append(doc_obj)
-    
-    print(f"   Total chunks created: {len(all_documents)}")
+
+    vector_store_path = project_root / "faiss_index"
+
+    # Step 1: Scan documents in knowledge_base/
+    print("[1/4] Scanning documents in knowledge_base/...")
+    file_paths = scan_knowledge_base()
+    current_version = read_index_version(vector_store_path)
+    old_manifest = load_manifest(vector_store_path, current_version) if incremental else None
+
+    if not file_paths:
+        if not old_manifest or not old_manifest.get("files"):
+            print("[WARN] No documents found in knowledge_base/ directory.")
+            print("[INFO] Please add PDF/TXT/MD files to knowledge_base/ and try again.")
+            return
+        # Every indexed document was deleted: publish an empty index instead of keeping stale chunks
+        print(f"   knowledge_base/ is empty; removing all {len(old_manifest['files'])} indexed document(s).")
+
+    file_hashes = {path.name: _file_hash(path) for path in file_paths}
+    if file_paths:
+        print(f"   Found {len(file_paths)} document(s):")
+    for path in file_paths:
+        print(f"   - {path.name} ({path.suffix.lower()})")
     print()
-    
-    # Step 3: Initialize embeddings model
-    print("[3/4] Initializing HuggingFace embeddings model...")
+
+    if incremental and old_manifest is None:
+        print("[INFO] No manifest for the current index. Falling back to a full rebuild.")
+        print()
+
+    if old_manifest is not None:
+        old_files = old_manifest.get("files", {})
+        to_embed = [p for p in file_paths if old_files.get(p.name, {}).get("hash") != file_hashes[p.name]]
+        to_remove = [name for name in old_files if name not in file_hashes or old_files[name]["hash"] != file_hashes[name]]
+        print(f"   Changed/added: {len(to_embed)}, removed/replaced: {len(to_remove)}, unchanged: {len(file_paths) - len(to_embed)}")
+        requested_index_type = old_manifest.get("requested_index_type", old_manifest.get("index_type", "flat"))
+        if not to_embed and not to_remove and requested_index_type == index_type:
+            print()
+            print("[SUCCESS] Vector store is already up to date.")
+            return
+        print()
+    else:
+        to_embed = list(file_paths)
+        to_remove = []
+
+    manifest = {"files": {}}
+    if old_manifest is not None:
+        manifest["files"] = {
+            name: entry for name, entry in old_manifest.get("files", {}).items()
+            if name not in to_remove
+        }
+
+    # Step 2: Initialize embeddings model
+    print("[2/4] Initializing HuggingFace embeddings model...")
     try:
         # Use all-MiniLM-L6-v2 model (lightweight, fast, good quality)
         embeddings = HuggingFaceEmbeddings(
@@ -102,31 +342,76 @@ def rebuild_vector_store():
         print("[INFO] Make sure sentence-transformers is installed: pip install sentence-transformers")
         return
     print()
-    
-    # Step 4: Initialize FAISS and store embeddings
-    print("[4/4] Storing embeddings in FAISS...")
-    vector_store_path = project_root / "faiss_index"
-    
-    # Remove existing vector store if it exists (to rebuild from scratch)
-    if vector_store_path.exists():
-        print(f"   Removing existing vector store at: {vector_store_path}")
-        import shutil
-        shutil.rmtree(vector_store_path)
-    
+
     try:
-        # Create FAISS vector store from documents
-        vector_store = FAISS.from_documents(
-            documents=all_documents,
-            embedding=embeddings
-        )
-        
-        # Save the FAISS index
-        vector_store.save_local(str(vector_store_path))
-        
+        # Step 3: Load the live index to update (incremental) or start empty (full)
+        vector_store = None
+        if old_manifest is not None:
+            print("[3/4] Loading current index for incremental update...")
+            # Update a copy of the live index; readers keep using the old files until the swap
+            vector_store = FAISS.load_local(
+                folder_path=str(vector_store_path),
+                embeddings=embeddings,
+                index_name=resolve_index_name(vector_store_path, current_version, serving=False),
+                allow_dangerous_deserialization=True
+            )
+            stale_ids = [
+                chunk_id for name in to_remove
+                for chunk_id in old_manifest["files"][name]["chunk_ids"]
+            ]
+            if stale_ids:
+                vector_store.delete(ids=stale_ids)
+                print(f"   Removed {len(stale_ids)} stale chunk(s)")
+        else:
+            print("[3/4] Starting a full rebuild...")
+        print()
+
+        # Step 4: Stream chunks from the parser pool and embed them in fixed-size batches
+        print(f"[4/4] Chunking and embedding documents (batch size {batch_size})...")
+
+        def _chunk_stream():
+            file_chunk_ids: Dict[str, List[str]] = {}
+            for file_name, chunks, file_done in iter_knowledge_base_chunks(
+                {path: file_hashes[path.name] for path in to_embed},
+                workers=workers,
+            ):
+                chunk_ids = file_chunk_ids.setdefault(file_name, [])
+                chunk_ids.extend(chunk_id for _, _, chunk_id in chunks)
+                if file_done:
+                    print(f"   {file_name}: {len(chunk_ids)} chunks")
+                    manifest["files"][file_name] = {
+                        "hash": file_hashes[file_name],
+                        "chunk_ids": file_chunk_ids.pop(file_name),
+                    }
+                yield from chunks
+
+        added = 0
+        for batch in batched(_chunk_stream(), batch_size):
+            texts = [text for text, _, _ in batch]
+            metadatas = [metadata for _, metadata, _ in batch]
+            ids = [chunk_id for _, _, chunk_id in batch]
+            text_embeddings = list(zip(texts, embeddings.embed_documents(texts)))
+            if vector_store is None:
+                vector_store = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas, ids=ids)
+            else:
+                vector_store.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+            added += len(batch)
+
+        print(f"   Total chunks embedded: {added}")
+        print()
+
+        if vector_store is None:
+            print("[WARN] No readable content found in knowledge_base/ documents.")
+            return
+
+        # Save next to the live index and swap it in atomically
+        index_version = _publish(vector_store, manifest, vector_store_path, index_type=index_type)
+
         print(f"   Vector store created at: {vector_store_path}")
-        print(f"   Total documents stored: {len(all_documents)}")
+        print(f"   Index version: {index_version}")
+        print(f"   Total documents stored: {vector_store.index.ntotal}")
         print()
-        
+
         # Verify the store
         print("[VERIFY] Testing vector store...")
         test_query = "Xplora Kodo"
@@ -135,7 +420,7 @@ def rebuild_vector_store():
         print(f"   Retrieved {len(results)} result(s)")
         if results:
             print(f"   First result preview: {results[0].page_content[:100]}...")
-        
+
         print()
         print("=" * 80)
         print("[SUCCESS] Vector store rebuilt successfully!")
@@ -145,7 +430,7 @@ def rebuild_vector_store():
         print("1. The vector store is ready for RAG queries")
         print("2. Use utils/rag_query.py to perform similarity searches")
         print("3. Integrate RAG into Sensei agent logic")
-        
+
     except Exception as e:
         print(f"[ERROR] Failed to create vector store: {e}")
         import traceback
@@ -154,5 +439,34 @@ def rebuild_vector_store():
 
 
 if __name__ == "__main__":
-    rebuild_vector_store()
-
+    parser = argparse.ArgumentParser(description="Rebuild the FAISS vector store for RAG")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed added/changed files and remove vectors for deleted files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel document parser processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Chunks embedded per batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=INDEX_TYPES,
+        default=None,
+        help=f"Serving index type (default: RAG_INDEX_TYPE={config.RAG_INDEX_TYPE})",
+    )
+    args = parser.parse_args()
+    rebuild_vector_store(
+        incremental=args.incremental,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        index_type=args.index_type,
+    )
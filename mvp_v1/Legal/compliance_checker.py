@@ -10,6 +10,7 @@ from __future__ import annotations
 from sqlalchemy.orm import Session
 
 from database.db_manager import Candidate, CurriculumProgress, Payment, SessionLocal
+from utils.eligibility_cache import invalidate_eligibility
 
 
 class ComplianceChecker:
@@ -117,6 +118,7 @@ class ComplianceChecker:
                 candidate.travel_ready = True
                 candidate.status = "ReadyForSubmission"
                 db.commit()
+                invalidate_eligibility(candidate_id)
                 
                 # Trigger notification (MessengerAgent will handle this)
                 notification_note = "\n📧 Notification triggered: Candidate will be notified via MessengerAgent."
@@ -11,11 +11,51 @@ from __future__ import annotations
 
 import base64
 import os
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 import config
+from utils.metrics import span
+
+
+@dataclass
+class VoiceTranslationResult:
+    """
+    Structured outcome of a voice-to-voice translation.
+
+    API endpoints serialize these fields directly; to_markdown() renders the
+    agent-facing text returned by VoiceToVoiceTranslator.run().
+    """
+
+    success: bool
+    error: Optional[str] = None
+    transcribed_text: Optional[str] = None
+    translated_text: Optional[str] = None
+    audio_output_path: Optional[str] = None
+    tts_voice: Optional[str] = None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_markdown(self) -> str:
+        if not self.success:
+            return f"Error: {self.error}"
+        return f"""
+Voice-to-Voice Translation (Phase 2 - OpenAI Reality):
+✓ Transcribed Nepali audio: "{self.transcribed_text}"
+✓ Translated to Polite Japanese: "{self.translated_text}"
+✓ Generated Japanese Sensei audio (Voice: {self.tts_voice})
+
+**Output:**
+- Audio Output Path: {self.audio_output_path}
+- Transcribed Text: {self.transcribed_text}
+- Translated Text: {self.translated_text}
+"""
+
 
 # Phase 2 guard: This entire module is dormant unless flag is enabled
 if not config.PHASE_2_ENABLED:
@@ -36,11 +76,9 @@ if not config.PHASE_2_ENABLED:
 else:
     # Phase 2 implementation with OpenAI Reality
     from agency_swarm.tools import BaseTool
-    from openai import OpenAI
     from pydantic import Field
 
-    # Initialize OpenAI client
-    openai_client = OpenAI(api_key=config.OPENAI_API_KEY) if config.OPENAI_API_KEY else None
+    from utils.clients import get_openai_client
 
     class VoiceToVoiceTranslator(BaseTool):
         """
@@ -69,6 +107,10 @@ else:
         )
 
         def run(self) -> str:
+            """Perform voice-to-voice translation and render it for the agent."""
+            return self.run_structured().to_markdown()
+
+        def run_structured(self) -> VoiceTranslationResult:
             """
             Perform voice-to-voice translation: Nepali -> Japanese Sensei.
 
@@ -77,10 +119,18 @@ else:
             2. Translate to Polite Japanese (Desu/Masu form) using GPT-4o
             3. Synthesize Japanese audio using OpenAI TTS
             4. Save audio to media/responses/ and return file path
+
+            Returns:
+                VoiceTranslationResult (success=False with error set on failure)
             """
+            openai_client = get_openai_client()
             if not openai_client:
-                return "Error: OpenAI API key not configured. Set OPENAI_API_KEY in .env file."
+                return VoiceTranslationResult(
+                    success=False, error="OpenAI API key not configured. Set OPENAI_API_KEY in .env file."
+                )
 
+            started = time.perf_counter()
+            timings_ms: Dict[str, float] = {}
             try:
                 # Step 1: Handle audio input (file path or base64)
                 audio_file = None
@@ -98,16 +148,20 @@ else:
                 elif self.audio_input_path:
                     audio_file = open(self.audio_input_path, "rb")
                 else:
-                    return "Error: Either audio_input_path or audio_base64 must be provided."
+                    return VoiceTranslationResult(
+                        success=False, error="Either audio_input_path or audio_base64 must be provided."
+                    )
 
                 # Step 2: Transcribe Nepali audio using Whisper
-                transcription_response = openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ne" if self.source_language == "Nepali" else None,  # Nepali language code
-                )
+                with span("voice.stt") as stage:
+                    transcription_response = openai_client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio_file,
+                        language="ne" if self.source_language == "Nepali" else None,  # Nepali language code
+                    )
                 nepali_text = transcription_response.text
                 audio_file.close()
+                timings_ms["transcription"] = stage.elapsed_ms
 
                 # Clean up temporary file if created
                 if self.audio_base64 and temp_audio_path.exists():
@@ -122,25 +176,29 @@ Nepali text: {nepali_text}
 
 Provide only the Japanese translation in Polite form (Desu/Masu), no explanations."""
 
-                translation_response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional translator specializing in Nepali to Japanese translation. Always use Polite Japanese (Desu/Masu form) suitable for a teacher-student context.",
-                        },
-                        {"role": "user", "content": translation_prompt},
-                    ],
-                    temperature=0.3,
-                )
+                with span("voice.translation") as stage:
+                    translation_response = openai_client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are a professional translator specializing in Nepali to Japanese translation. Always use Polite Japanese (Desu/Masu form) suitable for a teacher-student context.",
+                            },
+                            {"role": "user", "content": translation_prompt},
+                        ],
+                        temperature=0.3,
+                    )
                 japanese_text = translation_response.choices[0].message.content.strip()
+                timings_ms["translation"] = stage.elapsed_ms
 
                 # Step 4: Synthesize Japanese audio using OpenAI TTS
-                tts_response = openai_client.audio.speech.create(
-                    model="tts-1",
-                    voice=self.tts_voice,
-                    input=japanese_text,
-                )
+                synthesis_started = time.perf_counter()
+                with span("voice.tts"):
+                    tts_response = openai_client.audio.speech.create(
+                        model="tts-1",
+                        voice=self.tts_voice,
+                        input=japanese_text,
+                    )
 
                 # Step 5: Save audio to media/responses/
                 media_dir = Path(__file__).parent.parent.parent / "media" / "responses"
@@ -149,21 +207,21 @@ Provide only the Japanese translation in Polite form (Desu/Masu), no explanation
                 audio_filename = f"japanese_response_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
                 audio_output_path = media_dir / audio_filename
 
-                with open(audio_output_path, "wb") as f:
+                with span("voice.file_write"), open(audio_output_path, "wb") as f:
                     for chunk in tts_response.iter_bytes():
                         f.write(chunk)
 
-                return f"""
-Voice-to-Voice Translation (Phase 2 - OpenAI Reality):
-✓ Transcribed Nepali audio: "{nepali_text}"
-✓ Translated to Polite Japanese: "{japanese_text}"
-✓ Generated Japanese Sensei audio (Voice: {self.tts_voice})
+                timings_ms["synthesis"] = round((time.perf_counter() - synthesis_started) * 1000, 1)
+                timings_ms["total"] = round((time.perf_counter() - started) * 1000, 1)
 
-**Output:**
-- Audio Output Path: {audio_output_path}
-- Transcribed Text: {nepali_text}
-- Translated Text: {japanese_text}
-"""
+                return VoiceTranslationResult(
+                    success=True,
+                    transcribed_text=nepali_text,
+                    translated_text=japanese_text,
+                    audio_output_path=str(audio_output_path),
+                    tts_voice=self.tts_voice,
+                    timings_ms=timings_ms,
+                )
             except Exception as e:
-                return f"Error in voice-to-voice translation: {str(e)}"
+                return VoiceTranslationResult(success=False, error=f"Voice-to-voice translation failed: {str(e)}")
 
@@ -0,0 +1,97 @@
+"""
+Benchmark API throughput under concurrent load.
+
+Fires a fixed number of requests at an endpoint of a running API server with a
+given concurrency and reports requests/second and latency percentiles. Run it
+against two builds (e.g. before/after a change) with the same arguments to
+compare them.
+
+Usage:
+    uvicorn api.main:app --workers 1 --port 8000
+    python scripts/benchmark_api_concurrency.py --candidate-id CANDIDATE_001 \
+        --endpoint wisdom --requests 500 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def _build_request(endpoint: str, base_url: str, candidate_id: str) -> tuple[str, str, dict | None]:
+    """Return (method, url, json_body) for a named endpoint."""
+    if endpoint == "wisdom":
+        return "GET", f"{base_url}/candidate-wisdom/{candidate_id}", None
+    if endpoint == "start-lesson":
+        return "POST", f"{base_url}/start-lesson", {
+            "candidate_id": candidate_id,
+            "module_type": "jlpt",
+            "jlpt_level": "N5",
+        }
+    if endpoint == "root":
+        return "GET", f"{base_url}/", None
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def run_benchmark(base_url: str, endpoint: str, candidate_id: str, total: int, concurrency: int) -> dict:
+    """
+    Send `total` requests with `concurrency` in flight and collect timings.
+
+    Returns:
+        Dictionary with rps, latency percentiles (ms) and error count
+    """
+    method, url, body = _build_request(endpoint, base_url, candidate_id)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+
+    def _one(_: int) -> tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, json=body, timeout=60)
+            ok = response.status_code < 500
+        except requests.RequestException:
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_one, range(total)))
+    wall_seconds = time.perf_counter() - wall_start
+
+    latencies = sorted(latency for latency, _ in results)
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, ok in results if not ok),
+        "rps": round(total / wall_seconds, 1),
+        "p50_ms": round(quantiles[49], 1),
+        "p95_ms": round(quantiles[94], 1),
+        "p99_ms": round(quantiles[98], 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark XploreKodo API throughput")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["wisdom", "start-lesson", "root"], default="wisdom")
+    parser.add_argument("--candidate-id", default="CANDIDATE_001")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    if args.requests < 2:
+        parser.error("--requests must be at least 2")
+
+    print("=" * 80)
+    print(f"Benchmarking {args.endpoint} at {args.base_url}")
+    print("=" * 80)
+    report = run_benchmark(args.base_url, args.endpoint, args.candidate_id, args.requests, args.concurrency)
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+    sys.exit(1 if report["errors"] == report["requests"] else 0)
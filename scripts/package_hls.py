@@ -0,0 +1,98 @@
+"""
+Package Lesson Videos as HLS
+
+Finds every lesson video (the Syllabus table's video paths plus all MP4s
+under static/videos/<track>/) and transcodes each into adaptive-bitrate HLS
+renditions with the local ffmpeg (see utils/hls.py). Manifests are written
+next to the source; load_video_lessons() then offers them to the hubs.
+
+Incremental: videos whose source hash is unchanged since the last run are
+skipped. Videos are packaged in parallel, with each ffmpeg process given an
+equal share of the CPU cores.
+
+Requires ffmpeg and ffprobe on PATH.
+
+Usage:
+    python scripts/package_hls.py [--workers N] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.hls import package_video
+
+
+def collect_lesson_videos() -> list[Path]:
+    """Source MP4s from the Syllabus table and static/videos/<track>/, deduplicated."""
+    videos: list[Path] = []
+
+    try:
+        from database.db_manager import session_scope
+        from models.curriculum import Syllabus
+
+        with session_scope() as db:
+            for (video_path,) in db.query(Syllabus.video_path).distinct().all():
+                if video_path:
+                    videos.append(project_root / video_path)
+    except Exception as e:
+        print(f"[WARN] Could not read lesson paths from the Syllabus table: {e}")
+
+    videos.extend(sorted((project_root / "static" / "videos").glob("*/*.mp4")))
+
+    unique = {}
+    for video in videos:
+        if video.is_file():
+            unique.setdefault(video.resolve(), None)
+    return list(unique)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Package lesson videos as adaptive-bitrate HLS")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Videos packaged in parallel")
+    parser.add_argument("--force", action="store_true", help="Re-encode even if the source is unchanged")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("[ERROR] ffmpeg and ffprobe must be installed and on PATH.")
+        return 1
+
+    videos = collect_lesson_videos()
+    print(f"[INFO] {len(videos)} lesson videos found")
+    if not videos:
+        return 0
+
+    workers = max(1, min(args.workers, len(videos)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    counts = {"packaged": 0, "skipped": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(package_video, video, args.force, threads): video for video in videos}
+        for future in as_completed(futures):
+            video = futures[future].relative_to(project_root)
+            try:
+                status = future.result()
+            except Exception as e:
+                stderr = getattr(e, "stderr", None)
+                print(f"[ERROR] {video}: {(stderr or str(e)).strip()}")
+                counts["failed"] += 1
+                continue
+            counts[status] += 1
+            print(f"   {status}: {video}")
+
+    print(f"[INFO] Packaged {counts['packaged']}, skipped {counts['skipped']} unchanged, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Prewarm the Translation Cache
+
+Translates the Socratic question bank (the predefined Omotenashi questions and
+the question generated for every Japanese knowledge base concept) into Japanese
+and Nepali in batched Google Translate requests, and stores the results in the
+translation_cache table. Questions then render with no translation round-trip.
+Already-cached strings are not sent again, so the script is cheap to rerun
+after seeding new knowledge base content.
+
+Usage:
+    python scripts/prewarm_translations.py [--languages ja ne]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agency.training_agent.socratic_questioning_tool import SocraticQuestioningTool
+from database.db_manager import KnowledgeBase, session_scope
+from utils.translation_cache import translate_texts
+
+
+def collect_question_texts() -> list[str]:
+    """English text of every question the Socratic tools can show."""
+    tool = SocraticQuestioningTool(candidate_id="translation_prewarm")
+    questions = tool._get_omotenashi_questions()
+
+    with session_scope() as db:
+        concepts = db.query(
+            KnowledgeBase.concept_title, KnowledgeBase.concept_content, KnowledgeBase.page_number
+        ).filter(KnowledgeBase.language == "ja").all()
+        for concept in concepts:
+            questions.append(tool._generate_socratic_question_from_concept({
+                "concept_title": concept.concept_title,
+                "concept_content": concept.concept_content,
+                "page_number": concept.page_number,
+            }))
+
+    return list(dict.fromkeys(question["question_en"] for question in questions))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prewarm the translation cache with the Socratic question bank")
+    parser.add_argument("--languages", nargs="+", default=["ja", "ne"], help="Target language codes")
+    args = parser.parse_args()
+
+    texts = collect_question_texts()
+    print(f"[INFO] {len(texts)} unique questions to cache")
+
+    failed = 0
+    for language in args.languages:
+        translations = translate_texts(texts, language)
+        missing = sum(1 for translation in translations if translation is None)
+        failed += missing
+        print(f"   {language}: {len(texts) - missing} cached, {missing} failed")
+
+    if failed:
+        print("[WARN] Some translations failed; check the Google Translate credentials and rerun.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
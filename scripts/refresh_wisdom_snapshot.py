@@ -0,0 +1,47 @@
+"""
+Refresh the Daily Wisdom Snapshot
+
+Computes the wisdom report aggregates once, stores them (with the rendered
+report) in the wisdom_snapshots table and saves the Markdown report under
+operations/reports/. Schedule it daily, e.g. with cron:
+
+    5 0 * * * cd /path/to/xplorekodo && python scripts/refresh_wisdom_snapshot.py
+
+Usage:
+    python scripts/refresh_wisdom_snapshot.py [--date YYYY-MM-DD]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from agency.operations_agent.wisdom_snapshot import refresh_wisdom_snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh the daily wisdom report snapshot")
+    parser.add_argument("--date", default=None, help="Report date (YYYY-MM-DD). Defaults to today.")
+    args = parser.parse_args()
+
+    try:
+        snapshot = refresh_wisdom_snapshot(args.date)
+    except Exception as e:
+        print(f"[ERROR] Failed to refresh wisdom snapshot: {e}")
+        return 1
+
+    aggregates = snapshot["aggregates"]
+    print(f"[INFO] Wisdom snapshot for {snapshot['report_date']} stored (ETag {snapshot['etag']})")
+    print(f"   Candidates: {aggregates['total_candidates']} ({aggregates['travel_ready_count']} travel-ready)")
+    print(f"   Payments: {aggregates['payment_successful']}/{aggregates['payment_total']} successful")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Background Job Worker
+
+Starts a pool of worker processes that claim jobs from the background_jobs
+table (FOR UPDATE SKIP LOCKED) and run them: PDF performance reports, grading,
+translation and wisdom reports. Run as many copies on as many hosts as
+needed; they share the queue through PostgreSQL only.
+
+Usage:
+    python scripts/run_job_worker.py [--processes N] [--poll-interval SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import signal
+import socket
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import config
+
+
+def _worker_main(index: int, poll_interval: float) -> None:
+    """Entry point of one worker process."""
+    from utils.job_queue import run_worker
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    worker_id = f"{socket.gethostname()}:{multiprocessing.current_process().pid}:{index}"
+    print(f"[INFO] Job worker {worker_id} started")
+    run_worker(worker_id=worker_id, poll_interval=poll_interval, stop_event=stop_event)
+    print(f"[INFO] Job worker {worker_id} stopped")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--processes", type=int, default=config.JOB_WORKER_PROCESSES,
+                        help="Number of worker processes")
+    parser.add_argument("--poll-interval", type=float, default=config.JOB_POLL_INTERVAL_SECONDS,
+                        help="Seconds to wait when the queue is empty")
+    args = parser.parse_args()
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+
+    # Spawn (not fork) so each worker opens its own database connection pool
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_main, args=(index, args.poll_interval), name=f"job-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def _stop(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        _stop()
+        for process in processes:
+            process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
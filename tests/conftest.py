@@ -0,0 +1,59 @@
+"""
+Shared pytest fixtures.
+
+- sqlite_session_scope: session_scope() replacement backed by a fresh
+  in-memory SQLite database with every table created
+- patch_session_scope: points a module's session_scope at that database
+"""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_session_scope():
+    """Context manager like database.db_manager.session_scope(), over an in-memory SQLite database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from database.db_manager import Base
+
+    # StaticPool: every session (and thread) shares the one in-memory connection
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def _session_scope():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    yield _session_scope
+    engine.dispose()
+
+
+@pytest.fixture
+def patch_session_scope(monkeypatch, sqlite_session_scope):
+    """Call with a module to replace its session_scope with sqlite_session_scope; returns the module."""
+    def _patch(module):
+        monkeypatch.setattr(module, "session_scope", sqlite_session_scope)
+        return module
+    return _patch
@@ -0,0 +1,96 @@
+"""
+Tests for audio preprocessing before Speech-to-Text.
+
+Verifies:
+- Browser-style 44.1 kHz stereo WAV becomes 16 kHz mono LINEAR16 (about 5x smaller)
+- Speech-band content survives the resampling
+- WAV chunks are walked (fmt after LIST), and undecodable WAV is passed through
+- Other containers are sniffed and keep their own encoding
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import sys
+import wave
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from utils.audio_preprocessing import parse_wav, prepare_audio_for_stt, sniff_container
+
+
+def _wav_bytes(samples: np.ndarray, sample_rate: int) -> bytes:
+    """16-bit PCM WAV from float samples shaped (frames, channels)."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(samples.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((samples * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def _tone(frequency: float, sample_rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return 0.5 * np.sin(2 * np.pi * frequency * t)
+
+
+def test_browser_wav_is_downmixed_and_resampled():
+    stereo = np.stack([_tone(440, 44100), _tone(440, 44100)], axis=1)
+    original = _wav_bytes(stereo, 44100)
+
+    prepared = prepare_audio_for_stt(original)
+
+    assert prepared.container == "wav"
+    assert prepared.encoding == "LINEAR16"
+    assert prepared.sample_rate_hertz == 16000
+    assert len(prepared.content) == 16000 * 2
+    assert len(original) / len(prepared.content) > 5
+
+
+def test_speech_band_survives_resampling():
+    prepared = prepare_audio_for_stt(_wav_bytes(_tone(1000, 48000)[:, None], 48000))
+
+    samples = np.frombuffer(prepared.content, dtype="<i2").astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(samples))
+    peak_hz = np.argmax(spectrum) * 16000 / len(samples)
+    assert abs(peak_hz - 1000) < 5
+    assert 0.4 < np.abs(samples).max() / 32767 < 0.6
+
+
+def test_wav_chunks_are_walked():
+    original = _wav_bytes(_tone(440, 16000)[:, None], 16000)
+    list_chunk = b"LIST" + struct.pack("<I", 5) + b"INFOx\x00"  # Odd size: padded to a word boundary
+    reordered = original[:12] + list_chunk + original[12:]
+
+    info = parse_wav(reordered)
+    assert (info.channels, info.sample_rate, info.bits_per_sample) == (1, 16000, 16)
+    assert len(info.data) == 16000 * 2
+
+    truncated = original[:20]
+    prepared = prepare_audio_for_stt(truncated)
+    assert prepared.encoding == "ENCODING_UNSPECIFIED"
+    assert prepared.content == truncated
+
+
+def test_other_containers_are_sniffed():
+    flac = b"fLaC" + b"\x00" * 14 + bytes([0x0A, 0xC4, 0x40]) + b"\x00" * 20
+    assert sniff_container(flac) == "flac"
+    assert prepare_audio_for_stt(flac).sample_rate_hertz == 44100
+
+    ogg = b"OggS" + b"\x00" * 24 + b"OpusHead" + b"\x00" * 20
+    assert prepare_audio_for_stt(ogg).encoding == "OGG_OPUS"
+
+    webm = b"\x1a\x45\xdf\xa3" + b"\x00" * 40 + b"A_OPUS"
+    assert prepare_audio_for_stt(webm).encoding == "WEBM_OPUS"
+
+    assert sniff_container(b"ID3\x04" + b"\x00" * 10) == "mp3"
+    assert sniff_container(b"\x00\x00\x00\x20ftypisom") == "mp4"
+    assert prepare_audio_for_stt(b"garbage").encoding == "ENCODING_UNSPECIFIED"
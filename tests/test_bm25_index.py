@@ -0,0 +1,77 @@
+"""
+Tests for the character n-gram BM25 index and reciprocal-rank fusion.
+
+Verifies:
+- Exact Japanese term matches rank first without a tokenizer
+- Save/load round trip preserves rankings
+- Only documents in the matched postings are scored and returned
+- RRF rewards documents found by both rankings
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.bm25_index import BM25Index, char_ngrams, reciprocal_rank_fusion
+
+CHUNKS = [
+    "Xplora Kodo prepares Nepali students for life in Japan.",
+    "介護福祉士は利用者の食事介助を行います。",
+    "食品衛生の基本：手洗いと温度管理。",
+]
+
+
+def test_char_ngrams_normalizes_width_and_case() -> None:
+    """Verify NFKC normalization folds full-width text before n-gramming."""
+    assert char_ngrams("ＡＢc") == ["ab", "bc"]
+    assert char_ngrams("介") == ["介"]
+    assert char_ngrams("   ") == []
+
+
+def test_japanese_exact_term_ranks_first() -> None:
+    """Verify a kanji term matches the chunk containing it."""
+    index = BM25Index.build(CHUNKS)
+
+    results = index.search("食事介助", k=2)
+
+    assert results[0][0] == 1
+    assert index.search("zzzz", k=3) == []
+
+
+def test_save_load_round_trip(tmp_path: Path) -> None:
+    """Verify a saved index returns the same ranking after loading."""
+    index = BM25Index.build(CHUNKS)
+    path = tmp_path / "bm25-1-deadbeef.npz"
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+
+    assert loaded.search("手洗い", k=3) == index.search("手洗い", k=3)
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+def test_reciprocal_rank_fusion_prefers_agreement() -> None:
+    """Verify a document ranked by both lists outranks single-list hits."""
+    fused = reciprocal_rank_fusion([[5, 2, 9], [2, 7]], k=3)
+
+    assert fused[0][0] == 2
+    assert len(fused) == 3
+
+
+def test_only_matching_documents_are_ranked() -> None:
+    """Verify results come from the matched postings only, best first, even when k exceeds them."""
+    chunks = [f"unrelated filler text number {i}" for i in range(200)]
+    chunks[17] = "手洗いの手順"
+    chunks[123] = "手洗いと手洗い場の清掃"
+    index = BM25Index.build(chunks)
+
+    results = index.search("手洗い", k=50)
+
+    assert sorted(position for position, _ in results) == [17, 123]
+    assert results[0][1] >= results[1][1] > 0
@@ -0,0 +1,62 @@
+"""
+Tests for the SQLite chunk store.
+
+Verifies:
+- Export from a LangChain-style docstore keyed by FAISS position
+- On-demand lookups return hits in the requested order
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.chunk_store import SQLiteChunkStore, write_chunk_store
+
+
+class _FakeDocstore:
+    def __init__(self, docs: dict):
+        self._docs = docs
+
+    def search(self, doc_id: str):
+        return self._docs[doc_id]
+
+
+def _fake_vector_store() -> SimpleNamespace:
+    docs = {
+        "manifesto.md#abc#0": SimpleNamespace(page_content="Xplora Kodo mission", metadata={"source": "manifesto.md", "chunk_index": 0}),
+        "manifesto.md#abc#1": SimpleNamespace(page_content="介護の基本", metadata={"source": "manifesto.md", "chunk_index": 1}),
+    }
+    return SimpleNamespace(
+        index_to_docstore_id={0: "manifesto.md#abc#0", 1: "manifesto.md#abc#1"},
+        docstore=_FakeDocstore(docs),
+    )
+
+
+def test_chunk_store_round_trip(tmp_path: Path) -> None:
+    """Verify chunks are fetched by FAISS position in the order requested."""
+    path = tmp_path / "chunks-1-deadbeef.sqlite"
+    write_chunk_store(path, _fake_vector_store())
+
+    store = SQLiteChunkStore(path)
+    chunks = store.get_chunks([1, 0])
+
+    assert [chunk["text"] for chunk in chunks] == ["介護の基本", "Xplora Kodo mission"]
+    assert chunks[0]["metadata"] == {"source": "manifesto.md", "chunk_index": 1}
+    assert store.get_chunks([]) == []
+
+
+def test_write_chunk_store_replaces_existing_file(tmp_path: Path) -> None:
+    """Verify rewriting a store swaps in the new file without leftovers."""
+    path = tmp_path / "chunks.sqlite"
+    write_chunk_store(path, _fake_vector_store())
+    write_chunk_store(path, _fake_vector_store())
+
+    assert [p.name for p in tmp_path.iterdir()] == ["chunks.sqlite"]
+    assert len(SQLiteChunkStore(path).get_chunks([0, 1])) == 2
@@ -0,0 +1,60 @@
+"""
+Tests for the shared API client registry.
+
+Verifies:
+- Clients are constructed once and reused
+- Unavailable clients (None) are retried on the next call
+- override_client() swaps in a fake and restores the real client
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import clients
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(clients, "CLIENT_FACTORIES", dict(clients.CLIENT_FACTORIES))
+    clients.reset_clients()
+    yield
+    clients.reset_clients()
+
+
+def test_client_is_created_once():
+    created = []
+    clients.CLIENT_FACTORIES["gemini"] = lambda: created.append(object()) or created[-1]
+
+    first = clients.get_gemini_client()
+    assert clients.get_gemini_client() is first
+    assert len(created) == 1
+
+
+def test_unavailable_client_is_retried():
+    results = iter([None, "client"])
+    clients.CLIENT_FACTORIES["tts"] = lambda: next(results)
+
+    assert clients.get_tts_client() is None
+    assert clients.get_tts_client() == "client"
+
+
+def test_override_client():
+    clients.CLIENT_FACTORIES["speech"] = lambda: "real"
+    fake = object()
+
+    with clients.override_client("speech", fake):
+        assert clients.get_speech_client() is fake
+    assert clients.get_speech_client() == "real"
+
+    with pytest.raises(ValueError):
+        with clients.override_client("unknown", fake):
+            pass
@@ -0,0 +1,49 @@
+"""
+Tests for the Phase 2 eligibility cache.
+
+Verifies:
+- Cached state is returned until invalidated
+- Invalidation of one candidate and of the whole cache
+- Hit/miss counters
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils.eligibility_cache import (
+    cache_eligibility,
+    get_cached_eligibility,
+    get_eligibility_cache_stats,
+    invalidate_eligibility,
+)
+
+
+def test_cache_and_invalidate_candidate():
+    invalidate_eligibility()
+    cache_eligibility("CANDIDATE_A", True, False)
+    cache_eligibility("CANDIDATE_B", True, True)
+
+    assert get_cached_eligibility("CANDIDATE_A") == (True, False)
+
+    invalidate_eligibility("CANDIDATE_A")
+    assert get_cached_eligibility("CANDIDATE_A") is None
+    assert get_cached_eligibility("CANDIDATE_B") == (True, True)
+
+
+def test_invalidate_all_and_stats():
+    cache_eligibility("CANDIDATE_C", False, False)
+    invalidate_eligibility()
+
+    before = get_eligibility_cache_stats()
+    assert get_cached_eligibility("CANDIDATE_C") is None
+    after = get_eligibility_cache_stats()
+
+    assert after["size"] == 0
+    assert after["misses"] == before["misses"] + 1
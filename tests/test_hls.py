@@ -0,0 +1,64 @@
+"""
+Tests for HLS packaging.
+
+Verifies:
+- Renditions taller than the source are dropped
+- The master playlist lists each rendition with bandwidth and resolution
+- Unchanged sources are skipped without running ffmpeg
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils import hls
+
+
+def test_select_renditions():
+    assert [r["name"] for r in hls.select_renditions(1080)] == ["360p", "540p", "720p"]
+    assert [r["name"] for r in hls.select_renditions(540)] == ["360p", "540p"]
+
+    low = hls.select_renditions(241)
+    assert len(low) == 1 and low[0]["height"] == 240
+
+
+def test_master_playlist():
+    playlist = hls.render_master_playlist(hls.select_renditions(720), 1280, 720)
+    lines = playlist.splitlines()
+
+    assert lines[0] == "#EXTM3U"
+    assert "BANDWIDTH=896000,RESOLUTION=640x360" in lines[2]
+    assert lines[3] == "360p/index.m3u8"
+    assert "RESOLUTION=1280x720" in lines[-2]
+    assert lines[-1] == "720p/index.m3u8"
+
+
+def test_unchanged_source_is_skipped(tmp_path, monkeypatch):
+    video = tmp_path / "lesson.mp4"
+    video.write_bytes(b"video-v1")
+    assert hls.hls_manifest_for(video) is None
+
+    def _fake_transcode(video_path, output_dir, rendition, threads):
+        output_dir.mkdir(parents=True)
+        (output_dir / "index.m3u8").write_text("#EXTM3U\n")
+
+    monkeypatch.setattr(hls, "probe_video_size", lambda path: (1280, 720))
+    monkeypatch.setattr(hls, "_transcode_rendition", _fake_transcode)
+
+    assert hls.package_video(video) == "packaged"
+    assert hls.hls_manifest_for(video) == tmp_path / "lesson_hls" / "master.m3u8"
+    assert (tmp_path / "lesson_hls" / "720p" / "index.m3u8").is_file()
+
+    monkeypatch.setattr(hls, "_transcode_rendition", lambda *args: pytest.fail("re-encoded an unchanged video"))
+    assert hls.package_video(video) == "skipped"
+
+    video.write_bytes(b"video-v2")
+    assert not hls.is_up_to_date(video)
@@ -0,0 +1,117 @@
+"""
+Tests for the background job queue.
+
+Verifies:
+- Enqueue -> claim -> complete lifecycle
+- Retry with exponential backoff, then failure after max_attempts
+- Unknown job types are rejected
+- A worker whose claim was taken over cannot record the outcome
+- Payload keys are checked per job type; spooled uploads are deleted when the job ends
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils import job_queue
+
+
+@pytest.fixture
+def queue(monkeypatch, patch_session_scope):
+    patch_session_scope(job_queue)
+    monkeypatch.setitem(job_queue.JOB_HANDLERS, "echo", lambda payload: {"echo": payload["value"]})
+    return job_queue
+
+
+def test_job_lifecycle(queue):
+    job_id = queue.enqueue_job("echo", {"value": 42})
+    assert queue.get_job(job_id)["status"] == "queued"
+
+    job = queue.claim_next_job("worker-1")
+    assert job["job_id"] == job_id
+    assert job["attempts"] == 1
+    assert queue.claim_next_job("worker-2") is None
+
+    queue.run_job(job, "worker-1")
+    finished = queue.get_job(job_id)
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"echo": 42}
+
+
+def test_retry_with_backoff_then_fail(queue):
+    job_id = queue.enqueue_job("echo", {}, max_attempts=2)
+
+    queue.run_job(queue.claim_next_job("worker-1"), "worker-1")  # KeyError in handler
+    retried = queue.get_job(job_id)
+    assert retried["status"] == "queued"
+    assert retried["run_after"] > retried["created_at"]
+    assert queue.claim_next_job("worker-1") is None  # still backing off
+
+    with queue.session_scope() as db:
+        db.query(queue.BackgroundJob).filter_by(id=job_id).update({"run_after": retried["created_at"]})
+    queue.run_job(queue.claim_next_job("worker-1"), "worker-1")
+    failed = queue.get_job(job_id)
+    assert failed["status"] == "failed"
+    assert failed["attempts"] == 2
+
+
+def test_retry_delay_doubles():
+    base = job_queue.retry_delay_seconds(1)
+    assert job_queue.retry_delay_seconds(2) == base * 2
+    assert job_queue.retry_delay_seconds(50) == job_queue.MAX_RETRY_DELAY_SECONDS
+
+
+def test_unknown_job_type_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.enqueue_job("not_a_job", {})
+
+
+def test_stale_worker_result_is_dropped(queue):
+    job_id = queue.enqueue_job("echo", {"value": 1})
+    queue.claim_next_job("worker-1")
+
+    assert queue.requeue_stale_jobs(timeout_seconds=-1) == 1
+    current = queue.claim_next_job("worker-2")
+    assert current["job_id"] == job_id
+
+    assert queue.complete_job(job_id, "worker-1", {"echo": "stale"}) is False
+    assert queue.fail_job(job_id, "worker-1", "stale") is False
+    assert queue.get_job(job_id)["status"] == "running"
+
+    queue.run_job(current, "worker-2")
+    assert queue.get_job(job_id)["result"] == {"echo": 1}
+    assert queue.complete_job(job_id, "worker-2", {"echo": "again"}) is False
+
+
+def test_payload_keys_are_validated(queue):
+    with pytest.raises(ValueError, match="candidate_id"):
+        queue.enqueue_job("performance_report", {})
+    with pytest.raises(ValueError, match="audio_base64"):
+        queue.enqueue_job("translation", {"text": "hello", "audio_base64": "AAAA"})
+    with pytest.raises(ValueError, match="JOB_UPLOAD_DIR"):
+        queue.enqueue_job("language_coaching", {"candidate_id": "C1", "audio_path": "/etc/passwd"})
+
+
+def test_spooled_upload_is_removed_when_attempts_run_out(queue, monkeypatch, tmp_path):
+    monkeypatch.setattr(queue.config, "JOB_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setitem(queue.JOB_HANDLERS, "language_coaching", lambda payload: 1 / 0)
+    audio = tmp_path / "upload_audio_1.wav"
+    audio.write_bytes(b"RIFF")
+
+    job_id = queue.enqueue_job("language_coaching", {"candidate_id": "C1", "audio_path": str(audio)}, max_attempts=2)
+    queue.run_job(queue.claim_next_job("worker-1"), "worker-1")
+    assert audio.exists()  # kept for the retry
+
+    with queue.session_scope() as db:
+        db.query(queue.BackgroundJob).filter_by(id=job_id).update({"run_after": queue._utcnow()})
+    queue.run_job(queue.claim_next_job("worker-1"), "worker-1")
+    assert queue.get_job(job_id)["status"] == "failed"
+    assert not audio.exists()
@@ -0,0 +1,60 @@
+"""
+Tests for streamed knowledge base chunking.
+
+Verifies:
+- Text files are split into segments at line breaks that rebuild the file exactly
+- Chunks are yielded part by part with continuous chunk indices per file
+- The last part of each file is flagged so callers can finish its manifest entry
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import knowledge_base_loader as loader
+
+
+def test_text_parts_split_at_line_breaks(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "TEXT_BYTES_PER_PART", 16)
+    document = tmp_path / "guide.md"
+    document.write_text("".join(f"line {i} 介護\n" for i in range(10)), encoding="utf-8")
+
+    parts = loader.split_document(document)
+    assert len(parts) > 1
+
+    texts = [text for part in parts for _, text in loader.iter_document_pages(Path(part[0]), part[1], part[2])]
+    assert "".join(texts) == document.read_text(encoding="utf-8")
+    assert all(text.endswith("\n") for text in texts)
+
+
+def test_chunks_stream_part_by_part(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "TEXT_BYTES_PER_PART", 8)
+    monkeypatch.setattr(
+        loader,
+        "_chunk_part_job",
+        lambda part: [(line, 1) for _, text in loader.iter_document_pages(Path(part[0]), part[1], part[2]) for line in text.split()],
+    )
+    first = tmp_path / "a.txt"
+    first.write_text("alpha\nbeta\ngamma\ndelta\n", encoding="utf-8")
+    second = tmp_path / "b.txt"
+    second.write_text("omega\n", encoding="utf-8")
+
+    results = list(loader.iter_knowledge_base_chunks({first: "1" * 64, second: "2" * 64}, workers=1))
+
+    a_parts = [r for r in results if r[0] == "a.txt"]
+    assert len(a_parts) > 1
+    assert [done for _, _, done in a_parts] == [False] * (len(a_parts) - 1) + [True]
+    a_chunks = [chunk for _, chunks, _ in a_parts for chunk in chunks]
+    assert [text for text, _, _ in a_chunks] == ["alpha", "beta", "gamma", "delta"]
+    assert [metadata["chunk_index"] for _, metadata, _ in a_chunks] == [0, 1, 2, 3]
+    assert a_chunks[-1][2] == f"a.txt#{'1' * 16}#3"
+
+    file_name, chunks, done = results[-1]
+    assert (file_name, done) == ("b.txt", True)
+    assert [(text, chunk_id) for text, _, chunk_id in chunks] == [("omega", f"b.txt#{'2' * 16}#0")]
@@ -0,0 +1,72 @@
+"""
+Tests for the LRU cache utility.
+
+Verifies:
+- LRU eviction order and size bound
+- TTL expiry
+- Hit/miss counters
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used() -> None:
+    """Verify the least recently used entry is evicted when full."""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Verify entries older than the TTL are treated as misses."""
+    now = [1000.0]
+    monkeypatch.setattr("utils.lru_cache.time.monotonic", lambda: now[0])
+
+    cache = LRUCache(maxsize=10, ttl_seconds=5)
+    cache.set("q", "value")
+    now[0] += 4
+    assert cache.get("q") == "value"
+    now[0] += 2
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+
+def test_hit_miss_counters_survive_clear() -> None:
+    """Verify counters track lookups and are kept across clear()."""
+    cache = LRUCache(maxsize=10)
+    cache.set(("what is xplora kodo?", 3), ["chunk"])
+    cache.get(("what is xplora kodo?", 3))
+    cache.get(("unknown", 3))
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 0
+
+
+def test_rejects_non_positive_maxsize() -> None:
+    """Verify an unbounded cache cannot be created by mistake."""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
@@ -0,0 +1,72 @@
+"""
+Tests for the media file helpers behind GET /media.
+
+Verifies:
+- Range headers are parsed into inclusive byte positions (or rejected)
+- Paths cannot escape the served video roots
+- Videos map to media URLs, and ranges are streamed exactly
+- Responses allow cross-origin players to read the range headers
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils import media
+
+
+@pytest.fixture
+def video_root(monkeypatch, tmp_path):
+    root = tmp_path / "videos"
+    (root / "academic").mkdir(parents=True)
+    (root / "academic" / "lesson.mp4").write_bytes(bytes(range(100)))
+    (tmp_path / "secret.txt").write_text("secret")
+    monkeypatch.setattr(media, "MEDIA_ROOTS", {"static": root})
+    monkeypatch.setattr(media.config, "MEDIA_BASE_URL", "http://media.test/media/")
+    return root
+
+
+def test_parse_range():
+    assert media.parse_range(None, 100) is None
+    assert media.parse_range("bytes=0-9", 100) == (0, 9)
+    assert media.parse_range("bytes=90-", 100) == (90, 99)
+    assert media.parse_range("bytes=-10", 100) == (90, 99)
+    assert media.parse_range("bytes=50-500", 100) == (50, 99)
+    assert media.parse_range("bytes=0-1,5-6", 100) is None
+    assert media.parse_range("items=0-1", 100) is None
+
+    for header in ("bytes=100-", "bytes=9-0", "bytes=abc", "bytes=-0"):
+        with pytest.raises(media.RangeNotSatisfiable):
+            media.parse_range(header, 100)
+
+
+def test_resolve_media_path_stays_inside_root(video_root):
+    assert media.resolve_media_path("static", "academic/lesson.mp4") == (video_root / "academic" / "lesson.mp4").resolve()
+    assert media.resolve_media_path("static", "../secret.txt") is None
+    assert media.resolve_media_path("static", "academic") is None
+    assert media.resolve_media_path("other", "academic/lesson.mp4") is None
+
+
+def test_media_url_and_range_stream(video_root, tmp_path):
+    assert media.media_url(video_root / "academic" / "lesson.mp4") == "http://media.test/media/static/academic/lesson.mp4"
+    assert media.media_url(tmp_path / "secret.txt") is None
+
+    chunks = list(media.iter_file_range(video_root / "academic" / "lesson.mp4", 10, 29, chunk_size=8))
+    assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+    assert b"".join(chunks) == bytes(range(10, 30))
+
+
+def test_cors_headers_expose_ranges(monkeypatch):
+    monkeypatch.setattr(media.config, "MEDIA_ALLOW_ORIGIN", "*")
+    headers = media.media_cors_headers()
+    assert headers["Access-Control-Allow-Origin"] == "*"
+    assert "Content-Range" in headers["Access-Control-Expose-Headers"]
+    assert "Accept-Ranges" in headers["Access-Control-Expose-Headers"]
@@ -0,0 +1,75 @@
+"""
+Tests for the latency metrics utility.
+
+Verifies:
+- span() records a stage and exposes elapsed_ms
+- Spans are recorded even when the block raises
+- Bucket quantiles interpolate like histogram_quantile
+- render_prometheus() emits cumulative buckets, _sum and _count
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def test_span_records_stage():
+    with metrics.span("coaching.stt") as stage:
+        pass
+
+    assert stage.elapsed_ms >= 0
+    summary = metrics.snapshot()
+    assert summary[0]["labels"] == {"stage": "coaching.stt"}
+    assert summary[0]["count"] == 1
+
+
+def test_span_records_on_error():
+    @metrics.timed("coaching.grading")
+    def _fail():
+        raise RuntimeError("Gemini unavailable")
+
+    with pytest.raises(RuntimeError):
+        _fail()
+
+    assert metrics.snapshot()[0]["count"] == 1
+
+
+def test_histogram_quantile():
+    histogram = metrics.Histogram(buckets=(0.1, 1.0))
+    for _ in range(50):
+        histogram.observe(0.05)
+    for _ in range(50):
+        histogram.observe(0.5)
+
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert histogram.quantile(0.75) == pytest.approx(0.55)
+    assert metrics.Histogram().quantile(0.5) is None
+
+
+def test_render_prometheus():
+    metrics.observe_request("GET", "/candidate-wisdom/{candidate_id}", 200, 0.02)
+    metrics.observe_request("GET", "/candidate-wisdom/{candidate_id}", 200, 3.0)
+
+    text = metrics.render_prometheus()
+    labels = 'method="GET",path="/candidate-wisdom/{candidate_id}",status="200"'
+    assert "# TYPE xplorekodo_http_request_duration_seconds histogram" in text
+    assert f'xplorekodo_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'xplorekodo_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"xplorekodo_http_request_duration_seconds_count{{{labels}}} 2" in text
@@ -0,0 +1,114 @@
+"""
+Tests for admission control (token buckets and concurrency limits).
+
+Verifies:
+- Token buckets allow a burst, then report a Retry-After until they refill
+- Candidate concurrency limits reject with 429 and free slots on release
+- Upstream service limits reject with 503 without leaking candidate slots
+- Pruning idle buckets uses each bucket's own rate and capacity
+- Tokens taken before a later bucket denies the request are refunded
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import config
+from utils import rate_limiter
+from utils.rate_limiter import AdmissionDenied, InMemoryRateLimitBackend, admit
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(config, "CANDIDATE_RATE_PER_MINUTE", 60)
+    monkeypatch.setattr(config, "CANDIDATE_BURST", 2)
+    monkeypatch.setattr(config, "CANDIDATE_MAX_CONCURRENT", 1)
+    monkeypatch.setattr(config, "UPSTREAM_LIMITS", {"gemini": (0, 1)})
+    monkeypatch.setattr(rate_limiter, "rate_limit_backend", InMemoryRateLimitBackend())
+    monkeypatch.setattr(rate_limiter, "concurrency_limiter", rate_limiter.ConcurrencyLimiter())
+
+
+def test_token_bucket_refills():
+    now = [0.0]
+    backend = InMemoryRateLimitBackend(clock=lambda: now[0])
+
+    assert backend.acquire("candidate:C1", rate_per_second=1, capacity=2) == 0
+    assert backend.acquire("candidate:C1", rate_per_second=1, capacity=2) == 0
+    assert backend.acquire("candidate:C1", rate_per_second=1, capacity=2) == pytest.approx(1.0)
+
+    now[0] = 1.0
+    assert backend.acquire("candidate:C1", rate_per_second=1, capacity=2) == 0
+
+
+def test_candidate_concurrency_limit():
+    ticket = admit("C1", [])
+
+    with pytest.raises(AdmissionDenied) as denied:
+        admit("C1", [])
+    assert denied.value.status_code == 429
+    assert denied.value.retry_after_header == "1"
+
+    ticket.release()
+    admit("C1", []).release()
+
+
+def test_service_limit_returns_503_and_releases_candidate_slot():
+    ticket = admit("C1", ["gemini"])
+
+    with pytest.raises(AdmissionDenied) as denied:
+        admit("C2", ["gemini"])
+    assert denied.value.status_code == 503
+    assert rate_limiter.concurrency_limiter.active("candidate:C2") == 0
+
+    ticket.release()
+    assert rate_limiter.concurrency_limiter.active("service:gemini") == 0
+
+
+def test_candidate_rate_limit():
+    admit("C1", []).release()
+    admit("C1", []).release()
+
+    with pytest.raises(AdmissionDenied) as denied:
+        admit("C1", [])
+    assert denied.value.status_code == 429
+    assert rate_limiter.concurrency_limiter.active("candidate:C1") == 0
+
+
+def test_prune_uses_each_buckets_own_limits(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "MAX_IDLE_BUCKETS", 2)
+    now = [0.0]
+    backend = InMemoryRateLimitBackend(clock=lambda: now[0])
+
+    # A slow service bucket, drained: refilling takes 100 s
+    assert backend.acquire("service:slow", rate_per_second=0.01, capacity=1) == 0
+    now[0] = 1.0
+    # Fast candidate buckets trigger pruning; with their rate the slow bucket would look full
+    backend.acquire("candidate:C1", rate_per_second=10, capacity=1)
+    backend.acquire("candidate:C2", rate_per_second=10, capacity=1)
+
+    assert backend.acquire("service:slow", rate_per_second=0.01, capacity=1) == pytest.approx(99.0)
+
+
+def test_denied_request_refunds_earlier_buckets(monkeypatch):
+    monkeypatch.setattr(config, "UPSTREAM_LIMITS", {"speech": (60, 0), "gemini": (60, 0)})
+    backend = InMemoryRateLimitBackend(clock=lambda: 0.0)
+    monkeypatch.setattr(rate_limiter, "rate_limit_backend", backend)
+    backend._buckets["service:gemini"] = (0.0, 0.0, 1.0, 10.0)  # gemini quota exhausted
+
+    for _ in range(3):
+        with pytest.raises(AdmissionDenied) as denied:
+            admit("C1", ["speech", "gemini"])
+        assert denied.value.status_code == 503
+
+    assert backend._buckets["candidate:C1"][0] == pytest.approx(config.CANDIDATE_BURST, )
+    assert backend._buckets["service:speech"][0] == pytest.approx(10.0, )
+    admit("C1", ["speech"]).release()
@@ -0,0 +1,43 @@
+"""
+Tests for the structured training tool results.
+
+Verifies:
+- API-facing fields survive to_dict()
+- to_markdown() keeps the agent-facing text format
+- Failures render as "Error: ..." strings
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from mvp_v1.training.voice_to_voice import VoiceTranslationResult
+
+
+def test_voice_translation_result_markdown():
+    result = VoiceTranslationResult(
+        success=True,
+        transcribed_text="नमस्ते",
+        translated_text="こんにちは",
+        audio_output_path="media/responses/japanese_response.mp3",
+        tts_voice="alloy",
+        timings_ms={"total": 12.5},
+    )
+
+    markdown = result.to_markdown()
+    assert '✓ Translated to Polite Japanese: "こんにちは"' in markdown
+    assert "- Audio Output Path: media/responses/japanese_response.mp3" in markdown
+    assert result.to_dict()["timings_ms"] == {"total": 12.5}
+
+
+def test_voice_translation_result_error():
+    result = VoiceTranslationResult(success=False, error="OpenAI API key not configured.")
+
+    assert result.to_markdown() == "Error: OpenAI API key not configured."
+    assert result.to_dict()["translated_text"] is None
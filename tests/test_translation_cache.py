@@ -0,0 +1,74 @@
+"""
+Tests for the translation cache.
+
+Verifies:
+- Cache misses are translated upstream in one batch per target language
+- Persisted translations are served without calling Google Translate
+- Failed translations are returned as None and not cached
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from utils import translation_cache
+from utils.clients import override_client
+
+
+class FakeTranslateClient:
+    def __init__(self, fail_on: str | None = None):
+        self.requests: list[list[str]] = []
+        self.fail_on = fail_on
+
+    def translate(self, values, target_language, source_language=None):
+        self.requests.append(list(values))
+        return [
+            {"translatedText": None if value == self.fail_on else f"{target_language}:{value}"}
+            for value in values
+        ]
+
+
+@pytest.fixture
+def cache(patch_session_scope):
+    patch_session_scope(translation_cache)
+    translation_cache.clear_translation_memory_cache()
+    yield translation_cache
+    translation_cache.clear_translation_memory_cache()
+
+
+def test_misses_are_batched(cache):
+    client = FakeTranslateClient()
+    with override_client("translate", client):
+        result = cache.translate_texts(["Hello", "Thank you", "Hello"], "ja")
+
+    assert result == ["ja:Hello", "ja:Thank you", "ja:Hello"]
+    assert client.requests == [["Hello", "Thank you"]]
+
+
+def test_persisted_translations_skip_upstream(cache):
+    with override_client("translate", FakeTranslateClient()):
+        cache.translate_texts(["Hello"], "ne")
+
+    cache.clear_translation_memory_cache()
+    client = FakeTranslateClient()
+    with override_client("translate", client):
+        assert cache.translate_text("Hello", "ne") == "ne:Hello"
+    assert client.requests == []
+
+
+def test_failures_are_not_cached(cache):
+    with override_client("translate", FakeTranslateClient(fail_on="Hello")):
+        assert cache.translate_texts(["Hello", "Bye"], "ja") == [None, "ja:Bye"]
+
+    client = FakeTranslateClient()
+    with override_client("translate", client):
+        assert cache.translate_text("Hello", "ja") == "ja:Hello"
+    assert client.requests == [["Hello"]]
@@ -0,0 +1,88 @@
+"""
+Tests for the TTS audio cache.
+
+Verifies:
+- Identical requests are synthesized once and then served from disk
+- Every voice setting is part of the cache key
+- Least recently used files are evicted once the size limit is exceeded
+- Stored references play back (re-synthesized) after their file is evicted
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import pytest
+
+from database.db_manager import TTSCacheEntry
+from utils import tts_cache
+
+
+@pytest.fixture
+def synthesized() -> list[str]:
+    """Texts sent to the (fake) upstream synthesizer."""
+    return []
+
+
+@pytest.fixture
+def cache(monkeypatch, patch_session_scope, tmp_path, synthesized):
+    def _fake_synthesize(text, language_code, voice_name, ssml_gender, speaking_rate, pitch):
+        synthesized.append(text)
+        return f"{language_code}:{text}".encode("utf-8") * 10
+
+    patch_session_scope(tts_cache)
+    monkeypatch.setattr(tts_cache, "_synthesize_upstream", _fake_synthesize)
+    monkeypatch.setattr(tts_cache.config, "TTS_CACHE_DIR", str(tmp_path / "tts"))
+    monkeypatch.setattr(tts_cache, "_last_touched", {})
+    return tts_cache
+
+
+def test_repeated_requests_are_served_from_disk(cache, synthesized):
+    first = cache.synthesize_speech("Konnichiwa", "ja-JP", voice_name="ja-JP-Neural2-C")
+    second = cache.synthesize_speech("Konnichiwa", "ja-JP", voice_name="ja-JP-Neural2-C")
+
+    assert first == second == b"ja-JP:Konnichiwa" * 10
+    assert synthesized == ["Konnichiwa"]
+    assert cache.get_tts_cache_stats()["files"] == 1
+
+
+def test_voice_settings_are_part_of_the_key(cache):
+    base = cache.tts_cache_key("Hello", "en-US", "en-US-Neural2-C", "FEMALE", 1.0, 0.0)
+
+    assert cache.tts_cache_key("Hello", "en-US", "en-US-Neural2-C", "female", 1.0, 0.0) == base
+    assert cache.tts_cache_key("Hello", "en-US", "en-US-Neural2-C", "FEMALE", 0.95, 0.0) != base
+    assert cache.tts_cache_key("Hello", "en-US", "en-US-Neural2-C", "FEMALE", 1.0, -2.0) != base
+    assert cache.tts_cache_key("Hello", "en-US", "en-US-Standard-A", "FEMALE", 1.0, 0.0) != base
+
+
+def test_least_recently_used_files_are_evicted(cache, monkeypatch):
+    monkeypatch.setattr(cache, "TOUCH_INTERVAL_SECONDS", 0.0)
+    size = len(b"en-US:one" * 10)
+    monkeypatch.setattr(cache.config, "TTS_CACHE_MAX_MB", 2 * size / (1024 * 1024))
+
+    one = cache.synthesize_speech_file("one", "en-US")
+    two = cache.synthesize_speech_file("two", "en-US")
+    cache.synthesize_speech_file("one", "en-US")  # "two" is now least recently used
+    three = cache.synthesize_speech_file("thr", "en-US")
+
+    assert one.exists() and three.exists()
+    assert not two.exists()
+    with cache.session_scope() as db:
+        assert db.query(TTSCacheEntry).count() == 2
+
+
+def test_stored_reference_survives_eviction(cache, synthesized):
+    ref = cache.tts_audio_ref("Namaste", "ne-NP")
+    assert ref["cache_key"] == cache.tts_cache_key("Namaste", "ne-NP")
+
+    cache.evict_tts_cache(max_bytes=0)
+    assert not cache.tts_cache_path(ref["cache_key"]).exists()
+
+    assert cache.load_tts_audio(ref) == b"ne-NP:Namaste" * 10
+    assert synthesized == ["Namaste", "Namaste"]
@@ -0,0 +1,72 @@
+"""
+Tests for precomputed wisdom report snapshots.
+
+Verifies:
+- Aggregates from the grouped candidate query and the payments query
+- Report rendering with and without token metrics
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from agency.operations_agent.wisdom_snapshot import compute_wisdom_aggregates, render_wisdom_report
+from database.db_manager import Base, Candidate, Payment
+
+
+def _seeded_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        Candidate(candidate_id="C1", full_name="A", track="student", status="ReadyForSubmission", travel_ready=True),
+        Candidate(candidate_id="C2", full_name="B", track="student", status="Incomplete"),
+        Candidate(candidate_id="C3", full_name="C", track="jobseeker", status="Incomplete"),
+    ])
+    db.add_all([
+        Payment(candidate_id="C1", amount="100", provider="stripe", transaction_id="T1", status="success",
+                created_at=datetime(2024, 1, 1, 10, 0)),
+        Payment(candidate_id="C2", amount="100", provider="stripe", transaction_id="T2", status="failed",
+                created_at=datetime(2024, 1, 1, 11, 0)),
+        Payment(candidate_id="C3", amount="100", provider="stripe", transaction_id="T3", status="success",
+                created_at=datetime(2024, 1, 2, 9, 0)),
+    ])
+    db.commit()
+    return db
+
+
+def test_compute_wisdom_aggregates():
+    db = _seeded_session()
+    aggregates = compute_wisdom_aggregates(db, "2024-01-01")
+
+    assert aggregates["total_candidates"] == 3
+    assert aggregates["travel_ready_count"] == 1
+    assert dict(aggregates["status_counts"]) == {"Incomplete": 2, "ReadyForSubmission": 1}
+    assert dict(aggregates["track_counts"]) == {"student": 2, "jobseeker": 1}
+    assert aggregates["payment_total"] == 2
+    assert aggregates["payment_successful"] == 1
+    assert aggregates["payment_success_rate"] == 50.0
+
+
+def test_render_wisdom_report():
+    db = _seeded_session()
+    aggregates = compute_wisdom_aggregates(db, "2024-01-01")
+    generated_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    report = render_wisdom_report(aggregates, generated_at)
+    assert "**Date:** 2024-01-01" in report
+    assert "- **Travel-Ready Rate:** 33.33%" in report
+    assert "- **Student:** 2 (66.67%)" in report
+    assert "Token Thrift Optimization" in report
+
+    assert "Token Thrift Optimization" not in render_wisdom_report(aggregates, generated_at, include_token_metrics=False)
@@ -12,7 +12,8 @@ from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
-from database.db_manager import ActivityLog, SessionLocal
+from database.db_manager import ActivityLog, SessionLocal, session_scope
+from utils.metrics import STAGE_METRIC, observe
 
 
 class ActivityLogger:
@@ -39,30 +40,25 @@ class ActivityLogger:
         Returns:
             True if logged successfully, False otherwise
         """
-        db: Session = SessionLocal()
         try:
-            log_entry = ActivityLog(
-                timestamp=datetime.now(timezone.utc),
-                user_id=user_id,
-                event_type=event_type,
-                severity=severity,
-                message=message,
-                event_metadata=metadata or {},
-            )
-            
-            db.add(log_entry)
-            db.commit()
+            with session_scope() as db:
+                log_entry = ActivityLog(
+                    timestamp=datetime.now(timezone.utc),
+                    user_id=user_id,
+                    event_type=event_type,
+                    severity=severity,
+                    message=message,
+                    event_metadata=metadata or {},
+                )
+                db.add(log_entry)
             return True
             
         except Exception as e:
-            db.rollback()
             # Don't fail silently - at least print the error
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to log activity: {e}")
             return False
-        finally:
-            db.close()
 
     @staticmethod
     def log_grading(
@@ -142,7 +138,10 @@ class ActivityLogger:
         user_id: Optional[str] = None,
         response_data: Optional[dict] = None,
     ) -> bool:
-        """Log an API call event."""
+        """Log an API call event (the latency also feeds the api.<api_name> stage histogram)."""
+        if latency_ms is not None:
+            observe(STAGE_METRIC, latency_ms / 1000, stage=f"api.{api_name}")
+
         severity = "Warning" if latency_ms and latency_ms > 5000 else "Info"
         message = f"API call to {api_name}: {status}"
         if latency_ms:
@@ -0,0 +1,245 @@
+"""
+Audio Preprocessing for Speech-to-Text
+
+Shared stage in front of every Google Speech-to-Text call (concierge voice
+input, language coaching, baseline assessment). The container is sniffed
+once and the clip is sent in a single recognize() call with a config that
+matches it, instead of guessing with several configs in a row.
+
+- WAV (PCM 8/16/24/32-bit or float): downmixed to mono and resampled to
+  16 kHz LINEAR16 with NumPy. Browser recordings are usually 44.1/48 kHz
+  stereo, so uploads shrink roughly 5-6x.
+- FLAC, Ogg/WebM Opus: sent as they are with the matching encoding and
+  sample rate (already compressed; decoding them needs ffmpeg).
+- Anything else (MP3, MP4/AAC, unknown): sent as is with
+  ENCODING_UNSPECIFIED, the previous behaviour.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+logger = logging.getLogger(__name__)
+
+# Speech-to-Text is trained on 16 kHz audio; higher rates only add upload size
+STT_SAMPLE_RATE = 16000
+
+# Opus always decodes at 48 kHz, whatever the encoder's input rate was
+OPUS_SAMPLE_RATE = 48000
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class AudioFormatError(ValueError):
+    """The clip claims a format (e.g. RIFF/WAVE) but its header cannot be parsed."""
+
+
+@dataclass
+class PreparedAudio:
+    """Audio ready for a single recognize() call."""
+
+    content: bytes
+    container: str  # 'wav', 'flac', 'ogg_opus', 'webm_opus', 'mp3', 'mp4' or 'unknown'
+    encoding: str  # RecognitionConfig.AudioEncoding name, e.g. 'LINEAR16'
+    sample_rate_hertz: Optional[int] = None  # None lets Speech-to-Text read it from the header
+    original_size: int = 0
+
+
+@dataclass
+class WavInfo:
+    """Parsed fmt and data chunks of a RIFF/WAVE file."""
+
+    format_tag: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data: bytes
+
+
+def sniff_container(data: bytes) -> str:
+    """Identify the audio container from its magic bytes."""
+    if len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data[:4] == b"fLaC":
+        return "flac"
+    if data[:4] == b"OggS":
+        return "ogg_opus" if b"OpusHead" in data[:128] else "ogg"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm_opus" if b"A_OPUS" in data[:4096] else "webm"
+    if data[:3] == b"ID3" or (len(data) >= 2 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if data[4:8] == b"ftyp":
+        return "mp4"
+    return "unknown"
+
+
+def parse_wav(data: bytes) -> WavInfo:
+    """
+    Walk the RIFF chunks of a WAV file (fmt may follow LIST or other chunks).
+
+    Raises:
+        AudioFormatError: If the fmt or data chunk is missing or truncated
+    """
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, offset + 4)
+        body_start = offset + 8
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body_start + 16 > len(data):
+                raise AudioFormatError("Truncated WAV fmt chunk")
+            format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from("<HHIIHH", data, body_start)
+            if format_tag == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # Actual format is the first two bytes of the SubFormat GUID
+                (format_tag,) = struct.unpack_from("<H", data, body_start + 24)
+            fmt = (format_tag, channels, sample_rate, bits_per_sample)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioFormatError("WAV data chunk before fmt chunk")
+            # Streaming recorders leave the size as 0 or 0xFFFFFFFF: take the rest of the file
+            body_end = len(data) if chunk_size in (0, 0xFFFFFFFF) else min(body_start + chunk_size, len(data))
+            return WavInfo(*fmt, data=data[body_start:body_end])
+        offset = body_start + chunk_size + (chunk_size & 1)  # Chunks are word-aligned
+
+    raise AudioFormatError("WAV file has no fmt/data chunk")
+
+
+def decode_pcm(info: WavInfo) -> np.ndarray:
+    """
+    Decode WAV samples to float32 in [-1, 1], shape (frames, channels).
+
+    Raises:
+        AudioFormatError: For compressed WAV formats (e.g. ADPCM) or odd sample sizes
+    """
+    if info.channels < 1 or info.sample_rate < 1:
+        raise AudioFormatError(f"Invalid WAV header ({info.channels} channels, {info.sample_rate} Hz)")
+    width = info.bits_per_sample // 8
+    usable = len(info.data) - len(info.data) % (width * info.channels) if width else 0
+
+    if info.format_tag == _WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        samples = np.frombuffer(info.data[:usable], dtype="<f4" if width == 4 else "<f8").astype(np.float32)
+    elif info.format_tag == _WAVE_FORMAT_PCM and width == 1:
+        samples = (np.frombuffer(info.data[:usable], dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif info.format_tag == _WAVE_FORMAT_PCM and width == 2:
+        samples = np.frombuffer(info.data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+    elif info.format_tag == _WAVE_FORMAT_PCM and width == 3:
+        raw = np.frombuffer(info.data[:usable], dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608.0
+    elif info.format_tag == _WAVE_FORMAT_PCM and width == 4:
+        samples = (np.frombuffer(info.data[:usable], dtype="<i4").astype(np.float64) / 2147483648.0).astype(np.float32)
+    else:
+        raise AudioFormatError(f"Unsupported WAV encoding (format {info.format_tag:#06x}, {info.bits_per_sample}-bit)")
+
+    return samples.reshape(-1, info.channels)
+
+
+def _lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    """Hamming-windowed sinc low-pass filter; cutoff is a fraction of the input sample rate."""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = STT_SAMPLE_RATE) -> np.ndarray:
+    """
+    Resample mono float samples by linear interpolation.
+
+    When downsampling, a low-pass filter at 90% of the new Nyquist frequency
+    runs first so high frequencies do not alias into the speech band.
+    """
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < source_rate:
+        samples = np.convolve(samples, _lowpass_kernel(0.45 * target_rate / source_rate), mode="same")
+
+    duration = len(samples) / source_rate
+    target_length = max(1, int(round(duration * target_rate)))
+    positions = np.arange(target_length) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def to_linear16(samples: np.ndarray) -> bytes:
+    """Float samples in [-1, 1] to little-endian 16-bit PCM (clipped)."""
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype("<i2").tobytes()
+
+
+def _flac_sample_rate(data: bytes) -> Optional[int]:
+    """Sample rate from the FLAC STREAMINFO block (20 bits at byte 18)."""
+    if len(data) < 21:
+        return None
+    return (data[18] << 12) | (data[19] << 4) | (data[20] >> 4) or None
+
+
+def prepare_audio_for_stt(data: bytes) -> PreparedAudio:
+    """
+    Sniff a clip once and convert it to what a single recognize() call needs.
+
+    Args:
+        data: Raw uploaded audio bytes
+
+    Returns:
+        PreparedAudio with the content to upload and its encoding/sample rate
+        (a WAV file that cannot be decoded here is passed through for
+        Speech-to-Text to read its header)
+    """
+    container = sniff_container(data)
+
+    if container == "wav":
+        try:
+            info = parse_wav(data)
+            mono = decode_pcm(info).mean(axis=1)
+        except AudioFormatError as e:
+            logger.warning(f"Could not decode WAV audio locally, sending it unchanged: {e}")
+            return PreparedAudio(data, container, "ENCODING_UNSPECIFIED", None, len(data))
+        return PreparedAudio(
+            content=to_linear16(resample(mono, info.sample_rate)),
+            container=container,
+            encoding="LINEAR16",
+            sample_rate_hertz=STT_SAMPLE_RATE,
+            original_size=len(data),
+        )
+    if container == "flac":
+        return PreparedAudio(data, container, "FLAC", _flac_sample_rate(data), len(data))
+    if container == "ogg_opus":
+        return PreparedAudio(data, container, "OGG_OPUS", OPUS_SAMPLE_RATE, len(data))
+    if container == "webm_opus":
+        return PreparedAudio(data, container, "WEBM_OPUS", OPUS_SAMPLE_RATE, len(data))
+    return PreparedAudio(data, container, "ENCODING_UNSPECIFIED", None, len(data))
+
+
+def build_recognition_config(prepared: PreparedAudio, language_code: str, **options: Any) -> Any:
+    """
+    google.cloud.speech RecognitionConfig matching the prepared audio.
+
+    Args:
+        prepared: Result of prepare_audio_for_stt()
+        language_code: Primary language (e.g. 'ja-JP')
+        **options: Other RecognitionConfig fields (model, enable_automatic_punctuation, ...)
+    """
+    from google.cloud import speech
+
+    fields = {
+        "encoding": getattr(speech.RecognitionConfig.AudioEncoding, prepared.encoding),
+        "language_code": language_code,
+        **options,
+    }
+    if prepared.sample_rate_hertz:
+        fields["sample_rate_hertz"] = prepared.sample_rate_hertz
+    return speech.RecognitionConfig(**fields)
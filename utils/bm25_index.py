@@ -0,0 +1,208 @@
+"""
+BM25 Lexical Index Utility
+
+Character n-gram BM25 index over knowledge base chunks. Character n-grams match
+exact Japanese terms (kanji/kana) without a morphological tokenizer, which the
+English-centric embedding model often misses.
+
+Postings are stored array-backed (CSR layout) in a single .npz file:
+- term_offsets[t]:term_offsets[t+1] slices the postings of term t
+- posting_docs / posting_tfs hold document positions and term frequencies
+Document positions are FAISS index positions, so lexical and vector hits can
+be fused directly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+NGRAM_SIZE = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """
+    Split text into overlapping character n-grams after NFKC/lowercase normalization.
+
+    Whitespace runs are collapsed to a single space so n-grams can span word
+    boundaries in space-separated languages. Texts shorter than n yield
+    themselves as a single gram.
+
+    Args:
+        text: Text to tokenize
+        n: N-gram size
+
+    Returns:
+        List of n-grams (with repeats)
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", text).lower().split())
+    if not normalized:
+        return []
+    if len(normalized) <= n:
+        return [normalized]
+    return [normalized[i:i + n] for i in range(len(normalized) - n + 1)]
+
+
+class BM25Index:
+    """Array-backed BM25 index over character n-grams."""
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        term_offsets: np.ndarray,
+        posting_docs: np.ndarray,
+        posting_tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+        ngram_size: int = NGRAM_SIZE,
+    ):
+        self.vocabulary = vocabulary
+        self.term_offsets = term_offsets
+        self.posting_docs = posting_docs
+        self.posting_tfs = posting_tfs
+        self.doc_lengths = doc_lengths
+        self.ngram_size = ngram_size
+        self.num_docs = len(doc_lengths)
+        self.avg_doc_length = float(doc_lengths.mean()) if self.num_docs else 0.0
+
+        # Precompute per-document length normalization and per-term IDF
+        document_frequency = np.diff(term_offsets).astype(np.float32)
+        self._idf = np.log1p((self.num_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        if self.avg_doc_length:
+            self._length_norm = (BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / self.avg_doc_length)).astype(np.float32)
+        else:
+            self._length_norm = np.full(self.num_docs, BM25_K1, dtype=np.float32)
+
+    @classmethod
+    def build(cls, texts: Iterable[str], ngram_size: int = NGRAM_SIZE) -> "BM25Index":
+        """
+        Build an index from chunk texts in FAISS position order.
+
+        Args:
+            texts: Chunk texts; the i-th text gets document position i
+            ngram_size: Character n-gram size
+
+        Returns:
+            BM25Index
+        """
+        vocabulary: Dict[str, int] = {}
+        term_postings: List[List[Tuple[int, int]]] = []
+        doc_lengths = []
+
+        for position, text in enumerate(texts):
+            grams = char_ngrams(text, ngram_size)
+            doc_lengths.append(len(grams))
+            for gram, tf in Counter(grams).items():
+                term_id = vocabulary.setdefault(gram, len(vocabulary))
+                if term_id == len(term_postings):
+                    term_postings.append([])
+                term_postings[term_id].append((position, tf))
+
+        term_offsets = np.zeros(len(term_postings) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(postings) for postings in term_postings])
+        posting_docs = np.empty(term_offsets[-1], dtype=np.int32)
+        posting_tfs = np.empty(term_offsets[-1], dtype=np.float32)
+        for term_id, postings in enumerate(term_postings):
+            start, end = term_offsets[term_id], term_offsets[term_id + 1]
+            posting_docs[start:end] = [doc for doc, _ in postings]
+            posting_tfs[start:end] = [tf for _, tf in postings]
+
+        return cls(
+            vocabulary=vocabulary,
+            term_offsets=term_offsets,
+            posting_docs=posting_docs,
+            posting_tfs=posting_tfs,
+            doc_lengths=np.asarray(doc_lengths, dtype=np.float32),
+            ngram_size=ngram_size,
+        )
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """
+        Rank documents by BM25 score for a query.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            Up to k (document_position, score) pairs, best first
+        """
+        if not self.num_docs:
+            return []
+
+        term_ids = {self.vocabulary[gram] for gram in char_ngrams(query, self.ngram_size) if gram in self.vocabulary}
+        if not term_ids:
+            return []
+
+        # Score only the documents in the matched postings, not the whole corpus
+        matched_docs = []
+        contributions = []
+        for term_id in term_ids:
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.posting_docs[start:end]
+            tfs = self.posting_tfs[start:end]
+            matched_docs.append(docs)
+            contributions.append(self._idf[term_id] * tfs * (BM25_K1 + 1) / (tfs + self._length_norm[docs]))
+
+        candidates, slots = np.unique(np.concatenate(matched_docs), return_inverse=True)
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        np.add.at(scores, slots, np.concatenate(contributions))
+
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(candidates[slot]), float(scores[slot])) for slot in top if scores[slot] > 0]
+
+    def save(self, path: Path) -> None:
+        """Write the index to an .npz file atomically (temp file + os.replace)."""
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}.npz")
+        np.savez(
+            tmp_path,
+            vocabulary=np.frombuffer(json.dumps(self.vocabulary, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+            term_offsets=self.term_offsets,
+            posting_docs=self.posting_docs,
+            posting_tfs=self.posting_tfs,
+            doc_lengths=self.doc_lengths,
+            ngram_size=np.asarray([self.ngram_size]),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Load an index written by save()."""
+        with np.load(path) as data:
+            return cls(
+                vocabulary=json.loads(data["vocabulary"].tobytes().decode("utf-8")),
+                term_offsets=data["term_offsets"],
+                posting_docs=data["posting_docs"],
+                posting_tfs=data["posting_tfs"],
+                doc_lengths=data["doc_lengths"],
+                ngram_size=int(data["ngram_size"][0]),
+            )
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int, rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse several rankings of document positions with reciprocal-rank fusion.
+
+    Args:
+        rankings: Each ranking is a list of document positions, best first
+        k: Number of fused results
+        rrf_k: RRF damping constant (60 is the value from the original paper)
+
+    Returns:
+        Up to k (document_position, fused_score) pairs, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking, 1):
+            fused[position] = fused.get(position, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
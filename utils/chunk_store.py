@@ -0,0 +1,105 @@
+"""
+Chunk Store Utility
+
+Compact on-disk storage for knowledge base chunk texts and metadata, keyed by
+FAISS index position. Replaces unpickling the whole LangChain docstore
+(index.pkl) in every process: readers open a read-only SQLite file and fetch
+only the top-k hits' text on demand.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class SQLiteChunkStore:
+    """Read-only chunk lookup backed by an SQLite file (one connection per thread)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        # Open once up front so a missing or corrupt file fails at load time
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path.as_posix()}?mode=ro", uri=True)
+            self._local.connection = connection
+        return connection
+
+    def get_chunks(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch chunks by FAISS index position.
+
+        Args:
+            positions: Index positions returned by a FAISS search
+
+        Returns:
+            One dictionary per position, in the same order, with keys 'text' and 'metadata'
+        """
+        if not positions:
+            return []
+        placeholders = ",".join("?" for _ in positions)
+        rows = self._connection().execute(
+            f"SELECT position, text, metadata FROM chunks WHERE position IN ({placeholders})",
+            [int(p) for p in positions],
+        ).fetchall()
+        by_position = {row[0]: {"text": row[1], "metadata": json.loads(row[2])} for row in rows}
+        return [by_position[int(p)] for p in positions]
+
+
+class DocstoreChunkStore:
+    """Chunk lookup over a LangChain FAISS docstore (for indexes built before SQLite chunk stores)."""
+
+    def __init__(self, vector_store):
+        self._vector_store = vector_store
+
+    def get_chunks(self, positions: List[int]) -> List[Dict[str, Any]]:
+        chunks = []
+        for position in positions:
+            doc_id = self._vector_store.index_to_docstore_id[int(position)]
+            doc = self._vector_store.docstore.search(doc_id)
+            chunks.append({"text": doc.page_content, "metadata": doc.metadata})
+        return chunks
+
+
+def write_chunk_store(path: Path, vector_store) -> None:
+    """
+    Export a LangChain FAISS vector store's docstore to an SQLite chunk store.
+
+    The file is written to a temporary path and swapped in with os.replace(),
+    so readers never open a partially written store.
+
+    Args:
+        path: Destination .sqlite file
+        vector_store: LangChain FAISS vector store whose positions the rows follow
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    tmp_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute(
+            "CREATE TABLE chunks ("
+            "position INTEGER PRIMARY KEY, "
+            "doc_id TEXT NOT NULL, "
+            "text TEXT NOT NULL, "
+            "metadata TEXT NOT NULL)"
+        )
+        rows = []
+        for position, doc_id in sorted(vector_store.index_to_docstore_id.items()):
+            doc = vector_store.docstore.search(doc_id)
+            rows.append((position, doc_id, doc.page_content, json.dumps(doc.metadata, ensure_ascii=False)))
+        connection.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, path)
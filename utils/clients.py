@@ -0,0 +1,255 @@
+"""
+Shared API Client Registry
+
+Long-lived clients for Gemini, Google Cloud Speech-to-Text, Text-to-Speech and
+Translate, and OpenAI. Google service-account credentials are resolved and
+parsed once per process; each client is constructed on first use and reused
+afterwards, so callers no longer re-read credential JSON files or open a new
+gRPC/HTTP channel per call. The underlying clients are thread-safe and are
+shared by API worker threads, Streamlit sessions and job workers.
+
+Without a service-account file the Google Cloud clients use Application
+Default Credentials (GOOGLE_APPLICATION_CREDENTIALS, gcloud auth
+application-default login, or the metadata server on GCP). Every
+get_*_client() returns None when the library is not installed, no API key is
+configured, or no credentials can be found (logged by get_client()),
+matching the callers' existing fallbacks.
+
+Tests swap in local fakes with override_client():
+
+    with override_client("gemini", FakeGeminiClient()):
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_clients: Dict[str, Any] = {}
+_overrides: Dict[str, Any] = {}
+_lock = threading.RLock()
+_credentials: Any = _MISSING
+
+
+def _resolve_path(path: str) -> Path:
+    resolved = Path(path)
+    return resolved if resolved.is_absolute() else project_root / resolved
+
+
+def resolve_google_credentials_path() -> Optional[Path]:
+    """
+    Find the Google service-account JSON file.
+
+    Checked in order: GOOGLE_APPLICATION_CREDENTIALS from .env,
+    GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH, google_creds.json in the project
+    root, then the GOOGLE_APPLICATION_CREDENTIALS environment variable.
+
+    Returns:
+        Path to an existing credentials file, or None
+    """
+    candidates = [
+        config.GOOGLE_APPLICATION_CREDENTIALS,
+        config.GOOGLE_CLOUD_TRANSLATE_CREDENTIALS_PATH,
+        "google_creds.json",
+        os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", ""),
+    ]
+    for candidate in candidates:
+        if candidate and _resolve_path(candidate).exists():
+            return _resolve_path(candidate)
+    return None
+
+
+def get_google_credentials() -> Any:
+    """
+    Parse the service-account credentials once per process.
+
+    Returns:
+        google.oauth2 service-account Credentials, or None to use the
+        library's default credential discovery
+    """
+    global _credentials
+    if _credentials is not _MISSING:
+        return _credentials
+
+    with _lock:
+        if _credentials is _MISSING:
+            credentials = None
+            creds_path = resolve_google_credentials_path()
+            if creds_path is not None:
+                try:
+                    from google.oauth2 import service_account
+
+                    credentials = service_account.Credentials.from_service_account_file(str(creds_path))
+                    # Libraries that discover credentials on their own find the same file
+                    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", str(creds_path))
+                except Exception as e:
+                    logger.warning(f"Failed to load Google credentials from {creds_path}: {e}")
+            _credentials = credentials
+    return _credentials
+
+
+def get_google_project_id() -> Optional[str]:
+    """Project ID from the service-account file (or config), for error messages."""
+    credentials = get_google_credentials()
+    project_id = getattr(credentials, "project_id", None)
+    if project_id:
+        return project_id
+    creds_path = resolve_google_credentials_path()
+    if creds_path is not None:
+        try:
+            with open(creds_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("project_id")
+        except (OSError, ValueError):
+            pass
+    return config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID or None
+
+
+def _create_gemini_client() -> Any:
+    if not config.GEMINI_API_KEY:
+        return None
+    from google import genai
+
+    return genai.Client(api_key=config.GEMINI_API_KEY)
+
+
+def _create_speech_client() -> Any:
+    from google.cloud import speech
+
+    credentials = get_google_credentials()
+    if credentials is not None:
+        return speech.SpeechClient(credentials=credentials)
+    # Application Default Credentials (env var, gcloud login, or the GCE/Cloud Run metadata server)
+    return speech.SpeechClient()
+
+
+def _create_tts_client() -> Any:
+    from google.cloud import texttospeech
+
+    credentials = get_google_credentials()
+    if credentials is not None:
+        return texttospeech.TextToSpeechClient(credentials=credentials)
+    return texttospeech.TextToSpeechClient()
+
+
+def _create_translate_client() -> Any:
+    from google.cloud import translate_v2 as translate
+
+    credentials = get_google_credentials()
+    if credentials is not None:
+        return translate.Client(credentials=credentials)
+    return translate.Client(project=config.GOOGLE_CLOUD_TRANSLATE_PROJECT_ID or None)
+
+
+def _create_openai_client() -> Any:
+    if not config.OPENAI_API_KEY:
+        return None
+    from openai import OpenAI
+
+    return OpenAI(api_key=config.OPENAI_API_KEY)
+
+
+CLIENT_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "gemini": _create_gemini_client,
+    "speech": _create_speech_client,
+    "tts": _create_tts_client,
+    "translate": _create_translate_client,
+    "openai": _create_openai_client,
+}
+
+
+def get_client(name: str) -> Any:
+    """
+    Return the shared client for a service, creating it on first use.
+
+    Args:
+        name: One of CLIENT_FACTORIES ("gemini", "speech", "tts", "translate", "openai")
+
+    Returns:
+        The client, or None if the library or credentials are unavailable
+        (an unavailable client is retried on the next call)
+    """
+    if name in _overrides:
+        return _overrides[name]
+    client = _clients.get(name)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            try:
+                client = CLIENT_FACTORIES[name]()
+            except ImportError:
+                client = None
+            except Exception as e:
+                logger.warning(f"Failed to initialize {name} client: {e}")
+                client = None
+            if client is not None:
+                _clients[name] = client
+    return client
+
+
+def get_gemini_client() -> Any:
+    """Shared google-genai client (None without GEMINI_API_KEY)."""
+    return get_client("gemini")
+
+
+def get_speech_client() -> Any:
+    """Shared Google Cloud Speech-to-Text client."""
+    return get_client("speech")
+
+
+def get_tts_client() -> Any:
+    """Shared Google Cloud Text-to-Speech client."""
+    return get_client("tts")
+
+
+def get_translate_client() -> Any:
+    """Shared Google Cloud Translate (v2) client."""
+    return get_client("translate")
+
+
+def get_openai_client() -> Any:
+    """Shared OpenAI client (None without OPENAI_API_KEY)."""
+    return get_client("openai")
+
+
+@contextmanager
+def override_client(name: str, client: Any) -> Iterator[Any]:
+    """Serve `client` (e.g. a local fake) for a service within the block."""
+    if name not in CLIENT_FACTORIES:
+        raise ValueError(f"Unknown client: {name}. Available: {', '.join(sorted(CLIENT_FACTORIES))}")
+    previous = _overrides.get(name, _MISSING)
+    _overrides[name] = client
+    try:
+        yield client
+    finally:
+        if previous is _MISSING:
+            _overrides.pop(name, None)
+        else:
+            _overrides[name] = previous
+
+
+def reset_clients() -> None:
+    """Drop cached clients and credentials (e.g. after rotating keys, or between tests)."""
+    global _credentials
+    with _lock:
+        _clients.clear()
+        _credentials = _MISSING
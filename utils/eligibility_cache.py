@@ -0,0 +1,68 @@
+"""
+Phase 2 Eligibility Cache
+
+In-process TTL cache of each candidate's travel_ready flag, so API requests can
+skip the candidates lookup in check_phase_2_eligibility(). Writers that change
+travel_ready or status (ComplianceChecker.auto_update_compliance,
+UpdateCandidateStatus) call invalidate_eligibility() after committing.
+
+The cache is per process. Changes committed by another process (e.g. the
+dashboard) become visible to the API once the TTL expires, so keep
+ELIGIBILITY_CACHE_TTL_SECONDS short.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent.resolve())
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from utils.lru_cache import LRUCache
+
+# Cached value: (candidate_exists, travel_ready)
+_eligibility_cache = LRUCache(
+    maxsize=config.ELIGIBILITY_CACHE_SIZE,
+    ttl_seconds=config.ELIGIBILITY_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_eligibility(candidate_id: str) -> Optional[Tuple[bool, bool]]:
+    """
+    Look up a candidate's cached eligibility state.
+
+    Returns:
+        (candidate_exists, travel_ready), or None on a miss or when caching is disabled
+    """
+    if config.ELIGIBILITY_CACHE_TTL_SECONDS <= 0:
+        return None
+    return _eligibility_cache.get(candidate_id)
+
+
+def cache_eligibility(candidate_id: str, candidate_exists: bool, travel_ready: bool) -> None:
+    """Store the eligibility state read from the database for a candidate."""
+    if config.ELIGIBILITY_CACHE_TTL_SECONDS <= 0:
+        return
+    _eligibility_cache.set(candidate_id, (candidate_exists, bool(travel_ready)))
+
+
+def invalidate_eligibility(candidate_id: Optional[str] = None) -> None:
+    """
+    Drop a candidate's cached eligibility (or the whole cache if candidate_id is None).
+
+    Call after committing any change to a candidate's travel_ready or status.
+    """
+    if candidate_id is None:
+        _eligibility_cache.clear()
+    else:
+        _eligibility_cache.delete(candidate_id)
+
+
+def get_eligibility_cache_stats() -> dict:
+    """Return cache size and hit/miss counters (see LRUCache.stats())."""
+    return _eligibility_cache.stats()
@@ -0,0 +1,184 @@
+"""
+HLS Packaging Utility
+
+Transcodes lesson MP4s into adaptive-bitrate HLS renditions with a local
+ffmpeg, so learners on slow mobile links get a stream that fits their
+bandwidth instead of the original file.
+
+For static/videos/academic/lang_n3_keigo.mp4 the output sits next to the
+source:
+
+    static/videos/academic/lang_n3_keigo_hls/
+        master.m3u8            variant playlist (one entry per rendition)
+        360p/index.m3u8, 360p/seg_000.ts, ...
+        540p/...
+        720p/...
+        source.sha256          hash of the MP4 the renditions were made from
+
+Packaging is incremental: a video whose hash matches source.sha256 is
+skipped. Renditions taller than the source are not produced. Output is
+built in a temporary directory and swapped in at the end, so players never
+see a half-written package.
+
+Run it with: python scripts/package_hls.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Rendition ladder: name, height, video bitrate (kbit/s), audio bitrate (kbit/s)
+HLS_RENDITIONS: List[Dict] = [
+    {"name": "360p", "height": 360, "video_kbps": 800, "audio_kbps": 96},
+    {"name": "540p", "height": 540, "video_kbps": 1400, "audio_kbps": 128},
+    {"name": "720p", "height": 720, "video_kbps": 2800, "audio_kbps": 128},
+]
+
+HLS_SEGMENT_SECONDS = 6
+MASTER_PLAYLIST = "master.m3u8"
+SOURCE_HASH_FILE = "source.sha256"
+
+
+def hls_dir_for(video_path: Path) -> Path:
+    """Directory holding the HLS package of a video (<stem>_hls next to the source)."""
+    video_path = Path(video_path)
+    return video_path.with_name(f"{video_path.stem}_hls")
+
+
+def hls_manifest_for(video_path: Path) -> Optional[Path]:
+    """Master playlist of a packaged video, or None if it has not been packaged."""
+    manifest = hls_dir_for(video_path) / MASTER_PLAYLIST
+    return manifest if manifest.is_file() else None
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_up_to_date(video_path: Path, source_hash: Optional[str] = None) -> bool:
+    """True if the HLS package exists and was built from the current source file."""
+    hls_dir = hls_dir_for(video_path)
+    hash_file = hls_dir / SOURCE_HASH_FILE
+    if not (hls_dir / MASTER_PLAYLIST).is_file() or not hash_file.is_file():
+        return False
+    return hash_file.read_text(encoding="utf-8").strip() == (source_hash or file_sha256(video_path))
+
+
+def probe_video_size(video_path: Path) -> Tuple[int, int]:
+    """(width, height) of the first video stream, via ffprobe."""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=width,height", "-of", "json", str(video_path),
+        ],
+        capture_output=True, text=True, check=True,
+    )
+    stream = json.loads(result.stdout)["streams"][0]
+    return int(stream["width"]), int(stream["height"])
+
+
+def select_renditions(source_height: int) -> List[Dict]:
+    """Renditions no taller than the source (a source below the ladder gets one rendition at its own height)."""
+    renditions = [rendition for rendition in HLS_RENDITIONS if rendition["height"] <= source_height]
+    return renditions or [{**HLS_RENDITIONS[0], "height": max(2, source_height - source_height % 2)}]
+
+
+def _scaled_width(source_width: int, source_height: int, height: int) -> int:
+    """Width matching the source aspect ratio, rounded to an even number for H.264."""
+    return max(2, int(round(source_width * height / source_height / 2)) * 2)
+
+
+def render_master_playlist(renditions: List[Dict], source_width: int, source_height: int) -> str:
+    """Variant playlist listing each rendition's bandwidth, resolution and media playlist."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in renditions:
+        height = rendition["height"]
+        bandwidth = (rendition["video_kbps"] + rendition["audio_kbps"]) * 1000
+        lines.append(
+            f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},"
+            f"RESOLUTION={_scaled_width(source_width, source_height, height)}x{height},"
+            f'CODECS="avc1.4d401f,mp4a.40.2"'
+        )
+        lines.append(f"{rendition['name']}/index.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+def _transcode_rendition(video_path: Path, output_dir: Path, rendition: Dict, threads: int) -> None:
+    """Run ffmpeg for one rendition (keyframes every 2 s so segments align across renditions)."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    video_kbps = rendition["video_kbps"]
+    subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", str(video_path),
+            "-threads", str(threads),
+            "-vf", f"scale=-2:{rendition['height']}",
+            "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+            "-b:v", f"{video_kbps}k", "-maxrate", f"{int(video_kbps * 1.07)}k", "-bufsize", f"{video_kbps * 2}k",
+            "-force_key_frames", "expr:gte(t,n_forced*2)", "-sc_threshold", "0",
+            "-c:a", "aac", "-b:a", f"{rendition['audio_kbps']}k", "-ac", "2",
+            "-hls_time", str(HLS_SEGMENT_SECONDS),
+            "-hls_playlist_type", "vod",
+            "-hls_segment_filename", str(output_dir / "seg_%03d.ts"),
+            str(output_dir / "index.m3u8"),
+        ],
+        capture_output=True, text=True, check=True,
+    )
+
+
+def package_video(video_path: Path, force: bool = False, threads: int = 0) -> str:
+    """
+    Package one video as HLS, unless its current package is up to date.
+
+    Args:
+        video_path: Source MP4
+        force: Re-encode even if the source hash is unchanged
+        threads: ffmpeg threads per rendition (0 lets ffmpeg decide)
+
+    Returns:
+        "skipped" or "packaged"
+
+    Raises:
+        FileNotFoundError: If ffmpeg/ffprobe is not installed
+        subprocess.CalledProcessError: If ffmpeg fails (the old package is kept)
+    """
+    video_path = Path(video_path)
+    source_hash = file_sha256(video_path)
+    if not force and is_up_to_date(video_path, source_hash):
+        return "skipped"
+
+    source_width, source_height = probe_video_size(video_path)
+    renditions = select_renditions(source_height)
+
+    hls_dir = hls_dir_for(video_path)
+    build_dir = hls_dir.with_name(f"{hls_dir.name}.tmp")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    try:
+        for rendition in renditions:
+            _transcode_rendition(video_path, build_dir / rendition["name"], rendition, threads)
+        (build_dir / MASTER_PLAYLIST).write_text(
+            render_master_playlist(renditions, source_width, source_height), encoding="utf-8"
+        )
+        (build_dir / SOURCE_HASH_FILE).write_text(source_hash + "\n", encoding="utf-8")
+
+        shutil.rmtree(hls_dir, ignore_errors=True)
+        build_dir.rename(hls_dir)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    return "packaged"
@@ -0,0 +1,450 @@
+"""
+Background Job Queue Utility
+
+Durable queue for long-running work (PDF reports, grading, translation,
+wisdom reports) backed by the background_jobs table, so request handlers and
+Streamlit reruns can enqueue work and poll for the result instead of blocking.
+
+Workers (scripts/run_job_worker.py) claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes can poll
+the same table without handing out a job twice. Failed jobs are retried with
+exponential backoff until max_attempts. No external broker is required.
+
+Payloads stay small: each job type declares the keys it accepts, and audio
+for language_coaching jobs is spooled to JOB_UPLOAD_DIR (shared by the API and
+the workers) with only its path in the payload. The file is deleted once the
+job has succeeded or run out of attempts.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent.resolve())
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from database.db_manager import BackgroundJob, session_scope
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# job_type -> handler(payload) returning a JSON-serializable result
+JOB_HANDLERS: Dict[str, Callable[[dict], Any]] = {}
+
+# job_type -> (required payload keys, optional payload keys)
+JOB_PAYLOAD_FIELDS: Dict[str, Tuple[frozenset, frozenset]] = {}
+
+
+def job_handler(job_type: str, required: Iterable[str] = (), optional: Iterable[str] = ()):
+    """Register a function as the handler for a job type and declare its payload keys."""
+    def decorator(func: Callable[[dict], Any]) -> Callable[[dict], Any]:
+        JOB_HANDLERS[job_type] = func
+        JOB_PAYLOAD_FIELDS[job_type] = (frozenset(required), frozenset(optional))
+        return func
+    return decorator
+
+
+def validate_job_payload(job_type: str, payload: dict) -> None:
+    """
+    Check a payload against the keys its job type declares.
+
+    Raises:
+        ValueError: If a required key is missing, a key is unknown, or
+            audio_path points outside JOB_UPLOAD_DIR
+    """
+    if job_type not in JOB_PAYLOAD_FIELDS:
+        return
+    required, optional = JOB_PAYLOAD_FIELDS[job_type]
+    missing = sorted(key for key in required if payload.get(key) in (None, ""))
+    if missing:
+        raise ValueError(f"{job_type} jobs need {', '.join(missing)} in the payload.")
+    unknown = sorted(set(payload) - required - optional)
+    if unknown:
+        raise ValueError(f"Unknown payload keys for {job_type} jobs: {', '.join(unknown)}")
+    if "audio_path" in payload:
+        job_upload_path(payload)
+
+
+def get_job_upload_dir() -> Path:
+    """Directory for audio spooled for jobs (JOB_UPLOAD_DIR, relative to the project root)."""
+    upload_dir = Path(config.JOB_UPLOAD_DIR)
+    return upload_dir if upload_dir.is_absolute() else Path(project_root) / upload_dir
+
+
+def job_upload_path(payload: dict) -> Optional[Path]:
+    """
+    The spooled upload a payload refers to, or None.
+
+    Raises:
+        ValueError: If audio_path is outside JOB_UPLOAD_DIR
+    """
+    if not payload.get("audio_path"):
+        return None
+    upload_dir = get_job_upload_dir().resolve()
+    path = Path(payload["audio_path"]).resolve()
+    if path.parent != upload_dir:
+        raise ValueError("audio_path must be a file in JOB_UPLOAD_DIR.")
+    return path
+
+
+def _remove_job_upload(payload: Optional[dict]) -> None:
+    """Delete a finished job's spooled upload (if any)."""
+    try:
+        path = job_upload_path(payload or {})
+    except ValueError:
+        return
+    if path is not None:
+        path.unlink(missing_ok=True)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime (matches the DateTime columns)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _job_to_dict(job: BackgroundJob) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "payload": job.payload,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Backoff before the next attempt: JOB_RETRY_BASE_SECONDS * 2^(attempts-1), capped at one hour."""
+    return min(config.JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), MAX_RETRY_DELAY_SECONDS)
+
+
+def enqueue_job(job_type: str, payload: dict, max_attempts: Optional[int] = None, delay_seconds: float = 0) -> int:
+    """
+    Add a job to the queue.
+
+    Args:
+        job_type: Registered job type (see JOB_HANDLERS)
+        payload: JSON-serializable handler arguments (keys declared in JOB_PAYLOAD_FIELDS)
+        max_attempts: Attempts before the job is marked failed (default: config.JOB_MAX_ATTEMPTS)
+        delay_seconds: Do not run the job before this many seconds from now
+
+    Returns:
+        Job ID
+
+    Raises:
+        ValueError: If job_type has no registered handler or the payload is invalid
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}. Available: {', '.join(sorted(JOB_HANDLERS))}")
+    validate_job_payload(job_type, payload)
+
+    with session_scope() as db:
+        job = BackgroundJob(
+            job_type=job_type,
+            payload=payload,
+            status="queued",
+            max_attempts=max_attempts or config.JOB_MAX_ATTEMPTS,
+            run_after=_utcnow() + timedelta(seconds=delay_seconds),
+        )
+        db.add(job)
+        db.flush()
+        return job.id
+
+
+def get_job(job_id: int) -> Optional[dict[str, Any]]:
+    """Return a job's status, result and error, or None if it does not exist."""
+    with session_scope() as db:
+        job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+        return _job_to_dict(job) if job else None
+
+
+def claim_next_job(worker_id: str) -> Optional[dict[str, Any]]:
+    """
+    Claim the oldest runnable queued job for a worker.
+
+    Uses FOR UPDATE SKIP LOCKED (ignored on SQLite), so concurrent workers
+    skip rows another worker is claiming instead of waiting on them.
+
+    Returns:
+        The claimed job (now 'running'), or None if nothing is runnable
+    """
+    now = _utcnow()
+    with session_scope() as db:
+        job = (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.status == "queued", BackgroundJob.run_after <= now)
+            .order_by(BackgroundJob.run_after, BackgroundJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = now
+        job.locked_by = worker_id
+        db.flush()
+        return _job_to_dict(job)
+
+
+def _owned_running_job(db, job_id: int, worker_id: str) -> Optional[BackgroundJob]:
+    """The job if it is still running under this worker's claim, else None."""
+    return (
+        db.query(BackgroundJob)
+        .filter(
+            BackgroundJob.id == job_id,
+            BackgroundJob.status == "running",
+            BackgroundJob.locked_by == worker_id,
+        )
+        .with_for_update()
+        .first()
+    )
+
+
+def complete_job(job_id: int, worker_id: str, result: Any) -> bool:
+    """
+    Mark a job succeeded and store its result.
+
+    Only the worker holding the claim can finish the job. If the job was
+    re-queued as stale and claimed by another worker meanwhile, the result is
+    dropped. The job's spooled upload is deleted.
+
+    Returns:
+        True if the result was recorded
+    """
+    with session_scope() as db:
+        job = _owned_running_job(db, job_id, worker_id)
+        if job is None:
+            logger.warning(f"Worker {worker_id} no longer holds job {job_id}; dropping its result")
+            return False
+        job.status = "succeeded"
+        job.result = result
+        job.error = None
+        job.locked_by = None
+        job.finished_at = _utcnow()
+        payload = job.payload
+    _remove_job_upload(payload)
+    return True
+
+
+def fail_job(job_id: int, worker_id: str, error: str) -> bool:
+    """
+    Record a failed attempt.
+
+    The job is re-queued with exponential backoff while attempts remain,
+    otherwise it is marked failed and its spooled upload is deleted. Like
+    complete_job(), only the worker holding the claim can record the outcome.
+
+    Returns:
+        True if the failure was recorded
+    """
+    with session_scope() as db:
+        job = _owned_running_job(db, job_id, worker_id)
+        if job is None:
+            logger.warning(f"Worker {worker_id} no longer holds job {job_id}; dropping its error: {error}")
+            return False
+        job.error = error
+        job.locked_by = None
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.run_after = _utcnow() + timedelta(seconds=retry_delay_seconds(job.attempts))
+            return True
+        job.status = "failed"
+        job.finished_at = _utcnow()
+        payload = job.payload
+    _remove_job_upload(payload)
+    return True
+
+
+def requeue_stale_jobs(timeout_seconds: Optional[float] = None) -> int:
+    """
+    Recover jobs left 'running' by a worker that died.
+
+    Returns:
+        Number of jobs re-queued or failed
+    """
+    timeout_seconds = timeout_seconds if timeout_seconds is not None else config.JOB_TIMEOUT_SECONDS
+    cutoff = _utcnow() - timedelta(seconds=timeout_seconds)
+    failed_payloads = []
+    with session_scope() as db:
+        stale_jobs = (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.status == "running", BackgroundJob.started_at < cutoff)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for job in stale_jobs:
+            job.error = f"Worker {job.locked_by} did not finish within {timeout_seconds:.0f}s"
+            job.locked_by = None
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.run_after = _utcnow()
+            else:
+                job.status = "failed"
+                job.finished_at = _utcnow()
+                failed_payloads.append(job.payload)
+        requeued = len(stale_jobs)
+    for payload in failed_payloads:
+        _remove_job_upload(payload)
+    return requeued
+
+
+def run_job(job: dict[str, Any], worker_id: str) -> None:
+    """Execute a job claimed by worker_id with its handler and record the outcome."""
+    handler = JOB_HANDLERS.get(job["job_type"])
+    if handler is None:
+        fail_job(job["job_id"], worker_id, f"No handler registered for job type {job['job_type']}")
+        return
+
+    try:
+        result = handler(job["payload"] or {})
+    except Exception as e:
+        logger.warning(f"Job {job['job_id']} ({job['job_type']}) attempt {job['attempts']} failed: {e}")
+        fail_job(job["job_id"], worker_id, str(e))
+        return
+    complete_job(job["job_id"], worker_id, result)
+
+
+def run_worker(
+    worker_id: Optional[str] = None,
+    poll_interval: Optional[float] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """
+    Claim and run jobs until stop_event is set.
+
+    Args:
+        worker_id: Name recorded on claimed jobs (default: host:pid)
+        poll_interval: Seconds to sleep when the queue is empty
+        stop_event: Event that ends the loop (default: run forever)
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    poll_interval = poll_interval if poll_interval is not None else config.JOB_POLL_INTERVAL_SECONDS
+    stop_event = stop_event or threading.Event()
+    last_stale_check = 0.0
+
+    while not stop_event.is_set():
+        try:
+            if time.monotonic() - last_stale_check > 60:
+                requeue_stale_jobs()
+                last_stale_check = time.monotonic()
+
+            job = claim_next_job(worker_id)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not poll the job queue: {e}")
+            stop_event.wait(poll_interval * 5)
+            continue
+
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        run_job(job, worker_id)
+
+
+def wait_for_job(job_id: int, timeout_seconds: float = 300, poll_interval: float = 1.0) -> Optional[dict[str, Any]]:
+    """
+    Poll until a job succeeds or fails (for callers that want a blocking wait).
+
+    Returns:
+        The finished job, or the latest job state if the timeout expires
+    """
+    deadline = time.monotonic() + timeout_seconds
+    job = get_job(job_id)
+    while job and job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        job = get_job(job_id)
+    return job
+
+
+# ---------------------------------------------------------------------------
+# Job handlers (heavy dependencies are imported when a job runs)
+# ---------------------------------------------------------------------------
+
+@job_handler("performance_report", required=("candidate_id",), optional=("mastery_scores_override",))
+def _performance_report_job(payload: dict) -> dict:
+    """Generate a candidate's PDF performance report."""
+    from agency.training_agent.report_generator import GeneratePerformanceReport
+
+    result = GeneratePerformanceReport(
+        candidate_id=payload["candidate_id"],
+        mastery_scores_override=payload.get("mastery_scores_override"),
+    ).run()
+    if result.startswith("Error") or "Report saved to:" not in result:
+        raise RuntimeError(result)
+    return {"message": result}
+
+
+@job_handler(
+    "language_coaching",
+    required=("candidate_id", "audio_path"),
+    optional=("language_code", "question_id", "expected_answer"),
+)
+def _language_coaching_job(payload: dict) -> dict:
+    """Transcribe and grade a recorded answer spooled to JOB_UPLOAD_DIR."""
+    from agency.training_agent.language_coaching_tool import LanguageCoachingTool
+
+    result = LanguageCoachingTool(
+        candidate_id=payload["candidate_id"],
+        audio_bytes=job_upload_path(payload).read_bytes(),
+        language_code=payload.get("language_code", "ja-JP"),
+        question_id=payload.get("question_id"),
+        expected_answer=payload.get("expected_answer"),
+    ).run_structured()
+    if not result.success:
+        raise RuntimeError(result.error)
+    return result.to_dict()
+
+
+TRANSLATION_LANGUAGES = {"ne": "Nepali (नेपाली)", "ja": "Japanese (日本語)", "en": "English"}
+
+
+@job_handler("translation", required=("text",), optional=("target_language", "candidate_id"))
+def _translation_job(payload: dict) -> dict:
+    """Translate text (e.g. a lesson transcript) with Gemini."""
+    from utils.clients import get_gemini_client
+
+    client = get_gemini_client()
+    if client is None:
+        raise RuntimeError("GEMINI_API_KEY not configured.")
+
+    target_language = payload.get("target_language", "ne")
+    language_name = TRANSLATION_LANGUAGES.get(target_language, target_language)
+    prompt = f"""
+Translate the following English text to {language_name}.
+Keep technical terms and proper nouns in their original form if commonly used.
+Return only the translation, no explanations.
+
+English text:
+{payload["text"]}"""
+
+    response = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+    return {"target_language": target_language, "translated_text": response.text.strip()}
+
+
+@job_handler("wisdom_report", optional=("date", "candidate_id"))
+def _wisdom_report_job(payload: dict) -> dict:
+    """Refresh the daily wisdom snapshot."""
+    from agency.operations_agent.wisdom_snapshot import refresh_wisdom_snapshot
+
+    snapshot = refresh_wisdom_snapshot(payload.get("date"))
+    return {"report_date": snapshot["report_date"], "etag": snapshot["etag"]}
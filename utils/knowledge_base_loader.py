@@ -7,12 +7,17 @@ This module provides functions to:
 - Scan knowledge_base/ directory for PDF, TXT, and MD files
 - Load document content for RAG processing
 - Prepare documents for vector store indexing
+- Stream chunks from many documents in parallel for bounded-memory ingestion
 """
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
 import sys
 
 # Add project root to path
@@ -91,6 +96,239 @@ def load_document_content(file_path: Path) -> Optional[str]:
         return None
 
 
+# Chunking settings shared by every ingestion path
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+CHUNK_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+# Documents are parsed in parts so no worker result holds a whole large file:
+# PDFs in runs of pages, TXT/MD in byte segments ending at a line break
+PDF_PAGES_PER_PART = 32
+TEXT_BYTES_PER_PART = 1024 * 1024
+
+DocumentPart = Tuple[str, int, Optional[int]]  # (path, start, stop): page indexes for PDFs, byte offsets otherwise
+Chunk = Tuple[str, Dict[str, Any], str]  # (text, metadata, chunk_id)
+
+
+def _pdf_page_count(file_path: Path) -> Optional[int]:
+    """Number of pages in a PDF, or None if it cannot be opened here."""
+    try:
+        import fitz  # PyMuPDF
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+def _text_part_offsets(file_path: Path, part_bytes: int) -> List[int]:
+    """Byte offsets splitting a text file into ~part_bytes segments at line breaks (UTF-8 safe)."""
+    size = file_path.stat().st_size
+    offsets = [0]
+    with open(file_path, "rb") as f:
+        while offsets[-1] + part_bytes < size:
+            f.seek(offsets[-1] + part_bytes)
+            f.readline()  # Finish the current line
+            if f.tell() >= size:
+                break
+            offsets.append(f.tell())
+    return offsets
+
+
+def split_document(file_path: Path) -> List[DocumentPart]:
+    """
+    Split a document into independently parsable parts.
+    
+    Args:
+        file_path: Path to the document file
+        
+    Returns:
+        List of (path, start, stop) parts in document order; stop None means "to the end"
+    """
+    path_str = str(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix == '.pdf':
+        page_count = _pdf_page_count(file_path)
+        if not page_count:
+            return [(path_str, 0, None)]  # iter_document_pages() reports the problem
+        return [
+            (path_str, first, min(first + PDF_PAGES_PER_PART, page_count))
+            for first in range(0, page_count, PDF_PAGES_PER_PART)
+        ]
+    if suffix in ['.txt', '.md']:
+        try:
+            offsets = _text_part_offsets(file_path, TEXT_BYTES_PER_PART)
+        except OSError:
+            return [(path_str, 0, None)]
+        return [(path_str, start, stop) for start, stop in zip(offsets, offsets[1:] + [None])]
+    return [(path_str, 0, None)]
+
+
+def iter_document_pages(file_path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Stream text out of a document (or one part of it) one page at a time.
+    
+    PDFs are read page by page from PyMuPDF so the whole document is never
+    held in memory; a TXT/MD segment is yielded as a single page.
+    
+    Args:
+        file_path: Path to the document file
+        start: First page index (PDF) or byte offset (TXT/MD)
+        stop: End page index or byte offset (exclusive), None for the end of the file
+        
+    Yields:
+        (page_number, text) for non-empty pages; page numbers are 1-based PDF pages (1 for TXT/MD)
+    """
+    suffix = file_path.suffix.lower()
+    try:
+        if suffix == '.pdf':
+            try:
+                import fitz  # PyMuPDF
+            except ImportError:
+                print(f"[WARN] PyMuPDF not available. Cannot read PDF: {file_path.name}")
+                return
+            with fitz.open(file_path) as doc:
+                for page_index in range(start, doc.page_count if stop is None else min(stop, doc.page_count)):
+                    text = doc[page_index].get_text()
+                    if text.strip():
+                        yield page_index + 1, text
+        elif suffix in ['.txt', '.md']:
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                data = f.read() if stop is None else f.read(stop - start)
+            text = data.decode('utf-8')
+            if text.strip():
+                yield 1, text
+        else:
+            print(f"[WARN] Unsupported file format: {file_path.suffix}")
+    except Exception as e:
+        print(f"[ERROR] Error loading document {file_path.name}: {e}")
+
+
+def _chunk_part_job(part: DocumentPart) -> List[Tuple[str, int]]:
+    """
+    Process-pool entry point: split one document part into (text, page_number) chunks.
+    
+    Uses the shared RecursiveCharacterTextSplitter settings. Chunks never span
+    pages (or TXT/MD segments), so each keeps the page it came from.
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        length_function=len,
+        separators=CHUNK_SEPARATORS
+    )
+    path_str, start, stop = part
+    return [
+        (chunk, page_number)
+        for page_number, page_text in iter_document_pages(Path(path_str), start, stop)
+        for chunk in text_splitter.split_text(page_text)
+    ]
+
+
+def iter_knowledge_base_chunks(
+    file_hashes: Dict[Path, str],
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, List[Chunk], bool]]:
+    """
+    Parse and chunk documents in parallel, yielding chunks part by part in document order.
+    
+    Each document is split into parts (runs of PDF pages, TXT/MD segments)
+    that are parsed in a process pool, so PDF parsing scales with cores. Only
+    a bounded window of parts is in flight at once, so memory depends on the
+    part size and worker count, not on the size of any file or of the corpus.
+    
+    Chunk IDs embed the content hash, so a changed file never collides with
+    vectors from its previous version.
+    
+    Args:
+        file_hashes: Mapping of document path -> content hash
+        workers: Number of worker processes (default: CPU count; 1 = in-process)
+        
+    Yields:
+        (file_name, [(text, metadata, chunk_id), ...], file_done) per part;
+        file_done is True on a document's last part
+    """
+    parts: List[Tuple[Path, str, DocumentPart, bool]] = []
+    for path, content_hash in file_hashes.items():
+        document_parts = split_document(path)
+        for i, part in enumerate(document_parts):
+            parts.append((path, content_hash, part, i == len(document_parts) - 1))
+    workers = workers or os.cpu_count() or 1
+    
+    def _results() -> Iterator[List[Tuple[str, int]]]:
+        if workers <= 1 or len(parts) <= 1:
+            for _, _, part, _ in parts:
+                yield _chunk_part_job(part)
+            return
+        # Keep at most two parts per worker in flight so finished results cannot
+        # pile up faster than the consumer embeds them
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(max_workers=min(workers, len(parts))) as executor:
+            pending = deque()
+            for _, _, part, _ in parts:
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(_chunk_part_job, part))
+            while pending:
+                yield pending.popleft().result()
+    
+    chunk_index = 0
+    for (path, content_hash, _, file_done), part_chunks in zip(parts, _results()):
+        chunks = []
+        for text, page_number in part_chunks:
+            metadata = {
+                'source': path.name,
+                'source_path': str(path),
+                'source_type': path.suffix.lower(),
+                'chunk_index': chunk_index,
+                'page_number': page_number,
+            }
+            chunks.append((text, metadata, f"{path.name}#{content_hash[:16]}#{chunk_index}"))
+            chunk_index += 1
+        yield path.name, chunks, file_done
+        if file_done:
+            chunk_index = 0
+
+
+def chunk_document(file_path: Path, content_hash: str) -> List[Chunk]:
+    """
+    Chunk a whole document in this process (see iter_knowledge_base_chunks for large corpora).
+    
+    Args:
+        file_path: Path to the document file
+        content_hash: Hash of the file's bytes (used in chunk IDs)
+        
+    Returns:
+        List of (text, metadata, chunk_id) tuples
+    """
+    return [
+        chunk
+        for _, chunks, _ in iter_knowledge_base_chunks({file_path: content_hash}, workers=1)
+        for chunk in chunks
+    ]
+
+
+def batched(iterable: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Group an iterable into lists of at most batch_size items.
+    
+    Args:
+        iterable: Items to group
+        batch_size: Maximum items per batch
+        
+    Yields:
+        Lists of items
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 def get_all_documents() -> List[Dict[str, str]]:
     """
     Get all documents from knowledge_base/ with their content.
@@ -0,0 +1,180 @@
+"""
+Media File Utility
+
+Maps lesson and intro videos to URLs on the API's /media endpoint and
+implements the HTTP details it needs: ETags and single byte-range requests.
+
+Pages reference videos by URL (see media_url()) instead of inlining them as
+base64 or pushing the whole file through the Streamlit websocket. The browser
+downloads each video once, revalidates it with If-None-Match, and seeks with
+Range requests without a full download.
+
+Served roots (URL prefix -> directory):
+    /media/static/...  -> static/videos
+    /media/app/...     -> app/static/videos
+    /media/assets/...  -> assets/videos
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import config
+
+MEDIA_ROOTS = {
+    "static": project_root / "static" / "videos",
+    "app": project_root / "app" / "static" / "videos",
+    "assets": project_root / "assets" / "videos",
+}
+
+# Read size for streamed responses
+MEDIA_CHUNK_SIZE = 256 * 1024
+
+# HLS packages (see utils/hls.py); system MIME tables often map .ts to TypeScript/Qt sources
+HLS_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+
+# Request headers a cross-origin player may send (allowed in preflight responses)
+MEDIA_CORS_REQUEST_HEADERS = "Range, If-None-Match, If-Modified-Since, If-Range"
+# Response headers hls.js reads from XHR/fetch responses
+MEDIA_CORS_EXPOSED_HEADERS = "Accept-Ranges, Content-Range, Content-Length, ETag"
+
+
+class RangeNotSatisfiable(ValueError):
+    """The Range header cannot be satisfied for a file of this size (HTTP 416)."""
+
+
+def resolve_media_path(root: str, relative_path: str) -> Optional[Path]:
+    """
+    Resolve a /media URL path to a file inside one of MEDIA_ROOTS.
+
+    Args:
+        root: Root name ("static", "app" or "assets")
+        relative_path: Path below the root, as it appears in the URL
+
+    Returns:
+        Absolute path of an existing file, or None (unknown root, missing
+        file, or a path that escapes the root)
+    """
+    base = MEDIA_ROOTS.get(root)
+    if base is None:
+        return None
+    base = base.resolve()
+    path = (base / relative_path).resolve()
+    if path != base and base not in path.parents:
+        return None
+    return path if path.is_file() else None
+
+
+def media_url(path: Path) -> Optional[str]:
+    """
+    URL of a video on the media endpoint.
+
+    Args:
+        path: File under one of MEDIA_ROOTS
+
+    Returns:
+        MEDIA_BASE_URL/<root>/<relative path>, or None when MEDIA_BASE_URL is
+        empty or the file is outside the served roots (callers fall back to
+        st.video(path))
+    """
+    if not config.MEDIA_BASE_URL:
+        return None
+    resolved = Path(path).resolve()
+    for root, base in MEDIA_ROOTS.items():
+        base = base.resolve()
+        if base in resolved.parents:
+            relative = resolved.relative_to(base).as_posix()
+            return f"{config.MEDIA_BASE_URL.rstrip('/')}/{root}/{quote(relative)}"
+    return None
+
+
+def media_cors_headers() -> dict[str, str]:
+    """
+    CORS headers for /media responses.
+
+    hls.js loads playlists and segments with XHR from the components.html
+    iframe, whose origin is "null", so every response (including 206, 304
+    and 416) must allow MEDIA_ALLOW_ORIGIN and expose the range headers.
+    """
+    return {
+        "Access-Control-Allow-Origin": config.MEDIA_ALLOW_ORIGIN,
+        "Access-Control-Expose-Headers": MEDIA_CORS_EXPOSED_HEADERS,
+    }
+
+
+def media_etag(stat: os.stat_result) -> str:
+    """Strong ETag from file size and modification time (quoted, header-ready)."""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def media_type(path: Path) -> str:
+    """Content type for a media file (defaults to application/octet-stream)."""
+    return HLS_MEDIA_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" Range header.
+
+    Args:
+        range_header: Value of the Range header (None or empty for no range)
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the whole file
+        (no header, a non-bytes unit, or a multi-range request)
+
+    Raises:
+        RangeNotSatisfiable: If the range is malformed or starts past the end
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, dash, end_text = spec.strip().partition("-")
+    try:
+        if not dash:
+            raise ValueError(spec)
+        if start_text == "":
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError(spec)
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        raise RangeNotSatisfiable(f"Invalid range: {range_header}")
+
+    if start < 0 or start >= size or end < start:
+        raise RangeNotSatisfiable(f"Range {range_header} not satisfiable for {size} bytes")
+    return start, min(end, size - 1)
+
+
+def iter_file_range(path: Path, start: int, end: int, chunk_size: int = MEDIA_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file in chunk_size reads."""
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
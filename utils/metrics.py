@@ -0,0 +1,222 @@
+"""
+Latency Metrics Utility
+
+In-memory latency histograms for request handling and for the stages of a
+coaching turn (DB lookup, STT, Gemini grading, cheating analysis, TTS, file
+writes, RAG retrieval), exposed in Prometheus text format by GET /metrics.
+
+Wrap a stage in span() (or decorate a function with timed()):
+
+    with span("stt") as stage:
+        transcript = transcribe(audio)
+    timings_ms["transcription"] = stage.elapsed_ms
+
+Histograms use fixed buckets, so recording is O(buckets) and memory does not
+grow with traffic. p50/p95/p99 are derived from the buckets, either by
+Prometheus (histogram_quantile) or by snapshot() for quick inspection.
+Histograms are per process; scrape every worker.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds. STT, TTS and Gemini calls take seconds, DB lookups milliseconds.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+STAGE_METRIC = "xplorekodo_stage_duration_seconds"
+HTTP_METRIC = "xplorekodo_http_request_duration_seconds"
+
+_HELP = {
+    STAGE_METRIC: "Duration of an instrumented processing stage.",
+    HTTP_METRIC: "Duration of HTTP requests handled by the API.",
+}
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation (in seconds)."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def state(self) -> Tuple[List[int], float, int]:
+        """Return (cumulative bucket counts incl. +Inf, sum, count)."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = []
+        running = 0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return cumulative, total, count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket
+        (same method as Prometheus histogram_quantile).
+
+        Returns:
+            Estimated value in seconds, or None if nothing was observed
+        """
+        cumulative, _, count = self.state()
+        if count == 0:
+            return None
+        rank = q * count
+        lower_bound, lower_count = 0.0, 0
+        for bound, cumulative_count in zip(self.buckets, cumulative):
+            if cumulative_count >= rank:
+                in_bucket = cumulative_count - lower_count
+                if in_bucket == 0:
+                    return bound
+                return lower_bound + (bound - lower_bound) * (rank - lower_count) / in_bucket
+            lower_bound, lower_count = bound, cumulative_count
+        # Rank falls in the +Inf bucket; the largest finite bound is the best estimate
+        return self.buckets[-1]
+
+
+_histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+_registry_lock = threading.Lock()
+
+
+def observe(metric: str, seconds: float, **labels: str) -> None:
+    """Record a duration (seconds) for a metric and label set."""
+    key = (metric, tuple(sorted((name, str(value)) for name, value in labels.items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(key, Histogram())
+    histogram.observe(seconds)
+
+
+class Span:
+    """Timer for one stage; elapsed_ms is available inside and after the block."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = 0.0
+        self._elapsed: Optional[float] = None
+
+    def __enter__(self) -> "Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._elapsed = time.perf_counter() - self._started
+        observe(STAGE_METRIC, self._elapsed, stage=self.stage)
+        return False
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Milliseconds spent in the block (so far, if it is still running)."""
+        elapsed = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        return round(elapsed * 1000, 1)
+
+
+def span(stage: str) -> Span:
+    """Time a block as a named stage (recorded even if the block raises)."""
+    return Span(stage)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator that records each call of a function as a named stage."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_request(method: str, path: str, status: int, seconds: float) -> None:
+    """Record an HTTP request duration. Pass the route template as path to bound cardinality."""
+    observe(HTTP_METRIC, seconds, method=method, path=path, status=str(status))
+
+
+def _iter_histograms() -> Iterator[Tuple[str, LabelSet, Histogram]]:
+    with _registry_lock:
+        items = sorted(_histograms.items())
+    for (metric, labels), histogram in items:
+        yield metric, labels, histogram
+
+
+def snapshot() -> List[dict]:
+    """
+    Summarize every histogram (count, mean and p50/p95/p99 in ms).
+
+    Returns:
+        One dictionary per metric and label set
+    """
+    summary = []
+    for metric, labels, histogram in _iter_histograms():
+        _, total, count = histogram.state()
+        entry = {"metric": metric, "labels": dict(labels), "count": count,
+                 "mean_ms": round(total / count * 1000, 1) if count else None}
+        for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            value = histogram.quantile(q)
+            entry[name] = round(value * 1000, 1) if value is not None else None
+        summary.append(entry)
+    return summary
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def render_prometheus() -> str:
+    """Render all histograms in the Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    described = set()
+    for metric, labels, histogram in _iter_histograms():
+        if metric not in described:
+            lines.append(f"# HELP {metric} {_HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {metric} histogram")
+            described.add(metric)
+        cumulative, total, count = histogram.state()
+        for bound, cumulative_count in zip(histogram.buckets, cumulative):
+            lines.append(f"{metric}_bucket{_format_labels(labels, (('le', _format_bound(bound)),))} {cumulative_count}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, (('le', '+Inf'),))} {cumulative[-1]}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def reset_metrics() -> None:
+    """Drop all recorded histograms (used by tests)."""
+    with _registry_lock:
+        _histograms.clear()
@@ -3,13 +3,30 @@ RAG Query Utility
 
 Utility functions for querying the FAISS vector store to retrieve relevant context
 from the Xplora Kodo knowledge base for RAG-based conversations.
+
+When config.RAG_SERVICE_URL is set, queries are forwarded to the shared retrieval
+service (utils/rag_service.py) so the embeddings model and index are loaded once
+per host instead of once per worker. If the service is unreachable, queries fall
+back to the in-process vector store.
+
+Search modes (config.RAG_SEARCH_MODE, or the mode argument):
+- vector: FAISS similarity search only
+- hybrid: FAISS results fused with a character n-gram BM25 index by
+  reciprocal-rank fusion, so exact Japanese terms are not missed
 """
 
 from __future__ import annotations
 
+import json
+import os
 import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.resolve()
@@ -17,8 +34,11 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 try:
+    import faiss
+    import numpy as np
     from langchain_community.embeddings import HuggingFaceEmbeddings
     from langchain_community.vectorstores import FAISS
+    from utils.bm25_index import BM25Index, reciprocal_rank_fusion
     RAG_AVAILABLE = True
 except ImportError:
     RAG_AVAILABLE = False
@@ -37,98 +57,415 @@ except ImportError:
     TENACITY_AVAILABLE = False
     print("[WARN] tenacity not available. Retry logic disabled.")
 
+import config
+from utils.chunk_store import DocstoreChunkStore, SQLiteChunkStore
+from utils.metrics import span
+from utils.lru_cache import LRUCache
+
 
-# Global vector store instance (initialized on first use)
-_vector_store: Optional[FAISS] = None
+# Version stamp written into faiss_index/ by database/rebuild_vector_store.py
+INDEX_VERSION_FILENAME = "index_version.txt"
+
+# Global vector store instance (initialized on first use). _index, _chunk_store,
+# _bm25_index and _index_version are only replaced together under _store_lock;
+# searches take one snapshot of them (_current_store()) per call
+_index: Optional[faiss.Index] = None
+_chunk_store: Optional[SQLiteChunkStore | DocstoreChunkStore] = None
 _embeddings: Optional[HuggingFaceEmbeddings] = None
+_index_version: Optional[str] = None
+_bm25_index: Optional[BM25Index] = None
+_store_lock = threading.Lock()
+_reload_lock = threading.Lock()  # One thread loads a new index version at a time
 
+SEARCH_MODES = ("vector", "hybrid")
 
-def initialize_vector_store() -> bool:
+# In hybrid mode each ranking contributes this many times k candidates to the fusion
+HYBRID_CANDIDATE_MULTIPLIER = 4
+
+# Query cache: (index version, normalized query, k, mode) -> {'embedding': ndarray, 'hits': [(index_position, score), ...]}
+# Cleared whenever the index version stamp changes, so a stale index is never served.
+_query_cache = LRUCache(maxsize=config.RAG_CACHE_SIZE, ttl_seconds=config.RAG_CACHE_TTL_SECONDS)
+
+# Seconds to skip the retrieval service after a failed call before retrying it
+SERVICE_RETRY_INTERVAL = 30.0
+_service_down_until: float = 0.0
+
+
+def new_index_version() -> str:
+    """Generate a unique, time-ordered version string for a new index build."""
+    return f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+
+
+def resolve_index_name(vector_store_path: Path, version: Optional[str], serving: bool = True) -> str:
     """
-    Initialize the FAISS vector store connection.
+    Get the FAISS index_name (file stem) to load for a given version.
     
+    Versioned builds are saved as index-<version>.faiss/.pkl (the flat master
+    index). When a compressed index type was built, the serving copy is saved
+    alongside as index-<version>-<type>.faiss/.pkl. Indexes built before
+    versioning use the LangChain default stem "index".
+    
+    Args:
+        vector_store_path: Directory containing the saved index
+        version: Version string from read_index_version()
+        serving: Prefer the compressed serving index over the flat master
+        
     Returns:
-        True if initialization successful, False otherwise
+        index_name to pass to FAISS.load_local()
     """
-    global _vector_store, _embeddings
-    
-    if not RAG_AVAILABLE:
-        return False
+    if not version:
+        return "index"
+    if serving:
+        for candidate in sorted(vector_store_path.glob(f"index-{version}-*.faiss")):
+            return candidate.stem
+    if (vector_store_path / f"index-{version}.faiss").exists():
+        return f"index-{version}"
+    return "index"
+
+
+def write_index_version(vector_store_path: Path, version: Optional[str] = None) -> str:
+    """
+    Atomically point faiss_index/ at a new index version.
     
-    if _vector_store is not None:
-        return True  # Already initialized
+    The stamp is written to a temporary file and swapped in with os.replace(),
+    so readers see either the old version or the new one, never a partial write.
     
-    try:
-        vector_store_path = project_root / "faiss_index"
+    Args:
+        vector_store_path: Directory containing the saved index
+        version: Version to publish (a new one is generated if omitted)
         
-        if not vector_store_path.exists():
-            print("[WARN] Vector store not found. Run database/rebuild_vector_store.py first.")
-            return False
+    Returns:
+        The version string that was written
+    """
+    version = version or new_index_version()
+    tmp_path = vector_store_path / f"{INDEX_VERSION_FILENAME}.tmp-{os.getpid()}"
+    tmp_path.write_text(version, encoding='utf-8')
+    os.replace(tmp_path, vector_store_path / INDEX_VERSION_FILENAME)
+    return version
+
+
+def read_index_version(vector_store_path: Path) -> Optional[str]:
+    """
+    Read the version stamp of a FAISS index directory.
+    
+    Indexes built before version stamping fall back to the index file's mtime.
+    
+    Args:
+        vector_store_path: Directory containing the saved index
         
-        # Initialize embeddings
-        _embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True}
-        )
+    Returns:
+        Version string, or None if no index exists
+    """
+    try:
+        return (vector_store_path / INDEX_VERSION_FILENAME).read_text(encoding='utf-8').strip()
+    except OSError:
+        pass
+    try:
+        return f"mtime-{(vector_store_path / 'index.faiss').stat().st_mtime_ns}"
+    except OSError:
+        return None
+
+
+def chunk_store_path(vector_store_path: Path, version: Optional[str]) -> Optional[Path]:
+    """
+    Get the SQLite chunk store written for an index version, if any.
+    
+    Args:
+        vector_store_path: Directory containing the saved index
+        version: Version string from read_index_version()
         
-        # Load existing FAISS vector store
-        _vector_store = FAISS.load_local(
+    Returns:
+        Path to chunks-<version>.sqlite, or None if this version has none
+    """
+    if not version:
+        return None
+    path = vector_store_path / f"chunks-{version}.sqlite"
+    return path if path.exists() else None
+
+
+def _read_index_mmap(index_path: Path) -> faiss.Index:
+    """
+    Read a FAISS index memory-mapped, so workers share one page-cached copy.
+    
+    Index types that cannot be memory-mapped are read into RAM instead.
+    """
+    try:
+        return faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        return faiss.read_index(str(index_path))
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache lookups (case and whitespace insensitive)."""
+    return " ".join(query.lower().split())
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit/miss counters for the query cache.
+    
+    Returns:
+        Dictionary of cache counters plus the currently loaded index version
+    """
+    stats = _query_cache.stats()
+    stats['index_version'] = _index_version
+    return stats
+
+
+def _current_store() -> Tuple[Optional[faiss.Index], Optional[SQLiteChunkStore | DocstoreChunkStore], Optional[BM25Index], Optional[str]]:
+    """Consistent snapshot of (index, chunk store, BM25 index, version) for one search."""
+    with _store_lock:
+        return _index, _chunk_store, _bm25_index, _index_version
+
+
+def _load_store(vector_store_path: Path, version: Optional[str]) -> tuple:
+    """
+    Load one index version into new objects (the served store is untouched).
+    
+    Returns:
+        (index, chunk_store, bm25_index)
+    """
+    index_name = resolve_index_name(vector_store_path, version)
+    sqlite_path = chunk_store_path(vector_store_path, version)
+    
+    if sqlite_path is not None:
+        # Memory-mapped index + on-demand chunk lookups (no pickle on the hot path)
+        index = _read_index_mmap(vector_store_path / f"{index_name}.faiss")
+        chunk_store = SQLiteChunkStore(sqlite_path)
+    else:
+        # Indexes built before SQLite chunk stores: load the pickled docstore
+        vector_store = FAISS.load_local(
             folder_path=str(vector_store_path),
             embeddings=_embeddings,
+            index_name=index_name,
             allow_dangerous_deserialization=True
         )
+        index = vector_store.index
+        chunk_store = DocstoreChunkStore(vector_store)
+    
+    # Lexical index for hybrid search (absent for indexes built before it existed)
+    bm25_path = vector_store_path / f"bm25-{version}.npz"
+    bm25_index = BM25Index.load(bm25_path) if version and bm25_path.exists() else None
+    return index, chunk_store, bm25_index
+
+
+def initialize_vector_store() -> bool:
+    """
+    Initialize the FAISS vector store connection.
+    
+    Reloads the store and clears the query cache if the index has been rebuilt
+    since it was loaded. The new version is loaded alongside the old one and
+    swapped in atomically, so concurrent searches keep using the old index
+    until then; if loading fails, the old index stays in service.
+    
+    Returns:
+        True if a vector store is available, False otherwise
+    """
+    global _index, _chunk_store, _embeddings, _index_version, _bm25_index
+    
+    if not RAG_AVAILABLE:
+        return False
+    
+    vector_store_path = project_root / "faiss_index"
+    current_version = read_index_version(vector_store_path)
+    
+    index, _, _, loaded_version = _current_store()
+    if index is not None and (current_version is None or current_version == loaded_version):
+        return True  # Already initialized and up to date
+    
+    with _reload_lock:
+        # Another thread may have loaded this version while we waited
+        index, _, _, loaded_version = _current_store()
+        if index is not None and (current_version is None or current_version == loaded_version):
+            return True
         
+        try:
+            if not vector_store_path.exists():
+                print("[WARN] Vector store not found. Run database/rebuild_vector_store.py first.")
+                return index is not None
+            
+            # Initialize embeddings (the model does not change between index versions)
+            if _embeddings is None:
+                _embeddings = HuggingFaceEmbeddings(
+                    model_name="sentence-transformers/all-MiniLM-L6-v2",
+                    model_kwargs={'device': 'cpu'},
+                    encode_kwargs={'normalize_embeddings': True}
+                )
+            
+            if index is not None:
+                print(f"[INFO] Vector store rebuilt (version {current_version}). Reloading.")
+            new_index, new_chunk_store, new_bm25_index = _load_store(vector_store_path, current_version)
+        except Exception as e:
+            if index is not None:
+                print(f"[ERROR] Failed to load vector store version {current_version}, keeping version {loaded_version}: {e}")
+                return True
+            print(f"[ERROR] Failed to initialize vector store: {e}")
+            return False
+        
+        with _store_lock:
+            _index, _chunk_store, _bm25_index, _index_version = new_index, new_chunk_store, new_bm25_index, current_version
+        _query_cache.clear()  # Entries are keyed by version; drop the old version's
         return True
+
+
+def _search_embeddings(index, query_matrix, k: int) -> List[List[tuple]]:
+    """
+    Run one FAISS search over a matrix of query embeddings.
+    
+    Args:
+        index: FAISS index from the caller's _current_store() snapshot
+        query_matrix: float32 array of shape (n_queries, dim)
+        k: Number of neighbours per query
         
-    except Exception as e:
-        print(f"[ERROR] Failed to initialize vector store: {e}")
-        return False
+    Returns:
+        One list of (index_position, score) pairs per query row
+    """
+    with span("rag.vector_search"):
+        distances, indices = index.search(query_matrix, k)
+    rows = []
+    for row_distances, row_indices in zip(distances, indices):
+        rows.append([
+            (int(idx), float(distance))
+            for distance, idx in zip(row_distances, row_indices)
+            if idx != -1  # Fewer than k vectors in the index
+        ])
+    return rows
+
+
+def _resolve_mode(mode: Optional[str], bm25_index: Optional[BM25Index]) -> str:
+    """
+    Resolve the effective search mode.
+    
+    Hybrid mode falls back to vector search when no BM25 index has been built.
+    """
+    mode = mode or config.RAG_SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        print(f"[WARN] Unknown RAG search mode '{mode}'. Using vector search.")
+        return "vector"
+    if mode == "hybrid" and bm25_index is None:
+        return "vector"
+    return mode
+
+
+def _fuse_hybrid(bm25_index: BM25Index, query: str, vector_hits: List[tuple], k: int) -> List[tuple]:
+    """
+    Fuse vector hits with BM25 hits for the same query by reciprocal-rank fusion.
+    
+    Args:
+        bm25_index: Lexical index from the same store snapshot as vector_hits
+        query: Query text (for the lexical search)
+        vector_hits: (index_position, score) pairs from FAISS, best first
+        k: Number of fused results
+        
+    Returns:
+        Up to k (index_position, rrf_score) pairs, best first
+    """
+    with span("rag.bm25_search"):
+        lexical_hits = bm25_index.search(query, k * HYBRID_CANDIDATE_MULTIPLIER)
+    return reciprocal_rank_fusion(
+        [[position for position, _ in vector_hits], [position for position, _ in lexical_hits]],
+        k,
+    )
 
 
-def _query_with_retry(query: str, k: int) -> List[str]:
+def _query_with_retry(query: str, k: int, mode: Optional[str] = None) -> List[str]:
     """
     Internal function to perform FAISS similarity search with retry logic.
     
+    Repeated queries are served from the query cache without re-encoding.
+    
     Args:
         query: User's question or message
         k: Number of relevant chunks to retrieve
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
         
     Returns:
         List of relevant text chunks from the knowledge base
     """
-    # Perform similarity search
-    results = _vector_store.similarity_search(query, k=k)
+    index, chunk_store, bm25_index, version = _current_store()
+    mode = _resolve_mode(mode, bm25_index)
+    cache_key = (version, normalize_query(query), k, mode)
+    cached = _query_cache.get(cache_key)
+    
+    if cached is None:
+        with span("rag.embedding"):
+            embedding = np.asarray([_embeddings.embed_query(query)], dtype=np.float32)
+        if mode == "hybrid":
+            vector_hits = _search_embeddings(index, embedding, k * HYBRID_CANDIDATE_MULTIPLIER)[0]
+            hits = _fuse_hybrid(bm25_index, query, vector_hits, k)
+        else:
+            hits = _search_embeddings(index, embedding, k)[0]
+        cached = {'embedding': embedding[0], 'hits': hits}
+        _query_cache.set(cache_key, cached)
     
-    # Extract text content from results
-    chunks = [result.page_content for result in results]
+    # Fetch only the hits' text from the chunk store
+    positions = [position for position, _ in cached['hits']]
+    with span("rag.chunk_fetch"):
+        chunks = [chunk['text'] for chunk in chunk_store.get_chunks(positions)]
     return chunks
 
 
-def _retryable_query(query: str, k: int) -> List[str]:
+def _retryable_query(query: str, k: int, mode: Optional[str] = None) -> List[str]:
     """
     Retryable wrapper for FAISS query with exponential backoff for 429 errors.
     
     Args:
         query: User's question or message
         k: Number of relevant chunks to retrieve
+        mode: Search mode ("vector" or "hybrid")
         
     Returns:
         List of relevant text chunks from the knowledge base
     """
-    return _query_with_retry(query, k)
+    return _query_with_retry(query, k, mode)
 
 
-def query_knowledge_base(query: str, k: int = 3) -> List[str]:
+def _call_service(endpoint: str, payload: dict) -> Optional[dict]:
     """
-    Query the knowledge base for relevant context with retry logic for API errors.
+    POST a JSON payload to the retrieval service.
     
-    This function queries the FAISS index (faiss_index/) to retrieve relevant context
-    from the Xplora Kodo Manifesto and other knowledge base documents.
+    Args:
+        endpoint: Service path (e.g. "/query")
+        payload: JSON-serializable request body
+        
+    Returns:
+        Decoded JSON response, or None if the service is disabled or unavailable
+    """
+    global _service_down_until
+    
+    if not config.RAG_SERVICE_URL:
+        return None
+    
+    if time.monotonic() < _service_down_until:
+        return None
+    
+    request = urllib.request.Request(
+        config.RAG_SERVICE_URL.rstrip("/") + endpoint,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    
+    try:
+        with urllib.request.urlopen(request, timeout=config.RAG_SERVICE_TIMEOUT) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"[WARN] RAG service unavailable, using in-process vector store: {e}")
+        _service_down_until = time.monotonic() + SERVICE_RETRY_INTERVAL
+        return None
+
+
+def query_knowledge_base_local(query: str, k: int = 3, mode: Optional[str] = None) -> List[str]:
+    """
+    Query the in-process FAISS vector store with retry logic for API errors.
+    
+    Used directly by the retrieval service, and as the fallback when the
+    service is not configured or cannot be reached.
     
     Args:
         query: User's question or message
         k: Number of relevant chunks to retrieve (default: 3)
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
         
     Returns:
         List of relevant text chunks from the knowledge base
@@ -147,12 +484,12 @@ def query_knowledge_base(query: str, k: int = 3) -> List[str]:
                 reraise=True
             )
             def _retry_wrapper():
-                return _query_with_retry(query, k)
+                return _query_with_retry(query, k, mode)
             
             return _retry_wrapper()
         else:
             # Fallback without retry logic
-            return _query_with_retry(query, k)
+            return _query_with_retry(query, k, mode)
         
     except Exception as e:
         # Handle errors (including retry exhaustion)
@@ -164,19 +501,133 @@ def query_knowledge_base(query: str, k: int = 3) -> List[str]:
         return []
 
 
-def get_rag_context(user_message: str, max_chunks: int = 3) -> str:
+def query_knowledge_base(query: str, k: int = 3, mode: Optional[str] = None) -> List[str]:
     """
-    Get RAG context for a user message to inject into LLM prompt.
+    Query the knowledge base for relevant context with retry logic for API errors.
+    
+    This function queries the FAISS index (faiss_index/) to retrieve relevant context
+    from the Xplora Kodo Manifesto and other knowledge base documents. The shared
+    retrieval service is used when configured; otherwise the query runs in-process.
     
     Args:
-        user_message: User's message/query
-        max_chunks: Maximum number of relevant chunks to retrieve
+        query: User's question or message
+        k: Number of relevant chunks to retrieve (default: 3)
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
         
     Returns:
-        Formatted context string to inject into system prompt
+        List of relevant text chunks from the knowledge base
     """
-    chunks = query_knowledge_base(user_message, k=max_chunks)
+    response = _call_service("/query", {"query": query, "k": k, "mode": mode})
+    if response is not None:
+        return response.get("chunks", [])
     
+    return query_knowledge_base_local(query, k=k, mode=mode)
+
+
+def query_knowledge_base_batch_local(queries: List[str], k: int = 3, mode: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Query the in-process FAISS vector store for many queries at once.
+    
+    Queries not already in the query cache are embedded in a single
+    sentence-transformers forward pass and searched with one FAISS search over
+    the stacked query matrix.
+    
+    Args:
+        queries: List of questions or messages
+        k: Number of relevant chunks to retrieve per query (default: 3)
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
+        
+    Returns:
+        One list of hits per query. Each hit is a dictionary with keys:
+        'text', 'score', 'source', 'chunk_index'. In vector mode the score is the
+        FAISS L2 distance (lower is closer); in hybrid mode it is the
+        reciprocal-rank fusion score (higher is better).
+    """
+    if not queries:
+        return []
+    
+    if not initialize_vector_store():
+        return [[] for _ in queries]
+    
+    index, chunk_store, bm25_index, version = _current_store()
+    try:
+        mode = _resolve_mode(mode, bm25_index)
+        cache_keys = [(version, normalize_query(query), k, mode) for query in queries]
+        cached_rows = [_query_cache.get(key) for key in cache_keys]
+        
+        # Embed only the cache misses, in one forward pass and one FAISS search
+        miss_positions = [i for i, row in enumerate(cached_rows) if row is None]
+        if miss_positions:
+            miss_queries = [queries[i] for i in miss_positions]
+            with span("rag.embedding"):
+                query_matrix = np.asarray(_embeddings.embed_documents(miss_queries), dtype=np.float32)
+            search_k = k * HYBRID_CANDIDATE_MULTIPLIER if mode == "hybrid" else k
+            miss_hits = _search_embeddings(index, query_matrix, search_k)
+            for row_number, position in enumerate(miss_positions):
+                hits = miss_hits[row_number]
+                if mode == "hybrid":
+                    hits = _fuse_hybrid(bm25_index, queries[position], hits, k)
+                entry = {'embedding': query_matrix[row_number], 'hits': hits}
+                _query_cache.set(cache_keys[position], entry)
+                cached_rows[position] = entry
+    except Exception as e:
+        print(f"[ERROR] Failed to batch query knowledge base: {e}")
+        return [[] for _ in queries]
+    
+    results = []
+    for entry in cached_rows:
+        with span("rag.chunk_fetch"):
+            chunks = chunk_store.get_chunks([position for position, _ in entry['hits']])
+        hits = []
+        for chunk, (_, score) in zip(chunks, entry['hits']):
+            hits.append({
+                'text': chunk['text'],
+                'score': score,
+                'source': chunk['metadata'].get('source'),
+                'chunk_index': chunk['metadata'].get('chunk_index'),
+            })
+        results.append(hits)
+    
+    return results
+
+
+def query_knowledge_base_batch(queries: List[str], k: int = 3, mode: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Query the knowledge base for a batch of queries in one vectorized call.
+    
+    Intended for batch grading and report generation, where a whole cohort's
+    retrieval context is needed at once. The shared retrieval service is used
+    when configured; otherwise the batch runs in-process.
+    
+    Args:
+        queries: List of questions or messages
+        k: Number of relevant chunks to retrieve per query (default: 3)
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
+        
+    Returns:
+        One list of hits per query, in the same order as queries. Each hit is a
+        dictionary with keys: 'text', 'score', 'source', 'chunk_index'
+    """
+    if not queries:
+        return []
+    
+    response = _call_service("/query_batch", {"queries": list(queries), "k": k, "mode": mode})
+    if response is not None:
+        return response.get("results", [[] for _ in queries])
+    
+    return query_knowledge_base_batch_local(queries, k=k, mode=mode)
+
+
+def format_rag_context(chunks: List[str]) -> str:
+    """
+    Format retrieved chunks as a context block for an LLM prompt.
+    
+    Args:
+        chunks: Relevant text chunks from the knowledge base
+        
+    Returns:
+        Formatted context string, or "" if there are no chunks
+    """
     if not chunks:
         return ""
     
@@ -192,6 +643,22 @@ def get_rag_context(user_message: str, max_chunks: int = 3) -> str:
     return "\n".join(context_parts)
 
 
+def get_rag_context(user_message: str, max_chunks: int = 3, mode: Optional[str] = None) -> str:
+    """
+    Get RAG context for a user message to inject into LLM prompt.
+    
+    Args:
+        user_message: User's message/query
+        max_chunks: Maximum number of relevant chunks to retrieve
+        mode: Search mode ("vector" or "hybrid"; default config.RAG_SEARCH_MODE)
+        
+    Returns:
+        Formatted context string to inject into system prompt
+    """
+    chunks = query_knowledge_base(user_message, k=max_chunks, mode=mode)
+    return format_rag_context(chunks)
+
+
 if __name__ == "__main__":
     # Test the RAG query utility
     print("RAG Query Utility - Test")
@@ -0,0 +1,146 @@
+"""
+RAG Retrieval Service
+
+Long-lived local HTTP service that loads the HuggingFace embeddings model and the
+FAISS index (faiss_index/) once, warms them at startup, and answers retrieval
+queries for every Streamlit and uvicorn worker on the host.
+
+Workers reach it through utils/rag_query.py when config.RAG_SERVICE_URL is set.
+
+Endpoints:
+- GET  /health:  {"status": "ok", "vector_store_ready": bool}
+- GET  /stats:   query cache hit/miss counters and loaded index version
+- POST /query:   {"query": str, "k": int, "mode": str?} -> {"chunks": [str, ...]}
+- POST /query_batch: {"queries": [str, ...], "k": int, "mode": str?} -> {"results": [[hit, ...], ...]}
+- POST /context: {"user_message": str, "max_chunks": int, "mode": str?} -> {"context": str}
+
+Usage:
+    python -m utils.rag_service --host 127.0.0.1 --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from utils import rag_query
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Query used to warm the embeddings model and index pages at startup
+WARMUP_QUERY = "What is Xplora Kodo?"
+
+
+def warm_up() -> bool:
+    """
+    Load the embeddings model and FAISS index, then run one query so the first
+    real request does not pay the cold-start cost.
+
+    Returns:
+        True if the vector store is ready, False otherwise
+    """
+    start = time.perf_counter()
+    if not rag_query.initialize_vector_store():
+        print("[WARN] Vector store not available. Service will return empty results.")
+        return False
+
+    rag_query.query_knowledge_base_local(WARMUP_QUERY, k=1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"[INFO] RAG service warmed up in {elapsed_ms:.0f}ms")
+    return True
+
+
+class RAGRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving retrieval requests from the in-process vector store."""
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "vector_store_ready": rag_query._index is not None,
+            })
+        elif self.path == "/stats":
+            self._send_json(200, rag_query.get_cache_stats())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        try:
+            body = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        if self.path == "/query":
+            query = body.get("query", "")
+            k = int(body.get("k", 3))
+            chunks = rag_query.query_knowledge_base_local(query, k=k, mode=body.get("mode"))
+            self._send_json(200, {"chunks": chunks})
+        elif self.path == "/query_batch":
+            queries = body.get("queries", [])
+            k = int(body.get("k", 3))
+            results = rag_query.query_knowledge_base_batch_local(queries, k=k, mode=body.get("mode"))
+            self._send_json(200, {"results": results})
+        elif self.path == "/context":
+            user_message = body.get("user_message", "")
+            max_chunks = int(body.get("max_chunks", 3))
+            chunks = rag_query.query_knowledge_base_local(user_message, k=max_chunks, mode=body.get("mode"))
+            self._send_json(200, {"context": rag_query.format_rag_context(chunks)})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def log_message(self, format: str, *args) -> None:
+        # Keep per-request access logs out of the console
+        pass
+
+
+def run_service(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """
+    Warm the vector store and serve retrieval requests until interrupted.
+
+    Args:
+        host: Interface to bind (localhost by default)
+        port: TCP port to listen on
+    """
+    warm_up()
+    server = ThreadingHTTPServer((host, port), RAGRequestHandler)
+    server.daemon_threads = True
+    print(f"[INFO] RAG service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Xplora Kodo RAG retrieval service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    run_service(host=args.host, port=args.port)
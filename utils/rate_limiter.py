@@ -0,0 +1,303 @@
+"""
+Admission Control Utility
+
+Token-bucket rate limits and bounded concurrency for expensive API endpoints
+(/language-coaching, /process-voice, /sensei/stream, /jobs), keyed by candidate and by
+upstream service (Speech-to-Text, Gemini, OpenAI). When capacity is exceeded
+admit() raises AdmissionDenied immediately, so the API can answer 429 (this
+candidate is over its limit) or 503 (an upstream service is saturated) with a
+Retry-After header instead of queueing work that would exhaust the quotas.
+
+Backends (config.RATE_LIMIT_BACKEND):
+- memory: token buckets live in this process (one budget per uvicorn worker)
+- postgres: token buckets live in the rate_limit_buckets table and are updated
+  with a single atomic upsert, so all workers share one budget
+
+Concurrency slots are always counted per process; with N workers the
+effective ceiling is N x the configured limit.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent.resolve())
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+MAX_IDLE_BUCKETS = 10000
+SERVICE_BURST_SECONDS = 10  # Upstream buckets hold this many seconds' worth of requests
+
+
+class AdmissionDenied(Exception):
+    """Raised when a request exceeds a rate or concurrency limit."""
+
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets held in this process."""
+
+    shared = False
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # key -> (tokens, updated_at, rate_per_second, capacity); limits differ per bucket
+        self._buckets: Dict[str, Tuple[float, float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate_per_second: float, capacity: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from a bucket.
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until enough tokens refill
+        """
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at, _, _ = self._buckets.get(key, (capacity, now, rate_per_second, capacity))
+            tokens = min(capacity, tokens + (now - updated_at) * rate_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now, rate_per_second, capacity)
+            if len(self._buckets) > MAX_IDLE_BUCKETS:
+                self._prune(now)
+        return 0.0 if allowed else (cost - tokens) / rate_per_second
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0) -> None:
+        """Give back tokens taken by acquire() for a request that was not admitted."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                tokens, updated_at, rate_per_second, bucket_capacity = bucket
+                self._buckets[key] = (min(bucket_capacity, tokens + cost), updated_at, rate_per_second, bucket_capacity)
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely under their own limits (equivalent to a fresh bucket)."""
+        full = [
+            key for key, (tokens, updated_at, rate_per_second, capacity) in self._buckets.items()
+            if tokens + (now - updated_at) * rate_per_second >= capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+
+
+class PostgresRateLimitBackend:
+    """Token buckets in the rate_limit_buckets table, shared by every worker."""
+
+    shared = True
+
+    _ACQUIRE_SQL = """
+        INSERT INTO rate_limit_buckets (bucket_key, tokens, updated_at)
+        VALUES (:key, :capacity - :cost, clock_timestamp() AT TIME ZONE 'UTC')
+        ON CONFLICT (bucket_key) DO UPDATE SET
+            tokens = LEAST(:capacity, rate_limit_buckets.tokens + EXTRACT(EPOCH FROM
+                (clock_timestamp() AT TIME ZONE 'UTC') - rate_limit_buckets.updated_at) * :rate) - :cost,
+            updated_at = clock_timestamp() AT TIME ZONE 'UTC'
+        WHERE LEAST(:capacity, rate_limit_buckets.tokens + EXTRACT(EPOCH FROM
+            (clock_timestamp() AT TIME ZONE 'UTC') - rate_limit_buckets.updated_at) * :rate) >= :cost
+        RETURNING tokens
+    """
+
+    _AVAILABLE_SQL = """
+        SELECT LEAST(:capacity, tokens + EXTRACT(EPOCH FROM
+            (clock_timestamp() AT TIME ZONE 'UTC') - updated_at) * :rate)
+        FROM rate_limit_buckets
+        WHERE bucket_key = :key
+    """
+
+    _REFUND_SQL = """
+        UPDATE rate_limit_buckets
+        SET tokens = LEAST(:capacity, tokens + :cost)
+        WHERE bucket_key = :key
+    """
+
+    def acquire(self, key: str, rate_per_second: float, capacity: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from a shared bucket in one atomic statement.
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until enough tokens refill
+        """
+        from sqlalchemy import text
+        from database.db_manager import session_scope
+
+        params = {"key": key, "rate": rate_per_second, "capacity": capacity, "cost": cost}
+        with session_scope() as db:
+            if db.execute(text(self._ACQUIRE_SQL), params).first() is not None:
+                return 0.0
+            available = db.execute(text(self._AVAILABLE_SQL), params).scalar() or 0.0
+        return max(cost - float(available), 0.0) / rate_per_second
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0) -> None:
+        """Give back tokens taken by acquire() for a request that was not admitted."""
+        from sqlalchemy import text
+        from database.db_manager import session_scope
+
+        with session_scope() as db:
+            db.execute(text(self._REFUND_SQL), {"key": key, "capacity": capacity, "cost": cost})
+
+
+class ConcurrencyLimiter:
+    """Non-blocking counting semaphores keyed by name (per process)."""
+
+    def __init__(self):
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str, limit: int) -> bool:
+        """Take a slot if fewer than `limit` are in use."""
+        with self._lock:
+            active = self._active.get(key, 0)
+            if active >= limit:
+                return False
+            self._active[key] = active + 1
+            return True
+
+    def release(self, key: str) -> None:
+        """Return a slot taken by try_acquire()."""
+        with self._lock:
+            active = self._active.get(key, 0) - 1
+            if active > 0:
+                self._active[key] = active
+            else:
+                self._active.pop(key, None)
+
+    def active(self, key: str) -> int:
+        """Slots currently in use for a key."""
+        with self._lock:
+            return self._active.get(key, 0)
+
+
+class AdmissionTicket:
+    """Concurrency slots held by an admitted request; release() when it finishes."""
+
+    def __init__(self, limiter: ConcurrencyLimiter, keys: List[str]):
+        self._limiter = limiter
+        self._keys = keys
+
+    def release(self) -> None:
+        for key in self._keys:
+            self._limiter.release(key)
+        self._keys = []
+
+
+def _create_backend():
+    if config.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimitBackend()
+    if config.RATE_LIMIT_BACKEND != "memory":
+        print(f"[WARN] Unknown RATE_LIMIT_BACKEND '{config.RATE_LIMIT_BACKEND}'. Using in-memory rate limits.")
+    return InMemoryRateLimitBackend()
+
+
+rate_limit_backend = _create_backend()
+concurrency_limiter = ConcurrencyLimiter()
+
+
+def admit(candidate_id: str, services: Iterable[str]) -> AdmissionTicket:
+    """
+    Admit a request for a candidate that will call the given upstream services.
+
+    Concurrency is checked first (no tokens are spent on a request that cannot
+    start), then the candidate's and each service's token bucket. If a later
+    bucket denies the request, the tokens already taken are refunded, so a
+    request that is turned away costs nothing.
+
+    Args:
+        candidate_id: Candidate making the request
+        services: Upstream services the request fans out to (keys of config.UPSTREAM_LIMITS)
+
+    Returns:
+        Ticket holding the concurrency slots; call release() when the request ends
+
+    Raises:
+        AdmissionDenied: 429 for candidate limits, 503 for upstream service limits
+    """
+    services = list(services)
+    if not config.RATE_LIMIT_ENABLED:
+        return AdmissionTicket(concurrency_limiter, [])
+
+    held: List[str] = []
+    ticket = AdmissionTicket(concurrency_limiter, held)
+
+    candidate_key = f"candidate:{candidate_id}"
+    if not concurrency_limiter.try_acquire(candidate_key, config.CANDIDATE_MAX_CONCURRENT):
+        raise AdmissionDenied(
+            f"Too many concurrent requests for candidate {candidate_id}. Wait for the current one to finish.",
+            status_code=429,
+            retry_after=1,
+        )
+    held.append(candidate_key)
+
+    for service in services:
+        _, max_concurrent = config.UPSTREAM_LIMITS.get(service, (0, 0))
+        service_key = f"service:{service}"
+        if max_concurrent > 0:
+            if not concurrency_limiter.try_acquire(service_key, max_concurrent):
+                ticket.release()
+                raise AdmissionDenied(
+                    f"The {service} service is at capacity. Please retry shortly.",
+                    status_code=503,
+                    retry_after=1,
+                )
+            held.append(service_key)
+
+    taken: List[Tuple[str, float]] = []  # (bucket key, capacity) debited so far
+    try:
+        _take_tokens(taken, candidate_key, config.CANDIDATE_RATE_PER_MINUTE, config.CANDIDATE_BURST, 429,
+                     f"Rate limit exceeded for candidate {candidate_id}.")
+        for service in services:
+            rate_per_minute, _ = config.UPSTREAM_LIMITS.get(service, (0, 0))
+            _take_tokens(taken, f"service:{service}", rate_per_minute, max(1.0, rate_per_minute / 60 * SERVICE_BURST_SECONDS), 503,
+                         f"The {service} service quota is exhausted. Please retry shortly.")
+    except AdmissionDenied:
+        _refund_tokens(taken)
+        ticket.release()
+        raise
+    return ticket
+
+
+def _take_tokens(taken: List[Tuple[str, float]], key: str, rate_per_minute: float, burst: float,
+                 status_code: int, message: str) -> None:
+    """
+    Take one token from a bucket (skipped when the rate is 0) or raise AdmissionDenied.
+
+    Debited buckets are appended to `taken`. If the shared backend is
+    unreachable the request is admitted (fail open).
+    """
+    if rate_per_minute <= 0:
+        return
+    try:
+        retry_after = rate_limit_backend.acquire(key, rate_per_minute / 60, burst)
+    except Exception as e:
+        print(f"[WARN] Rate limit backend unavailable, admitting request: {e}")
+        return
+    if retry_after > 0:
+        raise AdmissionDenied(message, status_code=status_code, retry_after=retry_after)
+    taken.append((key, burst))
+
+
+def _refund_tokens(taken: List[Tuple[str, float]]) -> None:
+    """Return the tokens of a request that a later bucket denied."""
+    for key, capacity in taken:
+        try:
+            rate_limit_backend.refund(key, capacity)
+        except Exception as e:
+            print(f"[WARN] Rate limit backend unavailable, could not refund {key}: {e}")
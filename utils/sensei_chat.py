@@ -0,0 +1,372 @@
+"""
+Sensei Chat Utility
+
+Builds the Socratic Sensei prompt (persona, trilingual format, RAG context,
+conversation history) and calls Gemini, either for a complete response or as
+a stream of text chunks. Shared by the dashboard chat (get_sensei_response)
+and the API's /sensei/stream endpoint, so streamed and non-streamed turns use
+the same prompt.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent.resolve())
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from utils.clients import get_gemini_client
+
+# Try to import google-genai for Gemini
+try:
+    from google import genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+    genai = None
+
+SENSEI_MODEL = "gemini-2.0-flash"
+
+
+def build_sensei_prompt(
+    user_input: str,
+    conversation_history: list,
+    transcript: str,
+    timer_elapsed: int,
+    track: str = "Food/Tech",
+    current_page: Optional[str] = None,
+) -> str:
+    """
+    Build the Sensei prompt using Socratic logic from sandbox_socratic_logic.py.
+
+    Args:
+        user_input: User's message
+        conversation_history: List of previous messages with 'role' and 'content'
+        transcript: Video transcript text
+        timer_elapsed: Elapsed time in seconds (maps to video timestamp)
+        track: Training track (default: "Food/Tech")
+        current_page: Current page name (e.g., "📖 Academic Hub") to determine persona [cite: 2025-12-20]
+
+    Returns:
+        Prompt for Gemini
+    """
+    # RAG Integration: Retrieve relevant context from knowledge base
+    rag_context = ""
+    try:
+        from utils.rag_query import get_rag_context
+        rag_context = get_rag_context(user_input, max_chunks=3)
+    except Exception as e:
+        # RAG is optional - if it fails, continue without it
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.debug(f"RAG query failed (non-critical): {e}")
+        rag_context = ""
+    
+    # Determine conversation phase based on timer
+    if timer_elapsed < 180:
+        phase = "helpful_assistant"
+        phase_instruction = "You are in 'Helpful Assistant' mode. Guide the student with questions, but be supportive and encouraging."
+    else:
+        phase = "evaluator"
+        phase_instruction = "You are now in 'Evaluator' mode. Assess the student's understanding more critically. Ask deeper questions to test their knowledge."
+    
+    # Build conversation history context
+    history_text = ""
+    if conversation_history:
+        history_text = "\n\n**Previous Conversation:**\n"
+        for msg in conversation_history[-5:]:  # Last 5 messages
+            role_label = "Sensei" if msg['role'] == 'sensei' else "Student"
+            history_text += f"- {role_label}: {msg['content']}\n"
+    
+    # Handle special initial greeting prompt (from show_academic_hub) [cite: 2025-12-20]
+    # Simplified Trilingual Prompt: Direct and simple [cite: 2025-12-20]
+    if user_input and (user_input.strip().startswith("The student has just started the lesson") or user_input.strip().startswith("Greeting:")):
+        # This is a special prompt for initial greeting - use simplified format
+        prompt = user_input  # Use the simplified prompt as-is
+    # Handle initial greeting when user_input is empty [cite: 2025-12-20]
+    elif not user_input or user_input.strip() == "":
+        # RAG Integration: Get context for initial greeting (shared for all tracks)
+        greeting_rag_context = ""
+        try:
+            from utils.rag_query import get_rag_context
+            greeting_rag_context = get_rag_context("Xplora Kodo platform introduction", max_chunks=2)
+        except Exception:
+            greeting_rag_context = ""
+        
+        # Initial greeting for Academic Hub
+        if current_page == "📖 Academic Hub" or current_page == "Academic Hub":
+            prompt = f"""You are a Socratic Japanese Language Teacher. Your goal is to guide the student to understand grammar, particles, and kanji.
+
+{greeting_rag_context}
+
+**System Context - Lesson Transcript:**
+{transcript}
+
+**Language Instructions:**
+Based on the transcript context above, you should be prepared to speak in English, Japanese (Kanji/Kana), and Nepali (Devanagari) as needed. The transcript provides the lesson context that informs your responses.
+
+**Initial Greeting:**
+The student has just started this lesson. Provide a warm, encouraging greeting in English that:
+1. Welcomes them to the JLPT lesson
+2. Mentions the key topic from the transcript (if available)
+3. Invites them to ask questions or share what they'd like to learn
+4. Sets a supportive, Socratic tone
+
+Keep it brief (2-3 sentences) and friendly.
+
+**Your Response (as JLPT Sensei, in English, welcoming greeting):**
+"""
+        else:
+            # Initial greeting for Food/Tech track
+            prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP and kitchen sanitization.
+
+{greeting_rag_context}
+
+**System Context - Lesson Transcript:**
+{transcript}
+
+**Language Instructions:**
+Based on the transcript context above, you should be prepared to speak in English, Japanese (Kanji/Kana), and Nepali (Devanagari) as needed. The transcript provides the lesson context that informs your responses.
+
+**Initial Greeting:**
+The student has just started this lesson. Provide a warm, encouraging greeting in English that:
+1. Welcomes them to the Food Safety training
+2. Mentions the key topic from the transcript (if available)
+3. Invites them to ask questions or share what they'd like to learn
+4. Sets a supportive, Socratic tone
+
+Keep it brief (2-3 sentences) and friendly.
+
+**Your Response (as Food Safety Sensei, in English, welcoming greeting):**
+"""
+    # Persona Pivot: Check if current page is Academic Hub [cite: 2025-12-20]
+    elif current_page == "📖 Academic Hub" or current_page == "Academic Hub":
+        # JLPT Sensei persona for Academic Hub [cite: 2025-12-20]
+        # Transcript-to-Sensei: Ensure transcript is used as system prompt context [cite: 2025-12-20]
+        # Trilingual Protocol: System prompt enforces exact Markdown format [cite: 2025-12-21]
+        prompt = f"""You are a Socratic Japanese Language Teacher. Your goal is to guide the student to understand grammar, particles, and kanji. Use the transcript provided. If they make a mistake with a particle (like wa vs ga), ask them to explain the function of the particle instead of correcting them immediately.
+
+{rag_context}
+
+**System Context - Lesson Transcript:**
+{transcript}
+
+**CRITICAL: Knowledge Limitation**
+Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
+
+**CRITICAL: Trilingual Response Format**
+Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
+
+🇬🇧 English: [Your Socratic question/feedback in English]
+
+🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
+
+🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
+
+**Your Role:**
+- You are a Socratic teacher. You DO NOT give direct answers.
+- You ask guiding questions that help the student discover the answers themselves.
+- You focus on Japanese grammar, particles (wa, ga, ni, wo, de, etc.), kanji, and JLPT concepts.
+- EVERY response must include all three languages in the format above.
+- Sensei Interaction: If the student asks about topics not in the transcript, politely redirect them to the lesson material. [cite: 2025-12-20, 2025-12-21]
+
+**Current Phase: {phase.upper()}**
+{phase_instruction}
+
+**Key Topics to Explore:**
+1. Particle usage: wa (は), ga (が), ni (に), wo (を), de (で), etc.
+2. Kanji recognition and meaning
+3. Grammar patterns (N5, N4, N3 level)
+4. Sentence structure and word order
+5. Verb conjugations and forms
+
+**Socratic Method Rules:**
+- NEVER give the answer directly. Instead, ask: "What do you think the particle 'wa' does in this sentence?"
+- If the student is stuck, ask a simpler related question to guide them.
+- If the student gives a partial answer, ask a follow-up to deepen understanding.
+- Praise correct thinking, but challenge assumptions gently.
+- Focus on helping them understand the WHY behind grammar rules, not just memorization.
+
+**Example Questions You Might Ask:**
+- "In the sentence '私は学生です', what role does the particle 'wa' play? Why is it used here instead of 'ga'?"
+- "Can you explain the difference between 'ni' and 'de' when talking about location?"
+- "What does this kanji mean? Can you break it down into its components?"
+
+{history_text}
+
+**Student's Latest Input:**
+User input: {user_input!r}
+
+**Your Response (as JLPT Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
+"""
+    elif current_page == "🍜 Food/Tech Hub" or current_page == "Food/Tech Hub" or track == "Food/Tech":
+        # Food/Tech Sensei persona (default)
+        prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP (Hazard Analysis and Critical Control Points) and kitchen sanitization.
+
+{rag_context}
+
+**System Context - Lesson Transcript:**
+{transcript}
+
+**CRITICAL: Knowledge Limitation**
+Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
+
+**Your Role:**
+- You are a Socratic teacher. You DO NOT give direct answers.
+- You ask guiding questions that help the student discover the answers themselves.
+- You focus on HACCP principles and the 3-step sanitization process:
+  * Seiso (清掃) - Cleaning: Removing visible dirt and debris
+  * Sakkin (殺菌) - Disinfection: Killing harmful microorganisms
+  * Kansou (乾燥) - Air-drying: Allowing surfaces to air-dry naturally (no towels)
+- EVERY response must include all three languages in the format above.
+
+**Current Phase: {phase.upper()}**
+{phase_instruction}
+
+**Key Topics to Explore:**
+1. Temperature control: Cold storage (<10°C), Frozen storage (<-15°C)
+2. 3-step sanitization: Why each step matters, what happens if you skip a step
+3. Cross-contamination (Kousa-osen / 交差汚染)
+4. Expiry management (Kigen-kanri / 期限管理)
+5. Proper disinfection techniques (Shudoku / 消毒)
+
+**Socratic Method Rules:**
+- NEVER give the answer directly. Instead, ask: "What do you think would happen if...?"
+- If the student is stuck, ask a simpler related question to guide them.
+- If the student gives a partial answer, ask a follow-up to deepen understanding.
+- Praise correct thinking, but challenge assumptions gently.
+- If the student uses HACCP terminology (like Kousa-osen, Kigen-kanri, Shudoku), acknowledge it positively.
+
+**Example Questions You Might Ask:**
+- "The temperature log shows the walk-in freezer at -10°C. What does HACCP require for frozen storage?"
+- "You're cleaning a prep table. Can you explain the difference between Seiso and Sakkin? Why is air-drying (Kansou) better than using a towel?"
+- "What could happen if you skip the Kansou step and wipe the surface with a towel instead?"
+
+{history_text}
+
+**Student's Latest Input:**
+User input: {user_input!r}
+
+**Your Response (as HACCP Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
+"""
+    elif current_page == "🏥 Care-giving Hub" or current_page == "Care-giving Hub" or track == "Care-giving":
+        # Care-giving Sensei persona
+        prompt = f"""You are a Japanese Care-giving Sensei (Teacher) conducting a Socratic dialogue about Kaigo (介護) and nursing care practices.
+
+**CRITICAL: Trilingual Response Format**
+Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
+
+🇬🇧 English: [Your Socratic question/feedback in English]
+
+🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
+
+🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
+
+{rag_context}
+
+**System Context - Lesson Transcript:**
+{transcript}
+
+**CRITICAL: Knowledge Limitation**
+Your knowledge is strictly limited to the provided vocational transcript for the current lesson. If the student asks something outside this scope, guide them back to the lesson material. Do not provide information that is not in the transcript. [cite: 2025-12-20, 2025-12-21]
+
+**Your Role:**
+- You are a Socratic teacher. You DO NOT give direct answers.
+- You ask guiding questions that help the student discover the answers themselves.
+- You focus on care-giving practices, resident communication, and safety protocols:
+  * 体調 (Taichō) - Physical condition monitoring
+  * 介助 (Kaijo) - Assistance/Care-giving support
+  * 水分補給 (Suibun hokyū) - Hydration management
+  * 報告 (Hōkoku) - Reporting to head nurse
+  * 薬 (Kusuri) - Medicine administration
+
+**Current Phase: {phase.upper()}**
+{phase_instruction}
+
+**Key Topics to Explore:**
+1. Morning routine: Checking resident's 顔色 (Kaoiro - complexion) and 食欲 (Shokuyoku - appetite)
+2. Medicine administration: Ensuring 薬 (Kusuri) is taken at the correct time
+3. Communication: Proper 報告 (Hōkoku - reporting) to supervisors
+4. Safety: Proper use of 車椅子 (Kuruma-isu - wheelchair) and 介助 (Kaijo - assistance)
+5. Empathy: Using respectful phrases like お大事に (O-daiji ni - get well soon)
+
+**Socratic Method Rules:**
+- NEVER give the answer directly. Instead, ask: "What do you think would happen if...?"
+- If the student is stuck, ask a simpler related question to guide them.
+- If the student gives a partial answer, ask a follow-up to deepen understanding.
+- Praise correct thinking, but challenge assumptions gently.
+- If the student uses care-giving terminology (like Taichō, Kaijo, Hōkoku), acknowledge it positively.
+
+**Example Questions You Might Ask:**
+- "You notice a resident's 顔色 (Kaoiro) looks pale this morning. What should you check next, and why?"
+- "The resident hasn't eaten breakfast. What does this tell you about their 食欲 (Shokuyoku), and what action should you take?"
+- "Can you explain the difference between 介助 (Kaijo) and simply helping someone? Why is proper technique important?"
+
+{history_text}
+
+**Student's Latest Input:**
+User input: {user_input!r}
+
+**Your Response (as Kaigo Sensei, using Socratic questioning, in the EXACT trilingual format shown above):**
+"""
+    else:
+        # Food/Tech Sensei persona (default fallback)
+        prompt = f"""You are a Japanese Food Safety Sensei (Teacher) conducting a Socratic dialogue about HACCP (Hazard Analysis and Critical Control Points) and kitchen sanitization.
+
+{rag_context}
+
+**CRITICAL: Trilingual Response Format**
+Every single response you give MUST follow this exact Markdown format. There are NO exceptions:
+
+🇬🇧 English: [Your Socratic question/feedback in English]
+
+🇯🇵 Japanese: [Translation of the English part into Japanese using Kanji/Kana]
+
+🇳🇵 Nepali: [Translation of the English part into Nepali using Devanagari script]
+"""
+
+    return prompt
+
+
+def _gemini_client():
+    """Return the shared Gemini client, raising RuntimeError if Gemini is not configured."""
+    if not GEMINI_AVAILABLE:
+        raise RuntimeError("google-genai is not installed. Install it with: pip install google-genai")
+    client = get_gemini_client()
+    if client is None:
+        raise RuntimeError("GEMINI_API_KEY not configured. Please set it in your .env file.")
+    return client
+
+
+def generate_sensei_response(prompt: str) -> str:
+    """
+    Generate a complete Sensei response for a prompt from build_sensei_prompt().
+
+    Raises:
+        RuntimeError: If Gemini is not configured
+    """
+    response = _gemini_client().models.generate_content(
+        model=SENSEI_MODEL,
+        contents=prompt
+    )
+    return response.text.strip()
+
+
+def stream_sensei_response(prompt: str) -> Iterator[str]:
+    """
+    Stream a Sensei response as Gemini produces it.
+
+    Yields text chunks in order; joining them gives the full response.
+
+    Raises:
+        RuntimeError: If Gemini is not configured
+    """
+    client = _gemini_client()
+    for chunk in client.models.generate_content_stream(model=SENSEI_MODEL, contents=prompt):
+        if chunk.text:
+            yield chunk.text
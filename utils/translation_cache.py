@@ -0,0 +1,179 @@
+"""
+Translation Cache Utility
+
+Content-addressed cache for Google Translate results, so the small, constantly
+repeating question bank is translated once instead of on every render.
+
+Lookups go through three tiers:
+1. In-process LRU (TRANSLATION_CACHE_SIZE entries)
+2. translation_cache table (PostgreSQL or SQLite, via the main database)
+3. Google Translate - all remaining misses for a target language in one
+   batched request per TRANSLATE_BATCH_SIZE strings
+
+Entries are keyed by sha256(source language | target language | text), so a
+cached question renders with no translation round-trip at all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Add project root to path
+project_root = str(Path(__file__).parent.parent.resolve())
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from database.db_manager import TranslationCacheEntry, session_scope
+from utils.clients import get_translate_client
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Google Translate v2 accepts at most 128 segments per request
+TRANSLATE_BATCH_SIZE = 100
+
+_memory_cache = LRUCache(maxsize=config.TRANSLATION_CACHE_SIZE)
+
+
+def translation_cache_key(text: str, target_language: str, source_language: Optional[str] = "en") -> str:
+    """Content address of a translation: sha256 of source, target and text."""
+    payload = f"{source_language or 'auto'}|{target_language}|{text}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_persisted(keys: Sequence[str]) -> Dict[str, str]:
+    """Read cached translations for the given keys from the database."""
+    if not keys:
+        return {}
+    try:
+        with session_scope() as db:
+            rows = (
+                db.query(TranslationCacheEntry.cache_key, TranslationCacheEntry.translated_text)
+                .filter(TranslationCacheEntry.cache_key.in_(list(keys)))
+                .all()
+            )
+            return {row.cache_key: row.translated_text for row in rows}
+    except Exception as e:
+        logger.warning(f"Translation cache lookup failed: {e}")
+        return {}
+
+
+def _persist(entries: List[dict]) -> None:
+    """Insert new translations, ignoring keys another process stored first."""
+    if not entries:
+        return
+    try:
+        with session_scope() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            elif dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                for entry in entries:
+                    db.merge(TranslationCacheEntry(**entry))
+                return
+            db.execute(
+                insert(TranslationCacheEntry).values(entries).on_conflict_do_nothing(index_elements=["cache_key"])
+            )
+    except Exception as e:
+        logger.warning(f"Failed to store translations in cache: {e}")
+
+
+def _translate_upstream(texts: List[str], target_language: str, source_language: Optional[str]) -> List[Optional[str]]:
+    """Translate texts with Google Translate in batches (None for texts that could not be translated)."""
+    client = get_translate_client()
+    if client is None:
+        return [None] * len(texts)
+
+    translations: List[Optional[str]] = []
+    for start in range(0, len(texts), TRANSLATE_BATCH_SIZE):
+        batch = texts[start:start + TRANSLATE_BATCH_SIZE]
+        try:
+            results = client.translate(batch, target_language=target_language, source_language=source_language)
+        except Exception as e:
+            logger.warning(f"Google Translate API error: {e}")
+            translations.extend([None] * len(batch))
+            continue
+        for text, result in zip(batch, results):
+            translated_text = result.get("translatedText")
+            if translated_text and translated_text == text:
+                logger.warning(f"Translation returned same text. Result: {result}")
+            translations.append(translated_text or None)
+    return translations
+
+
+def translate_texts(
+    texts: Sequence[str],
+    target_language: str,
+    source_language: Optional[str] = "en",
+) -> List[Optional[str]]:
+    """
+    Translate several strings into one target language, using the cache.
+
+    Args:
+        texts: Strings to translate (duplicates are translated once)
+        target_language: Target language code (e.g. 'ja', 'ne')
+        source_language: Source language code, or None to let Google detect it
+
+    Returns:
+        Translations in the same order as texts; None where translation failed
+        (callers keep their own placeholder fallback). Failures are not cached.
+    """
+    keys = [translation_cache_key(text, target_language, source_language) for text in texts]
+    found: Dict[str, str] = {}
+
+    for key in set(keys):
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            found[key] = cached
+
+    missing = [key for key in dict.fromkeys(keys) if key not in found]
+    if missing:
+        persisted = _load_persisted(missing)
+        for key, translated_text in persisted.items():
+            _memory_cache.set(key, translated_text)
+        found.update(persisted)
+
+    text_by_key = dict(zip(keys, texts))
+    upstream_keys = [key for key in dict.fromkeys(keys) if key not in found]
+    if upstream_keys:
+        upstream_texts = [text_by_key[key] for key in upstream_keys]
+        new_entries = []
+        for key, text, translated_text in zip(
+            upstream_keys, upstream_texts, _translate_upstream(upstream_texts, target_language, source_language)
+        ):
+            if translated_text is None:
+                continue
+            found[key] = translated_text
+            _memory_cache.set(key, translated_text)
+            new_entries.append({
+                "cache_key": key,
+                "source_language": source_language or "auto",
+                "target_language": target_language,
+                "source_text": text,
+                "translated_text": translated_text,
+            })
+        _persist(new_entries)
+
+    return [found.get(key) for key in keys]
+
+
+def translate_text(text: str, target_language: str, source_language: Optional[str] = "en") -> Optional[str]:
+    """Translate one string using the cache (None if translation failed)."""
+    return translate_texts([text], target_language, source_language)[0]
+
+
+def get_translation_cache_stats() -> dict:
+    """Return in-memory cache size and hit/miss counters (see LRUCache.stats())."""
+    return _memory_cache.stats()
+
+
+def clear_translation_memory_cache() -> None:
+    """Drop the in-process tier (persisted translations are kept)."""
+    _memory_cache.clear()
@@ -0,0 +1,322 @@
+"""
+TTS Audio Cache Utility
+
+Content-addressed cache for Google Text-to-Speech output, shared by every
+synthesis path (dashboard trilingual TTS and concierge widget, Socratic
+question audio, and the virtual classroom voice replies).
+
+Each MP3 is stored once as <TTS_CACHE_DIR>/<sha256>.mp3, where the hash covers
+the text, language, voice name, SSML gender, speaking rate and pitch. A
+repeated prompt is a disk read instead of a network synthesis.
+
+The tts_cache_entries table indexes the files (size, hit count, last access).
+Before each new file is written, the least recently used files are deleted
+until it fits in TTS_CACHE_MAX_MB. If the database is unavailable
+the files are still served; only eviction bookkeeping is skipped.
+
+Because any file can be evicted, records that outlive a request (e.g. the
+Socratic dialogue history) store a reference from tts_audio_ref() instead of
+a file path; load_tts_audio() plays it back and re-synthesizes it if evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.resolve()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func
+
+import config
+from database.db_manager import TTSCacheEntry, session_scope
+from utils.clients import get_tts_client
+
+logger = logging.getLogger(__name__)
+
+# Hits update last_accessed_at at most this often per file, so a hot prompt
+# does not cost a database write on every play
+TOUCH_INTERVAL_SECONDS = 60.0
+
+_last_touched: Dict[str, float] = {}
+_touch_lock = threading.Lock()
+
+
+def get_tts_cache_dir() -> Path:
+    """Directory holding the cached MP3 files (TTS_CACHE_DIR, relative to the project root)."""
+    cache_dir = Path(config.TTS_CACHE_DIR)
+    return cache_dir if cache_dir.is_absolute() else project_root / cache_dir
+
+
+def tts_cache_path(cache_key: str) -> Path:
+    """Cache file for a key, inside get_tts_cache_dir()."""
+    return get_tts_cache_dir() / f"{cache_key}.mp3"
+
+
+def tts_cache_key(
+    text: str,
+    language_code: str,
+    voice_name: Optional[str] = None,
+    ssml_gender: str = "FEMALE",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+) -> str:
+    """Content address of a synthesis request: sha256 of the text and every voice setting."""
+    payload = json.dumps(
+        [text, language_code, voice_name or "", ssml_gender.upper(), round(float(speaking_rate), 3), round(float(pitch), 3)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _touch(cache_key: str) -> None:
+    """Record a cache hit in the index (throttled per file)."""
+    now = time.monotonic()
+    with _touch_lock:
+        if now - _last_touched.get(cache_key, float("-inf")) < TOUCH_INTERVAL_SECONDS:
+            return
+        _last_touched[cache_key] = now
+    try:
+        with session_scope() as db:
+            db.query(TTSCacheEntry).filter(TTSCacheEntry.cache_key == cache_key).update(
+                {
+                    TTSCacheEntry.last_accessed_at: datetime.now(timezone.utc),
+                    TTSCacheEntry.hit_count: TTSCacheEntry.hit_count + 1,
+                },
+                synchronize_session=False,
+            )
+    except Exception as e:
+        logger.warning(f"Failed to update TTS cache index: {e}")
+
+
+def _synthesize_upstream(
+    text: str,
+    language_code: str,
+    voice_name: Optional[str],
+    ssml_gender: str,
+    speaking_rate: float,
+    pitch: float,
+) -> bytes:
+    """Call Google Text-to-Speech (raises if the client is unavailable or the request fails)."""
+    from google.cloud import texttospeech
+
+    client = get_tts_client()
+    if client is None:
+        raise RuntimeError("Google Text-to-Speech client is not configured")
+
+    voice_params = {
+        "language_code": language_code,
+        "ssml_gender": getattr(texttospeech.SsmlVoiceGender, ssml_gender.upper(), texttospeech.SsmlVoiceGender.FEMALE),
+    }
+    if voice_name:
+        voice_params["name"] = voice_name
+
+    response = client.synthesize_speech(
+        input=texttospeech.SynthesisInput(text=text),
+        voice=texttospeech.VoiceSelectionParams(**voice_params),
+        audio_config=texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.MP3,
+            speaking_rate=speaking_rate,
+            pitch=pitch,
+        ),
+    )
+    return response.audio_content
+
+
+def _store(cache_key: str, path: Path, audio: bytes, language_code: str, voice_name: Optional[str]) -> None:
+    """Write the MP3 atomically and add it to the index."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(audio)
+    os.replace(tmp_path, path)
+
+    try:
+        with session_scope() as db:
+            db.merge(TTSCacheEntry(
+                cache_key=cache_key,
+                language_code=language_code,
+                voice_name=voice_name,
+                size_bytes=len(audio),
+                hit_count=0,
+                last_accessed_at=datetime.now(timezone.utc),
+            ))
+    except Exception as e:
+        logger.warning(f"Failed to index TTS cache file: {e}")
+
+
+def synthesize_speech_file(
+    text: str,
+    language_code: str,
+    voice_name: Optional[str] = None,
+    ssml_gender: str = "FEMALE",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+) -> Path:
+    """
+    Return the cached MP3 for a synthesis request, calling Google TTS on a miss.
+
+    Args:
+        text: Text to speak
+        language_code: BCP-47 language code (e.g. 'ja-JP', 'ne-NP')
+        voice_name: Specific voice (e.g. 'ja-JP-Neural2-C'), or None for the language default
+        ssml_gender: 'FEMALE', 'MALE' or 'NEUTRAL'
+        speaking_rate: 0.25 - 4.0 (1.0 is normal speed)
+        pitch: -20.0 - 20.0 semitones
+
+    Returns:
+        Absolute path of the MP3 file
+
+    Raises:
+        Exception: If synthesis is needed and fails (nothing is cached)
+    """
+    cache_key = tts_cache_key(text, language_code, voice_name, ssml_gender, speaking_rate, pitch)
+    path = tts_cache_path(cache_key)
+
+    if path.exists():
+        _touch(cache_key)
+        return path
+
+    audio = _synthesize_upstream(text, language_code, voice_name, ssml_gender, speaking_rate, pitch)
+    evict_tts_cache(reserve_bytes=len(audio))
+    _store(cache_key, path, audio, language_code, voice_name)
+    return path
+
+
+def synthesize_speech(
+    text: str,
+    language_code: str,
+    voice_name: Optional[str] = None,
+    ssml_gender: str = "FEMALE",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+) -> bytes:
+    """Return MP3 bytes for a synthesis request, using the cache (see synthesize_speech_file)."""
+    try:
+        return synthesize_speech_file(text, language_code, voice_name, ssml_gender, speaking_rate, pitch).read_bytes()
+    except FileNotFoundError:
+        # Evicted by another process between the lookup and the read
+        return synthesize_speech_file(text, language_code, voice_name, ssml_gender, speaking_rate, pitch).read_bytes()
+
+
+def tts_audio_ref(
+    text: str,
+    language_code: str,
+    voice_name: Optional[str] = None,
+    ssml_gender: str = "FEMALE",
+    speaking_rate: float = 1.0,
+    pitch: float = 0.0,
+) -> dict:
+    """
+    Synthesize (or find) audio and return a JSON-serializable reference to it.
+
+    Store the reference instead of the file path: the cached file may be
+    evicted later, and the reference carries the request needed to
+    re-synthesize it (see load_tts_audio()).
+
+    Raises:
+        Exception: If synthesis is needed and fails
+    """
+    path = synthesize_speech_file(text, language_code, voice_name, ssml_gender, speaking_rate, pitch)
+    return {
+        "cache_key": path.stem,
+        "text": text,
+        "language_code": language_code,
+        "voice_name": voice_name,
+        "ssml_gender": ssml_gender,
+        "speaking_rate": speaking_rate,
+        "pitch": pitch,
+    }
+
+
+def load_tts_audio(ref: dict) -> bytes:
+    """
+    MP3 bytes for a reference from tts_audio_ref().
+
+    Served from the cache, or re-synthesized if the file has been evicted.
+
+    Raises:
+        Exception: If re-synthesis is needed and fails
+    """
+    return synthesize_speech(
+        ref["text"],
+        ref["language_code"],
+        ref.get("voice_name"),
+        ref.get("ssml_gender", "FEMALE"),
+        ref.get("speaking_rate", 1.0),
+        ref.get("pitch", 0.0),
+    )
+
+
+def evict_tts_cache(max_bytes: Optional[int] = None, reserve_bytes: int = 0) -> int:
+    """
+    Delete least recently used files until the indexed total fits in max_bytes.
+
+    Args:
+        max_bytes: Size limit (defaults to TTS_CACHE_MAX_MB)
+        reserve_bytes: Room to leave for a file about to be stored
+
+    Returns:
+        Number of files evicted
+    """
+    if max_bytes is None:
+        max_bytes = config.TTS_CACHE_MAX_MB * 1024 * 1024
+    max_bytes -= reserve_bytes
+
+    evicted = 0
+    try:
+        with session_scope() as db:
+            total = db.query(func.coalesce(func.sum(TTSCacheEntry.size_bytes), 0)).scalar() or 0
+            if total <= max_bytes:
+                return 0
+
+            oldest = (
+                db.query(TTSCacheEntry.cache_key, TTSCacheEntry.size_bytes)
+                .order_by(TTSCacheEntry.last_accessed_at.asc())
+                .all()
+            )
+            evicted_keys = []
+            for cache_key, size_bytes in oldest:
+                if total <= max_bytes:
+                    break
+                try:
+                    tts_cache_path(cache_key).unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"Failed to delete cached TTS file {cache_key}: {e}")
+                    continue
+                evicted_keys.append(cache_key)
+                total -= size_bytes
+
+            if evicted_keys:
+                db.query(TTSCacheEntry).filter(TTSCacheEntry.cache_key.in_(evicted_keys)).delete(synchronize_session=False)
+                with _touch_lock:
+                    for cache_key in evicted_keys:
+                        _last_touched.pop(cache_key, None)
+            evicted = len(evicted_keys)
+    except Exception as e:
+        logger.warning(f"TTS cache eviction failed: {e}")
+    return evicted
+
+
+def get_tts_cache_stats() -> dict:
+    """Return indexed file count, total size and the configured limit."""
+    stats = {"max_bytes": config.TTS_CACHE_MAX_MB * 1024 * 1024}
+    try:
+        with session_scope() as db:
+            count, total = db.query(
+                func.count(TTSCacheEntry.cache_key), func.coalesce(func.sum(TTSCacheEntry.size_bytes), 0)
+            ).one()
+            stats.update({"files": count, "bytes": int(total)})
+    except Exception as e:
+        logger.warning(f"Failed to read TTS cache stats: {e}")
+    return stats